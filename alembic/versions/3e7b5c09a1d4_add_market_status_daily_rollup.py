@@ -0,0 +1,61 @@
+"""add market_status_daily rollup
+
+Revision ID: 3e7b5c09a1d4
+Revises: 8d2f61c4b7e9
+Create Date: 2026-10-18 12:20:05.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7b5c09a1d4'
+down_revision: Union[str, Sequence[str], None] = '8d2f61c4b7e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # --- Per-area daily status counts for the market watcher ---
+    op.create_table(
+        "market_status_daily",
+        sa.Column("area", sa.String(), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", postgresql.ENUM(name="property_status_enum", create_type=False), primary_key=True),
+        sa.Column("listings", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("returned", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # --- Backfill from the source tables ---
+    op.execute(
+        """
+        INSERT INTO market_status_daily (area, day, status, listings, returned)
+        SELECT
+            a.area,
+            p.last_updated::date,
+            p.status,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE p.last_updated <> p.created_at)
+        FROM properties p
+        JOIN addresses a ON p.property_id = a.property_id
+        WHERE p.last_updated IS NOT NULL
+        GROUP BY a.area, p.last_updated::date, p.status;
+        """
+    )
+
+    # Range predicate of the live (?live=true) market watcher query
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_properties_last_updated", "properties", ["last_updated"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_properties_last_updated", table_name="properties", postgresql_concurrently=True, if_exists=True)
+    op.drop_table("market_status_daily")
@@ -0,0 +1,70 @@
+"""add property search indexes
+
+Revision ID: 5a1086e20326
+Revises: c12035f99cc3
+Create Date: 2026-10-18 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a1086e20326'
+down_revision: Union[str, Sequence[str], None] = 'c12035f99cc3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY keeps the tables writable while the indexes build; it cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        # --- Trigram indexes for the ILIKE '%...%' listing filters ---
+        op.create_index(
+            "ix_addresses_city_trgm", "addresses", ["city"],
+            postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_addresses_area_trgm", "addresses", ["area"],
+            postgresql_using="gin", postgresql_ops={"area": "gin_trgm_ops"},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_properties_mls_num_trgm", "properties", [sa.text("(mls_num::text) gin_trgm_ops")],
+            postgresql_using="gin",
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        # --- Composite btree indexes ---
+        op.create_index(
+            "ix_properties_status_price", "properties", ["status", "price"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_properties_created_by_created_at", "properties", ["created_by", "created_at"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        # addresses.property_id is already covered by its unique constraint; additional.property_id was not
+        op.create_index(
+            "ix_additional_property_id", "additional", ["property_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, name in [
+            ("additional", "ix_additional_property_id"),
+            ("properties", "ix_properties_created_by_created_at"),
+            ("properties", "ix_properties_status_price"),
+            ("properties", "ix_properties_mls_num_trgm"),
+            ("addresses", "ix_addresses_area_trgm"),
+            ("addresses", "ix_addresses_city_trgm"),
+        ]:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,28 @@
+"""add number allocator sequences
+
+Revision ID: 7c4e2b9d1f63
+Revises: d5b1e8a2c6f4
+Create Date: 2026-10-18 18:20:37.118620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4e2b9d1f63'
+down_revision: Union[str, Sequence[str], None] = 'd5b1e8a2c6f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Positions for utils/number_allocator.py; numbers already given out randomly are skipped by its existence check
+    op.execute("CREATE SEQUENCE IF NOT EXISTS mls_num_seq MINVALUE 0 START WITH 0")
+    op.execute("CREATE SEQUENCE IF NOT EXISTS license_num_seq MINVALUE 0 START WITH 0")
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE IF EXISTS license_num_seq")
+    op.execute("DROP SEQUENCE IF EXISTS mls_num_seq")
@@ -0,0 +1,192 @@
+"""add property_listing table
+
+Revision ID: 8d2f61c4b7e9
+Revises: 5a1086e20326
+Create Date: 2026-10-18 11:02:17.220415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f61c4b7e9'
+down_revision: Union[str, Sequence[str], None] = '5a1086e20326'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # --- Denormalized listing table, one row per property ---
+    op.create_table(
+        "property_listing",
+        sa.Column("property_id", sa.Integer(), sa.ForeignKey("properties.property_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("show_inst", sa.Text(), nullable=True),
+        sa.Column("price", sa.Numeric(10, 2), nullable=True),
+        sa.Column("property_type", postgresql.ENUM(name="property_type_enum", create_type=False), nullable=True),
+        sa.Column("bedrooms", sa.Integer(), nullable=True),
+        sa.Column("bathrooms", sa.Float(), nullable=True),
+        sa.Column("property_realtor_commission", sa.Float(), nullable=True),
+        sa.Column("buyer_realtor_commission", sa.Float(), nullable=True),
+        sa.Column("area_space", sa.Integer(), nullable=True),
+        sa.Column("year_built", sa.Integer(), nullable=True),
+        sa.Column("latitude", sa.Float(), nullable=True),
+        sa.Column("longitude", sa.Float(), nullable=True),
+        sa.Column("status", postgresql.ENUM(name="property_status_enum", create_type=False), nullable=False),
+        sa.Column("trans_type", postgresql.ENUM(name="property_transaction_type_enum", create_type=False), nullable=True),
+        sa.Column("exp_date", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("last_updated", sa.TIMESTAMP(), nullable=True),
+        sa.Column("images_urls", postgresql.JSONB(), nullable=True),
+        sa.Column("mls_num", sa.Integer(), nullable=False),
+        sa.Column("livable", sa.Boolean(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=False),
+        sa.Column("created_by_user_id", sa.Integer(), nullable=True),
+        sa.Column("created_by_first_name", sa.String(50), nullable=True),
+        sa.Column("created_by_last_name", sa.String(50), nullable=True),
+        sa.Column("created_by_email", sa.String(100), nullable=True),
+        sa.Column("created_by_phone_number", sa.String(20), nullable=True),
+        sa.Column("created_by_created_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("created_by_created_by", sa.Integer(), nullable=True),
+        sa.Column("created_by_admin", sa.Boolean(), nullable=True),
+        sa.Column("created_by_broker", sa.Boolean(), nullable=True),
+        sa.Column("created_by_realtor", sa.Boolean(), nullable=True),
+        sa.Column("created_by_buyer", sa.Boolean(), nullable=True),
+        sa.Column("created_by_seller", sa.Boolean(), nullable=True),
+        sa.Column("created_by_tenant", sa.Boolean(), nullable=True),
+        sa.Column("address_id", sa.Integer(), nullable=True),
+        sa.Column("floor", sa.Integer(), nullable=True),
+        sa.Column("apt", sa.Integer(), nullable=True),
+        sa.Column("area", sa.String(), nullable=True),
+        sa.Column("city", sa.String(255), nullable=True),
+        sa.Column("county", sa.String(255), nullable=True),
+        sa.Column("address_created_by", sa.Integer(), nullable=True),
+        sa.Column("address_created_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("building_num", sa.String(), nullable=True),
+        sa.Column("street", sa.String(), nullable=True),
+        sa.Column("additional_id", sa.Integer(), nullable=True),
+        sa.Column("elevator", sa.Boolean(), nullable=True),
+        sa.Column("balcony", sa.Integer(), nullable=True),
+        sa.Column("ac", sa.Boolean(), nullable=True),
+        sa.Column("fan_number", sa.Integer(), nullable=True),
+        sa.Column("garage", sa.Boolean(), nullable=True),
+        sa.Column("garden", sa.Boolean(), nullable=True),
+        sa.Column("solar_system", sa.Boolean(), nullable=True),
+        sa.Column("water", sa.String(100), nullable=True),
+        sa.Column("jacuzzi", sa.Boolean(), nullable=True),
+        sa.Column("pool", sa.Boolean(), nullable=True),
+    )
+
+    # --- Backfill from the source tables ---
+    op.execute(
+        """
+        INSERT INTO property_listing (
+            property_id, description, show_inst, price,
+            property_type, bedrooms, bathrooms, property_realtor_commission,
+            buyer_realtor_commission, area_space, year_built, latitude,
+            longitude, status, trans_type, exp_date,
+            created_at, last_updated, images_urls, mls_num,
+            livable, created_by, created_by_user_id, created_by_first_name,
+            created_by_last_name, created_by_email, created_by_phone_number, created_by_created_at,
+            created_by_created_by, created_by_admin, created_by_broker, created_by_realtor,
+            created_by_buyer, created_by_seller, created_by_tenant, address_id,
+            floor, apt, area, city,
+            county, address_created_by, address_created_at, building_num,
+            street, additional_id, elevator, balcony,
+            ac, fan_number, garage, garden,
+            solar_system, water, jacuzzi, pool
+        )
+        -- DISTINCT ON guards the upsert against a property with more than one additional row
+        SELECT DISTINCT ON (p.property_id)
+            p.property_id,
+            p.description,
+            p.show_inst,
+            p.price,
+            p.property_type,
+            p.bedrooms,
+            p.bathrooms,
+            p.property_realtor_commission,
+            p.buyer_realtor_commission,
+            p.area_space,
+            p.year_built,
+            p.latitude,
+            p.longitude,
+            p.status,
+            p.trans_type,
+            p.exp_date,
+            p.created_at,
+            p.last_updated,
+            p.images_urls,
+            p.mls_num,
+            p.livable,
+            p.created_by,
+
+            cb.user_id,
+            cb.first_name,
+            cb.last_name,
+            cb.email,
+            cb.phone_number,
+            cb.created_at,
+            cb.created_by,
+
+            rcb.admin,
+            rcb.broker,
+            rcb.realtor,
+            rcb.buyer,
+            rcb.seller,
+            rcb.tenant,
+
+            a.address_id,
+            a.floor,
+            a.apt,
+            a.area,
+            a.city,
+            a.county,
+            a.created_by,
+            a.created_at,
+            a.building_num,
+            a.street,
+
+            ad.additional_id,
+            ad.elevator,
+            ad.balcony,
+            ad.ac,
+            ad.fan_number,
+            ad.garage,
+            ad.garden,
+            ad.solar_system,
+            ad.water,
+            ad.jacuzzi,
+            ad.pool
+        FROM properties p
+        LEFT JOIN users cb ON p.created_by = cb.user_id
+        LEFT JOIN roles rcb ON cb.user_id = rcb.user_id
+        LEFT JOIN addresses a ON p.property_id = a.property_id
+        LEFT JOIN additional ad ON p.property_id = ad.property_id
+        ORDER BY p.property_id, ad.additional_id;
+        """
+    )
+
+    # --- Listing filters and keyset sort columns ---
+    op.create_index("ix_property_listing_city_trgm", "property_listing", ["city"],
+                    postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"})
+    op.create_index("ix_property_listing_area_trgm", "property_listing", ["area"],
+                    postgresql_using="gin", postgresql_ops={"area": "gin_trgm_ops"})
+    op.create_index("ix_property_listing_mls_num_trgm", "property_listing", [sa.text("(mls_num::text) gin_trgm_ops")],
+                    postgresql_using="gin")
+    op.create_index("ix_property_listing_status_price", "property_listing", ["status", "price"])
+    op.create_index("ix_property_listing_status", "property_listing", ["status", "property_id"])
+    op.create_index("ix_property_listing_created_by_created_at", "property_listing", ["created_by", "created_at"])
+    op.create_index("ix_property_listing_price", "property_listing", ["price", "property_id"])
+    op.create_index("ix_property_listing_city", "property_listing", ["city", "property_id"])
+    op.create_index("ix_property_listing_area", "property_listing", ["area", "property_id"])
+    op.create_index("ix_property_listing_created_at", "property_listing", ["created_at", "property_id"])
+    op.create_index("ix_property_listing_mls_num", "property_listing", ["mls_num", "property_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("property_listing")
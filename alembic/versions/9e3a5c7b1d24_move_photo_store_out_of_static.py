@@ -0,0 +1,46 @@
+"""move photo store out of static
+
+Revision ID: 9e3a5c7b1d24
+Revises: 7c4e2b9d1f63
+Create Date: 2026-10-18 19:42:11.530874
+
+"""
+import os
+import shutil
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3a5c7b1d24'
+down_revision: Union[str, Sequence[str], None] = '7c4e2b9d1f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# static/ is mounted by StaticFiles, which served every photo (and half-written uploads) a second time.
+# The layout inside the store is unchanged and the URLs already point at /media, so only files move.
+STATIC_PHOTO_DIR = os.path.join(os.getcwd(), "static", "photos")
+PHOTO_DIR = os.getenv("PHOTO_DIR", os.path.join(os.getcwd(), "storage", "photos"))
+
+
+def _move_tree(source: str, target: str):
+    if not os.path.isdir(source):
+        return
+    for folder, _, files in os.walk(source):
+        for name in files:
+            moved = os.path.join(target, os.path.relpath(folder, source), name)
+            if os.path.exists(moved):
+                # Content addressed: a file already at the target is the same photo
+                os.unlink(os.path.join(folder, name))
+                continue
+            os.makedirs(os.path.dirname(moved), exist_ok=True)
+            # shutil.move, as static/ and the store may be on different file systems
+            shutil.move(os.path.join(folder, name), moved)
+    shutil.rmtree(source)
+
+
+def upgrade() -> None:
+    _move_tree(STATIC_PHOTO_DIR, PHOTO_DIR)
+
+
+def downgrade() -> None:
+    _move_tree(PHOTO_DIR, STATIC_PHOTO_DIR)
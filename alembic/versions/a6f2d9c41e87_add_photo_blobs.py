@@ -0,0 +1,145 @@
+"""add photo_blobs
+
+Revision ID: a6f2d9c41e87
+Revises: f3c91d2a7e58
+Create Date: 2026-10-18 16:58:03.214476
+
+"""
+import hashlib
+import json
+import os
+import shutil
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f2d9c41e87'
+down_revision: Union[str, Sequence[str], None] = 'f3c91d2a7e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Where photos were stored by MLS number and client file name, and the content-addressed store replacing it
+LEGACY_PHOTO_DIR = os.path.join(os.getcwd(), "static", "properties_photos")
+PHOTO_DIR = os.path.join(os.getcwd(), "static", "photos")
+EXTENSIONS = {b"\xff\xd8\xff": (".jpg", "image/jpeg"), b"\x89PNG\r\n\x1a\n": (".png", "image/png")}
+
+
+def _image_type(head: bytes):
+    for magic, extension in EXTENSIONS.items():
+        if head.startswith(magic):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp", "image/webp"
+    return None
+
+
+def _store(source: str, key: str):
+    target = os.path.join(PHOTO_DIR, key[:2], key[2:4], key)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(source, target + ".part")
+        os.replace(target + ".part", target)
+    # Derivatives made next to the old file move along with it
+    folder, name = os.path.split(source)
+    for size in ("thumb", "medium"):
+        derivative = os.path.join(folder, size, f"{name}.webp")
+        moved = os.path.join(os.path.dirname(target), size, f"{key}.webp")
+        if os.path.exists(derivative) and not os.path.exists(moved):
+            os.makedirs(os.path.dirname(moved), exist_ok=True)
+            shutil.copyfile(derivative, moved)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "photo_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("content_type", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.Column("released_at", sa.TIMESTAMP(), nullable=True),
+    )
+    op.create_index("ix_photo_blobs_unreferenced", "photo_blobs", ["released_at"],
+                    postgresql_where=sa.text("ref_count = 0"))
+
+    # --- Move the existing photos into the store and point images_urls at them ---
+    # The old files are left in place; remove static/properties_photos once the upgrade is verified.
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT property_id, mls_num, images_urls FROM properties WHERE images_urls IS NOT NULL")
+    ).mappings().all()
+    blobs = {}
+    refs = Counter()
+    for row in rows:
+        images = []
+        hashes = set()
+        for image in row["images_urls"]:
+            prefix, _, name = image["url"].rpartition("/")
+            source = os.path.join(LEGACY_PHOTO_DIR, str(row["mls_num"]), name)
+            if image.get("sha256") or not os.path.isfile(source):
+                images.append(image)
+                continue
+            with open(source, "rb") as f:
+                head = f.read(12)
+                f.seek(0)
+                # Chunked rather than hashlib.file_digest, which needs Python 3.11 (CI runs 3.10)
+                digest = hashlib.sha256()
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+                sha256 = digest.hexdigest()
+            image_type = _image_type(head)
+            if image_type is None:
+                images.append(image)
+                continue
+            if sha256 in hashes:
+                # The same photo twice on one listing is kept once
+                continue
+            extension, content_type = image_type
+            key = sha256 + extension
+            _store(source, key)
+            blobs[sha256] = {"sha256": sha256, "key": key, "content_type": content_type, "size": os.path.getsize(source)}
+            refs[sha256] += 1
+            hashes.add(sha256)
+            static_root = prefix.split("/static/", 1)[0]
+            url = f"{static_root}/static/photos/{key[:2]}/{key[2:4]}/{key}"
+            moved = {**image, "url": url, "sha256": sha256, "name": name}
+            for size in ("thumb", "medium"):
+                if image.get(f"{size}_url"):
+                    moved[f"{size}_url"] = f"{static_root}/static/photos/{key[:2]}/{key[2:4]}/{size}/{key}.webp"
+            images.append(moved)
+        connection.execute(
+            sa.text("UPDATE properties SET images_urls = CAST(:images AS JSONB) WHERE property_id = :property_id"),
+            {"images": json.dumps(images), "property_id": row["property_id"]}
+        )
+
+    if blobs:
+        connection.execute(
+            sa.text(
+                """
+                INSERT INTO photo_blobs (sha256, key, content_type, size, ref_count)
+                SELECT b.sha256, b.key, b.content_type, b.size, b.ref_count
+                FROM jsonb_to_recordset(CAST(:blobs AS JSONB))
+                    AS b(sha256 TEXT, key TEXT, content_type TEXT, size BIGINT, ref_count INTEGER)
+                """
+            ),
+            {"blobs": json.dumps([{**blob, "ref_count": refs[sha256]} for sha256, blob in blobs.items()])}
+        )
+    op.execute(
+        """
+        UPDATE property_listing pl
+        SET images_urls = p.images_urls
+        FROM properties p
+        WHERE p.property_id = pl.property_id
+          AND pl.images_urls IS DISTINCT FROM p.images_urls
+        """
+    )
+
+
+def downgrade() -> None:
+    # Stored files stay on disk; images_urls keeps pointing at them
+    op.drop_table("photo_blobs")
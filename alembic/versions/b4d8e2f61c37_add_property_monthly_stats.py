@@ -0,0 +1,60 @@
+"""add property_monthly_stats
+
+Revision ID: b4d8e2f61c37
+Revises: 3e7b5c09a1d4
+Create Date: 2026-10-18 13:05:48.602217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d8e2f61c37'
+down_revision: Union[str, Sequence[str], None] = '3e7b5c09a1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # --- Monthly stats cube for /get_property_stats ---
+    op.create_table(
+        "property_monthly_stats",
+        sa.Column("city", sa.String(255), primary_key=True),
+        sa.Column("area", sa.String(), primary_key=True),
+        sa.Column("property_type", postgresql.ENUM(name="property_type_enum", create_type=False), primary_key=True),
+        sa.Column("year", sa.SmallInteger(), primary_key=True),
+        sa.Column("month", sa.SmallInteger(), primary_key=True),
+        sa.Column("listings", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("closed_priced", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("closed_price_sum", sa.Numeric(), nullable=False, server_default="0"),
+    )
+
+    # --- Backfill from the source tables ---
+    op.execute(
+        """
+        INSERT INTO property_monthly_stats (city, area, property_type, year, month, listings, closed_priced, closed_price_sum)
+        SELECT
+            a.city,
+            a.area,
+            p.property_type,
+            EXTRACT(YEAR FROM p.created_at)::INT,
+            EXTRACT(MONTH FROM p.created_at)::INT,
+            COUNT(*),
+            COUNT(p.price) FILTER (WHERE p.status = 'closed'),
+            COALESCE(SUM(p.price) FILTER (WHERE p.status = 'closed'), 0)
+        FROM properties p
+        JOIN addresses a ON p.property_id = a.property_id
+        WHERE p.livable = TRUE
+            AND a.city IS NOT NULL
+            AND p.created_at IS NOT NULL
+        GROUP BY a.city, a.area, p.property_type, EXTRACT(YEAR FROM p.created_at), EXTRACT(MONTH FROM p.created_at);
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("property_monthly_stats")
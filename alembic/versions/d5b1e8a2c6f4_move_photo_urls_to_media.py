@@ -0,0 +1,37 @@
+"""move photo urls to /media
+
+Revision ID: d5b1e8a2c6f4
+Revises: a6f2d9c41e87
+Create Date: 2026-10-18 17:31:45.602158
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b1e8a2c6f4'
+down_revision: Union[str, Sequence[str], None] = 'a6f2d9c41e87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rewrite(source: str, target: str) -> None:
+    # Photos are now served by the media router (and nginx), under the same store layout
+    for table in ("properties", "property_listing"):
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET images_urls = CAST(replace(images_urls::TEXT, '{source}', '{target}') AS JSONB)
+            WHERE images_urls::TEXT LIKE '%{source}%'
+            """
+        )
+
+
+def upgrade() -> None:
+    _rewrite("/static/photos/", "/media/photos/")
+
+
+def downgrade() -> None:
+    _rewrite("/media/photos/", "/static/photos/")
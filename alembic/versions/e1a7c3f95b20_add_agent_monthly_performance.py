@@ -0,0 +1,52 @@
+"""add agent_monthly_performance
+
+Revision ID: e1a7c3f95b20
+Revises: b4d8e2f61c37
+Create Date: 2026-10-18 14:10:27.931560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c3f95b20'
+down_revision: Union[str, Sequence[str], None] = 'b4d8e2f61c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # --- Closings per listing agent and month, for the top agents leaderboard ---
+    op.create_table(
+        "agent_monthly_performance",
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("closed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_price", sa.Numeric(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_agent_monthly_performance_ranking", "agent_monthly_performance",
+        ["month", sa.text("closed_count DESC"), sa.text("total_price DESC")]
+    )
+
+    # --- Backfill from recorded sales and rents ---
+    op.execute(
+        """
+        INSERT INTO agent_monthly_performance (month, user_id, closed_count, total_price)
+        SELECT date_trunc('month', t.date)::DATE, p.created_by, COUNT(*), COALESCE(SUM(t.sold_price), 0)
+        FROM (
+            SELECT property_id, date, sold_price FROM sales_trans
+            UNION ALL
+            SELECT property_id, date, sold_price FROM rents_trans
+        ) t
+        JOIN properties p ON p.property_id = t.property_id
+        GROUP BY date_trunc('month', t.date), p.created_by;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("agent_monthly_performance")
@@ -0,0 +1,69 @@
+"""add contracts table
+
+Revision ID: f3c91d2a7e58
+Revises: e1a7c3f95b20
+Create Date: 2026-10-18 15:02:11.774903
+
+"""
+import json
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c91d2a7e58'
+down_revision: Union[str, Sequence[str], None] = 'e1a7c3f95b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Where create_signed_contract used to write {mls}.json files
+LEGACY_CONTRACT_DIR = os.path.join(os.getcwd(), "static", "contracts")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contracts",
+        sa.Column("contract_id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("mls_num", sa.Integer(), nullable=False, unique=True),
+        sa.Column("receiver_id", sa.Integer(), nullable=True),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("payload_sha256", sa.String(64), nullable=False),
+        sa.Column("pdf_sha256", sa.String(64), nullable=True),
+        sa.Column("pdf_size", sa.BigInteger(), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.user_id"), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_contracts_payload", "contracts", ["payload"],
+                    postgresql_using="gin", postgresql_ops={"payload": "jsonb_path_ops"})
+
+    # --- Import the existing contract files ---
+    if not os.path.isdir(LEGACY_CONTRACT_DIR):
+        return
+    insert = sa.text(
+        """
+        INSERT INTO contracts (mls_num, payload, payload_sha256)
+        VALUES (:mls_num, CAST(:payload AS JSONB), encode(sha256(convert_to(CAST(:payload AS JSONB)::TEXT, 'UTF8')), 'hex'))
+        ON CONFLICT (mls_num) DO NOTHING
+        """
+    )
+    connection = op.get_bind()
+    for name in sorted(os.listdir(LEGACY_CONTRACT_DIR)):
+        stem, extension = os.path.splitext(name)
+        if extension != ".json" or not stem.isdigit():
+            continue
+        try:
+            with open(os.path.join(LEGACY_CONTRACT_DIR, name), "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            print(f"skipping unreadable contract file {name}")
+            continue
+        connection.execute(insert, {"mls_num": int(stem), "payload": json.dumps(payload, ensure_ascii=False)})
+
+
+def downgrade() -> None:
+    op.drop_table("contracts")
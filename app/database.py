@@ -1,10 +1,13 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, DDL
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from dotenv import load_dotenv
 import os
 from typing import Annotated
 from fastapi import Depends
 
+from .utils.pool_metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool, instrument_engine
+
 load_dotenv()
 DB_USERNAME = os.getenv("DATABASE_USERNAME")
 DB_PASSWORD = os.getenv("DATABASE_PASSWORD")
@@ -13,13 +16,33 @@ DB_PORT = os.getenv("DATABASE_PORT")
 DB_NAME = os.getenv("DATABASE_NAME")
 
 DATABASE_URL = f"postgresql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Pool sizing; size*workers + overflow*workers must stay under Postgres max_connections
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DATABASE_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+    "pool_pre_ping": os.getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true",
+    "pool_recycle": int(os.getenv("DATABASE_POOL_RECYCLE", "1800")),
+    "pool_timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+}
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **POOL_OPTIONS)
+instrument_engine("sync", engine)
 
 LocalSession = sessionmaker(bind=engine)
 
+# Async path for `async def` handlers; routers move over to it one at a time
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncAdaptedQueuePool, **POOL_OPTIONS)
+instrument_engine("async", async_engine)
+
+AsyncLocalSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
 Base = declarative_base()
 
+# Trigram indexes in the models need pg_trgm before create_all builds them
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
 def get_db():
     db = LocalSession()
     try:
@@ -29,6 +52,12 @@ def get_db():
 
 db_depends = Annotated[Session, Depends(get_db)]
 
+async def get_async_db():
+    async with AsyncLocalSession() as db:
+        yield db
+
+async_db_depends = Annotated[AsyncSession, Depends(get_async_db)]
+
 try:
     db_gen = get_db()
     db = next(db_gen)
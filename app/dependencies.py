@@ -1,10 +1,11 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app import database
 
 from .models.user_model import User
+from .utils.principal_cache import principal_cache
 
 import os
 from dotenv import load_dotenv
@@ -13,6 +14,10 @@ load_dotenv()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+def resolve_get_db(request: Request):
+    # get_db as the app would inject it (including dependency_overrides), for work that outlives the request
+    return request.app.dependency_overrides.get(database.get_db, database.get_db)
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -26,7 +31,32 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
+    # Tokens issued before jti/iat were added fall back to the raw token as cache key
+    token_id = payload.get("jti") or payload.get("iat") or token
+    user = principal_cache.get(int(user_id), token_id)
+    if user is not None:
+        return user
+
     user = db.query(User).filter(User.user_id == user_id).first()
     if user is None:
         raise credentials_exception
+
+    # Detach user (with its eagerly loaded roles and address) so it can be shared across requests
+    db.expunge(user)
+    principal_cache.set(user.user_id, token_id, user)
     return user
+
+ROLE_FIELDS = ["admin", "broker", "realtor", "buyer", "seller", "tenant"]
+
+def get_user_roles(user: User) -> list[str]:
+    # Roles are eagerly joined on User, so this never touches the database
+    if user.roles is None:
+        return []
+    return [role for role in ROLE_FIELDS if getattr(user.roles, role)]
+
+def require_roles(*allowed_roles: str):
+    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+        if not any(role in allowed_roles for role in get_user_roles(current_user)):
+            raise HTTPException(status_code=403, detail="Not authorized")
+        return current_user
+    return role_checker
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import String, Integer, ForeignKey, TIMESTAMP
+from sqlalchemy import String, Integer, ForeignKey, TIMESTAMP, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -15,6 +15,11 @@ if TYPE_CHECKING:
     
 class Address(Base):
     __tablename__ = "addresses"
+    __table_args__ = (
+        # Trigram indexes back the ILIKE '%...%' city/area filters on listings
+        Index("ix_addresses_city_trgm", "city", postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"}),
+        Index("ix_addresses_area_trgm", "area", postgresql_using="gin", postgresql_ops={"area": "gin_trgm_ops"}),
+    )
 
     address_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     floor: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Integer, Date, Numeric, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+from datetime import date
+
+class AgentMonthlyPerformance(Base):
+    # Closings per listing agent and calendar month, keyed on the sales_trans/rents_trans date.
+    # Incremented by close_contract in the same transaction that records the sale or rent.
+    __tablename__ = "agent_monthly_performance"
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day of the month
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    closed_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    total_price: Mapped[float] = mapped_column(Numeric, nullable=False, server_default="0")
+
+# Leaderboard order within a month
+Index(
+    "ix_agent_monthly_performance_ranking",
+    AgentMonthlyPerformance.month,
+    AgentMonthlyPerformance.closed_count.desc(),
+    AgentMonthlyPerformance.total_price.desc()
+)
@@ -0,0 +1,28 @@
+from sqlalchemy import Integer, String, BigInteger, ForeignKey, TIMESTAMP, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.database import Base
+from datetime import datetime
+from typing import Optional
+
+class Contract(Base):
+    # Signed contract per MLS number; re-signing replaces the payload
+    __tablename__ = "contracts"
+
+    contract_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    mls_num: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    receiver_id: Mapped[Optional[int]] = mapped_column(Integer)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # SHA-256 of payload::text, the bytes GET /contracts/{mls} returns; used as its strong ETag
+    payload_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Signed PDF in the blob store (utils/blob_store.py), if one was uploaded
+    pdf_sha256: Mapped[Optional[str]] = mapped_column(String(64))
+    pdf_size: Mapped[Optional[int]] = mapped_column(BigInteger)
+    # NULL for contracts imported from the old static/contracts files
+    created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.user_id"))
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+
+# Containment queries on contract fields, e.g. payload @> '{"buyer_agent_id": 7}'
+Index("ix_contracts_payload", Contract.payload, postgresql_using="gin", postgresql_ops={"payload": "jsonb_path_ops"})
@@ -1,10 +1,13 @@
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Sequence
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 from sqlalchemy import Enum
 
 from ..utils.enums import LicenseType, LicenseStatus
 
+# Positions handed to utils/number_allocator.py, which maps them onto distinct license numbers
+license_num_seq = Sequence("license_num_seq", start=0, minvalue=0, metadata=Base.metadata)
+
 class License(Base):
     __tablename__ = "licenses"
 
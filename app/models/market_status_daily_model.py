@@ -0,0 +1,18 @@
+from sqlalchemy import String, Integer, Date, Enum
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+from datetime import date
+
+from ..utils.enums import PropertyStatus
+
+class MarketStatusDaily(Base):
+    # Per-area daily rollup for the market watcher: properties last updated on `day`, by current status.
+    # Buckets are recomputed by utils/rollup_helper.py whenever a write moves a property between them.
+    __tablename__ = "market_status_daily"
+
+    area: Mapped[str] = mapped_column(String, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[PropertyStatus] = mapped_column(Enum(PropertyStatus, name="property_status_enum"), primary_key=True)
+    listings: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Listings in the bucket whose last_updated differs from created_at ("returned to the market")
+    returned: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
@@ -0,0 +1,25 @@
+from sqlalchemy import Integer, String, BigInteger, TIMESTAMP, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.database import Base
+from datetime import datetime
+from typing import Optional
+
+class PhotoBlob(Base):
+    # One row per stored photo (utils/validate_photo.py photo_store); ref_count is the number of
+    # properties whose images_urls point at it, kept by utils/photo_refs.py in the writing transaction.
+    # Rows at zero are deleted, with their files, by the batch job in utils/photo_gc.py.
+    __tablename__ = "photo_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # Stored file name, <sha256>.<ext>
+    key: Mapped[str] = mapped_column(String, nullable=False)
+    content_type: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
+    # When ref_count last dropped to zero; the collector waits a grace period after it
+    released_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
+
+# The collector's scan: unreferenced blobs, oldest release first
+Index("ix_photo_blobs_unreferenced", PhotoBlob.released_at, postgresql_where=PhotoBlob.ref_count == 0)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from sqlalchemy import String, Integer, Float, Boolean, Text, ForeignKey, TIMESTAMP, Numeric, Date, Enum, Index, cast
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from app.database import Base
+from typing import Optional
+from datetime import datetime, date
+
+from ..utils.enums import PropertyStatus, PropertyTypes, PropertyTransactionType
+
+class PropertyListing(Base):
+    # One pre-joined row per property (creator, creator roles, address, additional) for the listing endpoints.
+    # Rows are upserted by utils/listing_helper.py in the same transaction as the write and cascade on delete.
+    __tablename__ = "property_listing"
+
+    property_id: Mapped[int] = mapped_column(ForeignKey("properties.property_id", ondelete="CASCADE"), primary_key=True)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    show_inst: Mapped[Optional[str]] = mapped_column(Text)
+    price: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
+    property_type: Mapped[Optional[PropertyTypes]] = mapped_column(Enum(PropertyTypes, name="property_type_enum"))
+    bedrooms: Mapped[Optional[int]] = mapped_column(Integer)
+    bathrooms: Mapped[Optional[float]] = mapped_column(Float)
+    property_realtor_commission: Mapped[Optional[float]] = mapped_column(Float)
+    buyer_realtor_commission: Mapped[Optional[float]] = mapped_column(Float)
+    area_space: Mapped[Optional[int]] = mapped_column(Integer)
+    year_built: Mapped[Optional[int]] = mapped_column(Integer)
+    latitude: Mapped[Optional[float]] = mapped_column(Float)
+    longitude: Mapped[Optional[float]] = mapped_column(Float)
+    status: Mapped[PropertyStatus] = mapped_column(Enum(PropertyStatus, name="property_status_enum"))
+    trans_type: Mapped[Optional[PropertyTransactionType]] = mapped_column(Enum(PropertyTransactionType, name="property_transaction_type_enum"))
+    exp_date: Mapped[Optional[date]] = mapped_column(Date)
+    created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
+    last_updated: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
+    images_urls: Mapped[Optional[list[dict]]] = mapped_column(JSONB)
+    mls_num: Mapped[int] = mapped_column(Integer)
+    livable: Mapped[Optional[bool]] = mapped_column(Boolean)
+    created_by: Mapped[int] = mapped_column(Integer)
+
+    # Created by user
+    created_by_user_id: Mapped[Optional[int]] = mapped_column(Integer)
+    created_by_first_name: Mapped[Optional[str]] = mapped_column(String(50))
+    created_by_last_name: Mapped[Optional[str]] = mapped_column(String(50))
+    created_by_email: Mapped[Optional[str]] = mapped_column(String(100))
+    created_by_phone_number: Mapped[Optional[str]] = mapped_column(String(20))
+    created_by_created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
+    created_by_created_by: Mapped[Optional[int]] = mapped_column(Integer)
+    created_by_admin: Mapped[Optional[bool]] = mapped_column(Boolean)
+    created_by_broker: Mapped[Optional[bool]] = mapped_column(Boolean)
+    created_by_realtor: Mapped[Optional[bool]] = mapped_column(Boolean)
+    created_by_buyer: Mapped[Optional[bool]] = mapped_column(Boolean)
+    created_by_seller: Mapped[Optional[bool]] = mapped_column(Boolean)
+    created_by_tenant: Mapped[Optional[bool]] = mapped_column(Boolean)
+
+    # Address
+    address_id: Mapped[Optional[int]] = mapped_column(Integer)
+    floor: Mapped[Optional[int]] = mapped_column(Integer)
+    apt: Mapped[Optional[int]] = mapped_column(Integer)
+    area: Mapped[Optional[str]] = mapped_column(String)
+    city: Mapped[Optional[str]] = mapped_column(String(255))
+    county: Mapped[Optional[str]] = mapped_column(String(255))
+    address_created_by: Mapped[Optional[int]] = mapped_column(Integer)
+    address_created_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP)
+    building_num: Mapped[Optional[str]] = mapped_column(String)
+    street: Mapped[Optional[str]] = mapped_column(String)
+
+    # Additional
+    additional_id: Mapped[Optional[int]] = mapped_column(Integer)
+    elevator: Mapped[Optional[bool]] = mapped_column(Boolean)
+    balcony: Mapped[Optional[int]] = mapped_column(Integer)
+    ac: Mapped[Optional[bool]] = mapped_column(Boolean)
+    fan_number: Mapped[Optional[int]] = mapped_column(Integer)
+    garage: Mapped[Optional[bool]] = mapped_column(Boolean)
+    garden: Mapped[Optional[bool]] = mapped_column(Boolean)
+    solar_system: Mapped[Optional[bool]] = mapped_column(Boolean)
+    water: Mapped[Optional[str]] = mapped_column(String(100))
+    jacuzzi: Mapped[Optional[bool]] = mapped_column(Boolean)
+    pool: Mapped[Optional[bool]] = mapped_column(Boolean)
+
+    __table_args__ = (
+        # Listing filters and the keyset sort columns, each ending in the primary key
+        Index("ix_property_listing_city_trgm", "city", postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"}),
+        Index("ix_property_listing_area_trgm", "area", postgresql_using="gin", postgresql_ops={"area": "gin_trgm_ops"}),
+        Index("ix_property_listing_status_price", "status", "price"),
+        Index("ix_property_listing_status", "status", "property_id"),
+        Index("ix_property_listing_created_by_created_at", "created_by", "created_at"),
+        Index("ix_property_listing_price", "price", "property_id"),
+        Index("ix_property_listing_city", "city", "property_id"),
+        Index("ix_property_listing_area", "area", "property_id"),
+        Index("ix_property_listing_created_at", "created_at", "property_id"),
+        Index("ix_property_listing_mls_num", "mls_num", "property_id"),
+    )
+
+Index(
+    "ix_property_listing_mls_num_trgm",
+    cast(PropertyListing.mls_num, Text).label("mls_num_text"),
+    postgresql_using="gin",
+    postgresql_ops={"mls_num_text": "gin_trgm_ops"}
+)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Integer, Float, ForeignKey, TIMESTAMP, Text, Table, Column, Boolean
+from sqlalchemy import Integer, Float, ForeignKey, TIMESTAMP, Text, Table, Column, Boolean, Index, Sequence, cast
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -17,6 +17,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from app.models.addresses_model import Address
 
+# Positions handed to utils/number_allocator.py, which maps them onto distinct MLS numbers
+mls_num_seq = Sequence("mls_num_seq", start=0, minvalue=0, metadata=Base.metadata)
+
 property_owners = Table(
     "property_owners",
     Base.metadata,
@@ -82,3 +85,15 @@ class Property(Base):
 
     favorites = relationship("Favorite", back_populates="property")
     additional_details = relationship("Additional", back_populates="property", uselist=False)
+
+# Listing filters: status + price range, "my properties" by creator, and MLS substring search
+Index("ix_properties_status_price", Property.status, Property.price)
+Index("ix_properties_created_by_created_at", Property.created_by, Property.created_at)
+Index(
+    "ix_properties_mls_num_trgm",
+    cast(Property.mls_num, Text).label("mls_num_text"),
+    postgresql_using="gin",
+    postgresql_ops={"mls_num_text": "gin_trgm_ops"}
+)
+# Market watcher live counts: range scan on last_updated
+Index("ix_properties_last_updated", Property.last_updated)
@@ -0,0 +1,20 @@
+from sqlalchemy import String, Integer, SmallInteger, Numeric, Enum
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+from ..utils.enums import PropertyTypes
+
+class PropertyMonthlyStats(Base):
+    # Livable listings per (city, area, property_type, month of created_at) for /get_property_stats.
+    # Buckets are recomputed by utils/rollup_helper.py whenever a write changes a property's contribution.
+    __tablename__ = "property_monthly_stats"
+
+    city: Mapped[str] = mapped_column(String(255), primary_key=True)
+    area: Mapped[str] = mapped_column(String, primary_key=True)
+    property_type: Mapped[PropertyTypes] = mapped_column(Enum(PropertyTypes, name="property_type_enum"), primary_key=True)
+    year: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    month: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    listings: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Closed listings with a price, the divisor for the average closed price
+    closed_priced: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    closed_price_sum: Mapped[float] = mapped_column(Numeric, nullable=False, server_default="0")
@@ -5,14 +5,18 @@ from datetime import datetime ,timezone
 
 from app import database
 
-from typing import List
+from typing import List, Optional
 
 from .address_out2 import AddressOut2
 from app.routers.users.user_out import UserOut
 
 
-from app.utils.file_helper import load_sql
-from ...dependencies import get_current_user
+from app.utils.count_strategy import count_cache
+from app.utils.file_helper import load_sql, load_query
+from app.utils.keyset import Keyset, SortColumn
+from app.utils.listing_helper import refresh_property_listing
+from app.utils.rollup_helper import stale_buckets, refresh_rollups
+from ...dependencies import get_current_user, get_user_roles, require_roles
 
 from app.models.user_model import User
 
@@ -28,21 +32,16 @@ router = APIRouter(
     tags=["addresses"]
 )
 
+ADDRESS_SORT_COLUMNS = {
+    "address_id": SortColumn("a.address_id", "address_id"),
+}
+
 @router.post("/me", response_model=AddressOut, status_code=status.HTTP_201_CREATED)
 def create_user_address(
     address: AddressCreate,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role = [key for key, value in role_result.items() if value]
-
-    if "realtor" in current_user_role or "broker" in current_user_role or "admin" in current_user_role:
-        pass
-    else:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     get_address_sql = load_sql("address/get_address_by_created_by.sql")
     check_address = db.execute(text(get_address_sql), {"user_id": current_user.user_id}).mappings().first()
     if check_address :
@@ -87,11 +86,8 @@ def get_user_address(
 def get_address_by_id(
     address_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    if not current_user.roles.admin:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     sql = load_sql("address/get_address_by_id.sql")
     result = db.execute(text(sql), {'address_id': address_id})
     row = result.mappings().first()
@@ -106,20 +102,18 @@ def get_address_by_id(
 def get_all_addresses(
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin")),
 ):
-    if current_user.roles.admin is False :
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     total_sql = "SELECT COUNT(*) FROM addresses"
     total = db.execute(text(total_sql)).scalar()
-    total_pages = (total + per_page - 1) // per_page
     
-    sql = load_sql("address/get_all_addresses.sql")
-    result = db.execute(text(sql), {'limit': per_page, 'offset': (page - 1) * per_page}).mappings().all()
+    keyset = Keyset(ADDRESS_SORT_COLUMNS, ADDRESS_SORT_COLUMNS["address_id"], "address_id", "asc", page, per_page, cursor)
+    query = load_query("address/get_all_addresses.sql", **keyset.format_args)
+    result = db.execute(query, keyset.params).mappings().all()
     addresses = []
-    for row in result:
+    for row in keyset.rows(result):
         # نفصل بيانات اليوزر يلي أنشأ الادريس
         created_by_user_data = {
             key.replace("created_by_user_", ""): value
@@ -147,14 +141,7 @@ def get_all_addresses(
 
     return {
         "data": addresses,
-        "pagination": {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
+        "pagination": keyset.meta(total)
     }
 
 @router.put("/me")
@@ -212,21 +199,26 @@ def update_address_by_id(
         raise HTTPException(status_code=404, detail="creator not found")
     
     #Authorization
-    sql = load_sql("role/get_user_roles.sql")
-    user_roles = db.execute(text(sql), {"user_id": current_user.user_id}).mappings().first()
+    user_roles = get_user_roles(current_user)
     if not (
-        user_roles["admin"] == True
-        or (user_roles["broker"] == True and current_user.user_id in (address_data["created_by"], created_by_user["created_by"]))
-        or (user_roles["realtor"] == True and current_user.user_id == address_data["created_by"])
+        "admin" in user_roles
+        or ("broker" in user_roles and current_user.user_id in (address_data["created_by"], created_by_user["created_by"]))
+        or ("realtor" in user_roles and current_user.user_id == address_data["created_by"])
     ):
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    stale = stale_buckets(db, [address_data["property_id"]]) if address_data["property_id"] else None
     db_address = address.model_dump(exclude_unset=True)
     db_address["address_id"] = address_id
     set_clause = ", ".join(f"{k} = :{k}" for k in db_address)
     sql = f"UPDATE ADDRESSES SET {set_clause} WHERE address_id = :address_id RETURNING address_id;"
     updated_address_id = db.execute(text(sql), db_address).scalar()
+    if address_data["property_id"]:
+        refresh_property_listing(db, [address_data["property_id"]])
+        refresh_rollups(db, [address_data["property_id"]], stale)
     db.commit() 
+    # The property may have moved in or out of the city/area filters
+    count_cache.clear()
 
     #fetch address data
     updated_address = db.execute(text(get_sql),{"address_id":updated_address_id}).mappings().first()
@@ -238,18 +230,20 @@ def update_address_by_id(
 def delete_address(
     address_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    if not current_user.roles.admin:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("address/get_address_by_id.sql")
     address = db.execute(text(sql), {"address_id": address_id}).mappings().first()
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
 
+    stale = stale_buckets(db, [address["property_id"]]) if address["property_id"] else None
     delete_sql = load_sql("address/delete_address.sql")
     db.execute(text(delete_sql), {"address_id": address_id})
+    if address["property_id"]:
+        refresh_property_listing(db, [address["property_id"]])
+        refresh_rollups(db, [], stale)
     
     db.commit()
+    count_cache.clear()
     return {"message": "Address deleted successfully"}
@@ -6,8 +6,9 @@ from datetime import datetime, timezone
 
 from app import database
 
-from app.utils.file_helper import load_sql
-from ...dependencies import get_current_user
+from app.utils.file_helper import load_sql, load_query
+from app.utils.keyset import Keyset, SortColumn
+from ...dependencies import require_roles
 
 from ...models.user_model import User
 from ...models.agency_model import Agency
@@ -24,19 +25,21 @@ router = APIRouter(
     tags=["Agencies"]
 )
 
+AGENCY_SORT_COLUMNS = {
+    "agency_id": SortColumn("a.agency_id", "agency_id"),
+    "name": SortColumn("a.name", "name"),
+    "created_at": SortColumn("a.created_at", "created_at"),
+}
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 def create_agency(
     agency: AgencyCreate,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if roles["admin"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     # Validate broker_id if provided
     if agency.broker_id:
+        role_sql = load_sql("role/get_user_roles.sql")
         broker = db.execute(text(role_sql), {"user_id" : agency.broker_id}).mappings().first()
         if not broker:
             raise HTTPException(status_code=400, detail="Broker not found")
@@ -76,6 +79,7 @@ def get_all_agencies(
     
     sort_by: str = Query("agency_id", regex="^(agency_id|name|created_at)$"),
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None),
     
     name: Optional[str] = Query(None),
     email: Optional[str] = Query(None),
@@ -85,12 +89,8 @@ def get_all_agencies(
     city: Optional[str] = None,
     
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    
-    if not current_user.roles.admin:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     params = {
         "name": f"%{name}%" if name else None,
         "email": f"%{email}%" if email else None,
@@ -98,21 +98,19 @@ def get_all_agencies(
         "broker_id": broker_id,
         "created_by": created_by,
         "city": f"%{city}%" if city else None,
-        "limit": per_page,
-        "offset": (page - 1) * per_page
     }
+    keyset = Keyset(AGENCY_SORT_COLUMNS, AGENCY_SORT_COLUMNS["agency_id"], sort_by, sort_order, page, per_page, cursor)
 
     # total count
     total_sql = load_sql("agency/count_agencies.sql")
     total = db.execute(text(total_sql), params).scalar()
-    total_pages = (total + per_page - 1) // per_page
 
     # load agencies
-    sql = load_sql("agency/get_all_agencies.sql").format(sort_by=sort_by, sort_order=sort_order)
-    result = db.execute(text(sql), params)
+    query = load_query("agency/get_all_agencies.sql", **keyset.format_args)
+    result = db.execute(query, {**params, **keyset.params})
 
     agencies = []
-    for row in result.mappings():
+    for row in keyset.rows(result.mappings()):
         created_by_data = {k.replace("created_by_", ""): v for k, v in row.items() if k.startswith("created_by")}
         broker_data = {k.replace("broker_", ""): v for k, v in row.items() if k.startswith("broker_")}
         address_data = {k[len("address_"):]: v for k, v in row.items() if k.startswith("address_")}
@@ -127,14 +125,7 @@ def get_all_agencies(
         agencies.append(agency)
 
     return {
-        "pagination": {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1,
-        },
+        "pagination": keyset.meta(total),
         "data": agencies,
     }
 
@@ -142,16 +133,8 @@ def get_all_agencies(
 def get_agency_by_id(
     agency_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin")),
 ):
-    # Authorization
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(
-        text(role_sql), {"user_id": current_user.user_id}
-    ).mappings().first()
-    if not roles or not roles.get("admin"):
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     # Fetch data
     sql = load_sql("agency/get_agency_by_id.sql")
     row = db.execute(text(sql), {"agency_id": agency_id}).mappings().first()
@@ -179,16 +162,8 @@ def update_agency(
     agency_id: int,
     agency_data: AgencyUpdate,
     db: Session = Depends(database.get_db),
-    current_user=Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin")),
 ):
-    # Authorization
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(
-        text(role_sql), {"user_id": current_user.user_id}
-    ).mappings().first()
-    if not roles or not roles.get("admin"):
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     # 1) get the agency
     agency = db.query(Agency).filter(Agency.agency_id == agency_id).first()
     if not agency:
@@ -244,13 +219,8 @@ def update_agency(
 def delete_agency(
     agency_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if roles["admin"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("agency/get_agency_by_id.sql")
     result = db.execute(text(sql), {"agency_id": agency_id})
     agency = result.mappings().first()
@@ -8,7 +8,7 @@ from app import database
 from ...models.user_model import User
 
 from app.utils.file_helper import load_sql
-from ...dependencies import get_current_user
+from ...dependencies import get_current_user, get_user_roles, require_roles
 
 from .area_create import AreaCreate
 from .area_out import AreaOut
@@ -23,15 +23,8 @@ router = APIRouter(
 def create_area(
     area: AreaCreate,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_roles = [key for key, value in role_result.items() if value]
-
-    if "admin" not in current_user_roles:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     sql = load_sql("area/get_area_by_title.sql")
     exist_area = db.execute(text(sql), {"title": area.title}).mappings().first()
     if exist_area:
@@ -77,13 +70,7 @@ def update_area_by_id(
         raise HTTPException(status_code=404, detail="Area not found")
 
     # 2. Check user roles
-    role_sql = load_sql("role/get_user_roles.sql")
-    current_user_roles = db.execute(
-        text(role_sql), {"user_id": current_user.user_id}
-    ).mappings().first()
-    current_user_role_list = [key for key, value in current_user_roles.items() if value]
-
-    if not "admin" in current_user_role_list:
+    if "admin" not in get_user_roles(current_user):
         raise HTTPException(status_code=403, detail="Not authorized to update this area")
 
     update_data = area_data.model_dump(exclude_unset=True)
@@ -135,11 +122,8 @@ def update_area_by_id(
 def get_area_by_id(
     area_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor")),
 ):
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("area/get_area_by_id.sql")
     row = db.execute(text(sql), {"area_id": area_id}).mappings().first()
 
@@ -151,12 +135,8 @@ def get_area_by_id(
 @router.get("/", response_model=List[AreaOut], status_code=status.HTTP_200_OK)
 def get_all_areas(
     db: Session = Depends(database.get_db),
-    current_user = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    # Role check
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("area/get_all_areas.sql")
     rows = db.execute(text(sql)).mappings().all()
 
@@ -167,12 +147,8 @@ def get_areas_by_city_id(
     city_id: int,
 
     db: Session = Depends(database.get_db),
-    current_user = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    # Role check
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("area/get_areas_by_city_id.sql")
     areas_dict = db.execute(text(sql), {"city_id": city_id}).mappings().all()
 
@@ -182,11 +158,8 @@ def get_areas_by_city_id(
 def delete_area(
     area_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("area/get_area_by_id.sql")
     result = db.execute(text(sql), {"area_id": area_id})
     area = result.mappings().first()
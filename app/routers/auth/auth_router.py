@@ -1,11 +1,14 @@
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from passlib.context import CryptContext
 import re
 import os
+import uuid
 from dotenv import load_dotenv
 
 from app import database
@@ -25,31 +28,25 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")))
-    to_encode.update({"exp": expire})
+    issued_at = datetime.now(timezone.utc)
+    expire = issued_at + timedelta(minutes=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")))
+    to_encode.update({"exp": expire, "iat": issued_at, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, os.getenv("SECRET_KEY"), algorithm=os.getenv("ALGORITHM"))
     return encoded_jwt
 
 @router.post("/login")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(database.get_async_db)):
     email = form_data.username
     password = form_data.password
-    print("Login attempt:", email)
     if not email_pattern.match(email):
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     # if ( not re.search(r"\d", password) ) or ( not re.search(r"[A-Z]",password) ) or (len(password) < 8):
     #     raise HTTPException(status_code=400, detail="Incorrect username or password")
-    user = db.query(User).filter(User.email == form_data.username).first()
-    print("Received password from frontend:", repr(form_data.password))
+    result = await db.execute(select(User).where(User.email == form_data.username))
+    user = result.unique().scalars().first()
 
-    if not user:
-        print("User not found")
-    else:
-        print("User found:", user.email)
-        print("Stored hash:", user.password_hash)
-        print("Password match:", pwd_context.verify(form_data.password, user.password_hash))
-        
-    if not user or not pwd_context.verify(form_data.password, user.password_hash):
+    # bcrypt is deliberately slow; keep it off the event loop
+    if not user or not await run_in_threadpool(pwd_context.verify, password, user.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect username or password")
 
     role_dict = user.roles.__dict__
@@ -8,7 +8,7 @@ from app import database
 from ...models.user_model import User
 
 from app.utils.file_helper import load_sql
-from ...dependencies import get_current_user
+from ...dependencies import get_current_user, require_roles
 
 from .city_create import CityCreate
 from .city_out import CityOut
@@ -23,15 +23,8 @@ router = APIRouter(
 def create_city(
     city: CityCreate,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_roles = [key for key, value in role_result.items() if value]
-
-    if "admin" not in current_user_roles:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     #check city
     sql = load_sql("city/get_city_by_title.sql")
     exist_city = db.execute(text(sql), {"title": city.title}).scalar()
@@ -114,11 +107,8 @@ def update_city_by_id(
 def get_city_by_id(
     city_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor")),
 ):
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("city/get_city_by_id.sql")
     rows = db.execute(text(sql), {"city_id": city_id}).mappings().all()
 
@@ -140,12 +130,8 @@ def get_city_by_id(
 @router.get("", response_model=List[CityOut], status_code=status.HTTP_200_OK)
 def get_all_cities(
     db: Session = Depends(database.get_db),
-    current_user = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    # ✅ Role check
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("city/get_all_cities.sql")
     rows = db.execute(text(sql)).mappings().all()
 
@@ -169,11 +155,8 @@ def get_all_cities(
 def get_cities_by_county_id(
     county_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor")),
 ):
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("city/get_cities_by_county_id.sql")
     rows = db.execute(text(sql), {"county_id": county_id}).mappings().all()
 
@@ -196,11 +179,8 @@ def get_cities_by_county_id(
 def delete_city(
     city_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("city/get_city_by_id.sql")
     result = db.execute(text(sql), {"city_id": city_id})
     city = result.mappings().first()
@@ -1,13 +1,6 @@
 from pydantic import BaseModel
 from .consumer_out import ConsumerOut
-
-class PaginationMeta(BaseModel):
-    total: int
-    page: int
-    per_page: int
-    total_pages: int
-    has_next: bool
-    has_prev: bool
+from ...utils.pagination import PaginationMeta
 
 class PaginatedConsumer(BaseModel):
     data: list[ConsumerOut]
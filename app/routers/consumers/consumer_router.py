@@ -5,10 +5,11 @@ from sqlalchemy import text
 from datetime import date, datetime, timezone
 
 from app import database
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_user_roles, require_roles
 from app.models.user_model import User
 from app.routers.consumers.consumer_pagination import PaginatedConsumer
-from app.utils.file_helper import load_sql
+from app.utils.file_helper import load_sql, load_query
+from app.utils.keyset import Keyset, SortColumn
 
 from app.routers.consumers.consumer_out import ConsumerOut
 from app.routers.consumers.consumer_create import ConsumerCreate
@@ -18,15 +19,21 @@ from app.models.user_model import User
 
 router = APIRouter(prefix="/consumers", tags=["Consumers"])
 
+CONSUMER_SORT_COLUMNS = {
+    "consumer_id": SortColumn("c.consumer_id", "consumer_id"),
+    "surname": SortColumn("c.surname", "surname"),
+    "father_name": SortColumn("c.father_name", "father_name"),
+    "name": SortColumn("c.name", "name"),
+    "created_at": SortColumn("c.created_at", "created_at"),
+}
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 def create_consumer(
     consumer: ConsumerCreate,
     db: Session = Depends(database.get_db),
     current_user: User = Depends(get_current_user)
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    current_user_roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role_list = [key for key, value in current_user_roles.items() if value]
+    current_user_role_list = get_user_roles(current_user)
 
     if not any(role in current_user_role_list for role in ["admin", "broker", "realtor"]):
         raise HTTPException(status_code=403, detail="Not authorized to create consumers")
@@ -34,7 +41,7 @@ def create_consumer(
     db_consumer = consumer.model_dump(exclude={"roles"})
     db_consumer["created_by"] = current_user.user_id
     db_consumer["created_at"] = datetime.now(timezone.utc)
-    db_consumer["created_by_type"] = current_user_role_list[1]
+    db_consumer["created_by_type"] = current_user_role_list[0]
     params = {**db_consumer}
 
     sql = load_sql("consumer/create_consumer.sql")
@@ -63,10 +70,8 @@ def get_consumer_by_id(
     if consumer_data is None:
         raise HTTPException(status_code=404, detail="consumer not found")
     
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
     if not (
-        roles["admin"] == True
+        "admin" in get_user_roles(current_user)
         or current_user.user_id == consumer_data["created_by"]
     ):
         raise HTTPException(status_code=403, detail="Not authorized")
@@ -86,9 +91,7 @@ def update_consumer_by_id(
     if not consumer_row:
         raise HTTPException(status_code=404, detail="Consumer not found")
 
-    role_sql = load_sql("role/get_user_roles.sql")
-    current_user_roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role_list = [key for key, value in current_user_roles.items() if value]
+    current_user_role_list = get_user_roles(current_user)
     if not (
         "admin" in current_user_role_list
         or current_user.user_id == consumer_row["created_by"]
@@ -125,13 +128,8 @@ def update_consumer_by_id(
 def delete_consumer(
     consumer_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if roles["admin"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     sql = load_sql("consumer/get_consumer_by_id.sql")
     result = db.execute(text(sql), {"consumer_id": consumer_id})
     consumer = result.mappings().first()
@@ -149,6 +147,7 @@ def get_all_consumers(
     per_page: int = Query(10, ge=1),
     sort_by: str = Query("consumer_id", regex="^(consumer_id|surname|father_name|name|created_at)$"),
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None),
 
     name: Optional[str] = Query(None),
     father_name: Optional[str] = Query(None),
@@ -165,17 +164,12 @@ def get_all_consumers(
     created_at: Optional[date] = Query(None),
 
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor")),
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    
-    if roles["admin"] == False and roles["broker"] == False and roles["realtor"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    if roles["admin"] == True:
+    roles = get_user_roles(current_user)
+    if "admin" in roles:
         role = 'admin'
-    elif roles["broker"] == True:
+    elif "broker" in roles:
         role = 'broker'
     else:
         role = 'realtor'
@@ -200,27 +194,15 @@ def get_all_consumers(
     # total count
     total_sql = load_sql("consumer/count_all_consumers.sql")
     total = db.execute(text(total_sql), params).scalar()
-    total_pages = (total + per_page - 1) // per_page
-    sql = load_sql("consumer/get_all_consumers.sql").format(
-        sort_by=sort_by,
-        sort_order=sort_order
-    )
-    params.update({
-        "limit": per_page,
-        "offset": (page - 1) * per_page
-    })
-
-    result = db.execute(text(sql), params)
-    consumers = [ConsumerOut(**row) for row in result.mappings()]
+
+    keyset = Keyset(CONSUMER_SORT_COLUMNS, CONSUMER_SORT_COLUMNS["consumer_id"], sort_by, sort_order, page, per_page, cursor)
+    query = load_query("consumer/get_all_consumers.sql", **keyset.format_args)
+    params.update(keyset.params)
+
+    result = db.execute(query, params)
+    consumers = [ConsumerOut(**row) for row in keyset.rows(result.mappings())]
 
     return {
-        "pagination": {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        },
+        "pagination": keyset.meta(total),
         "data": consumers
     }
@@ -0,0 +1,5 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class ContractBulkClose(BaseModel):
+    mls_nums: List[int] = Field(..., min_length=1, max_length=500)
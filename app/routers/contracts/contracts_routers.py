@@ -1,20 +1,22 @@
 import json
-import os
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from sqlalchemy import text
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app import database
 
-from pytest import Session
-
-from app import database
-
 from ...models.user_model import User
 
-from ...dependencies import get_current_user
-from ...utils.file_helper import load_sql
+from ...dependencies import require_roles
+from .contract_close import ContractBulkClose
+from ...utils.file_helper import load_query
+from ...utils.count_strategy import count_cache
+from ...utils.listing_helper import refresh_property_listing
+from ...utils.rollup_helper import refresh_rollups
+from ...utils.blob_store import blob_store
+from ...utils.etag_helper import make_etag, etag_matches
+from ...utils.media import media_response, PRIVATE_IMMUTABLE
 from datetime import datetime
 
 router = APIRouter(
@@ -22,131 +24,208 @@ router = APIRouter(
     tags=["Contracts"]
 )
 
-UPLOAD_DIR = "static/contracts"
+def contract_etag_headers(etag: str) -> dict:
+    # Contracts are private: clients may cache but must revalidate with If-None-Match
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
 
-STATIC_DIR = os.path.join(os.getcwd(), "static")
-CONTRACT_DIR = os.path.join(STATIC_DIR, "contracts")
-os.makedirs(CONTRACT_DIR, exist_ok=True)
-
-def load_data(path):
-    if not os.path.exists(path):
-        raise HTTPException(status_code=400, detail=f"❌ The file at '{path}' does not exist.")
-
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid JSON in file: {path}")
+@router.get("/")
+def search_contracts(
+    buyer_agent_id: Optional[int] = None,
+    seller_id: Optional[int] = None,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
+):
+    # Fields are matched by JSONB containment, which the GIN index on payload serves
+    contract_filter = {}
+    if buyer_agent_id is not None:
+        contract_filter["buyer_agent_id"] = buyer_agent_id
+    if seller_id is not None:
+        contract_filter["sellers"] = [{"id": seller_id}]
+
+    rows = db.execute(load_query("contract/search_contracts.sql"), {
+        "filter": json.dumps(contract_filter),
+        "limit": per_page,
+        "offset": (page - 1) * per_page
+    }).mappings().all()
+    return {"contracts": [dict(row) for row in rows], "page": page, "per_page": per_page}
 
 @router.get("/{mls}")
 def get_contract_by_mls(
-    mls: str,
-    current_user: User = Depends(get_current_user)
+    mls: int,
+    request: Request,
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(require_roles("broker", "realtor"))
 ):
-    if not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=404, detail="Not authorized")
-    
-    folder_dir = os.path.join(UPLOAD_DIR, f"{mls}.json")
-
-    result = load_data(folder_dir)
-
-    if not result:
-        raise HTTPException(status_code=404, detail="Contract is empty.")
-    
-    return result
+    contract = db.execute(load_query("contract/get_contract_by_mls.sql"), {"mls": mls}).mappings().first()
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found")
+
+    etag = make_etag(contract["payload_sha256"])
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=contract_etag_headers(etag))
+    # payload is already JSON text, so it is sent as-is
+    return Response(content=contract["payload"], media_type="application/json", headers=contract_etag_headers(etag))
+
+@router.get("/{mls}/pdf")
+def get_contract_pdf(
+    mls: int,
+    request: Request,
+    v: Optional[str] = None,
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
+):
+    contract = db.execute(load_query("contract/get_contract_by_mls.sql"), {"mls": mls}).mappings().first()
+    if not contract or not contract["pdf_sha256"] or not blob_store.exists(contract["pdf_sha256"]):
+        raise HTTPException(status_code=404, detail="Contract PDF not found")
+
+    # Blobs are content-addressed, so the hash is a strong validator for the bytes. A URL versioned with
+    # ?v=<pdf_sha256> always names the same bytes and may be cached without revalidation.
+    sha256 = contract["pdf_sha256"]
+    etag = make_etag(sha256)
+    cache_control = PRIVATE_IMMUTABLE if v == sha256 else contract_etag_headers(etag)["Cache-Control"]
+    return media_response(
+        request,
+        blob_store.path(sha256),
+        f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}",
+        "application/pdf",
+        etag,
+        cache_control=cache_control,
+        filename=f"{mls}.pdf"
+    )
 
 @router.post("/sign/{mls}/{receiver_id}", status_code=status.HTTP_201_CREATED)
 async def create_signed_contract(
-    mls: str,
+    mls: int,
     receiver_id: int,
     contract_json: str = Form(...),
     pdf_file: Optional[UploadFile] = File(None),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    contract_data = json.loads(contract_json)
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    # File path: static/contracts/{mls}.json
-    file_path = os.path.join(CONTRACT_DIR, f"{mls}.json")
-
-    # Save contract JSON to file
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(contract_data, f, ensure_ascii=False, indent=4)
+    try:
+        contract_data = json.loads(contract_json)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail={"error": "Invalid JSON format in contract"})
+
+    # The PDF is streamed to the blob store in chunks; identical files are stored once
+    pdf_sha256, pdf_size = None, None
+    if pdf_file is not None and pdf_file.filename:
+        pdf_sha256, pdf_size = await blob_store.put_upload(pdf_file)
+
+    await db.execute(load_query("contract/upsert_contract.sql"), {
+        "mls_num": mls,
+        "receiver_id": receiver_id,
+        "payload": json.dumps(contract_data, ensure_ascii=False),
+        "pdf_sha256": pdf_sha256,
+        "pdf_size": pdf_size,
+        "created_by": current_user.user_id
+    })
+    await db.commit()
 
     return {
-        "message": "Contract saved successfully"
+        "message": "Contract saved successfully",
+        "pdf_url": f"/contracts/{mls}/pdf?v={pdf_sha256}" if pdf_sha256 else None
     }
 
-@router.put("/contract/close/{mls}", status_code=status.HTTP_200_OK)
-def close_contract(
-    mls: int, 
-    db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
-):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if roles["admin"] == False and roles["broker"] == False and roles["realtor"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    # Check if mls_num exists
-    sql_check = load_sql("property/get_property_by_mls.sql")
-    property_result = db.execute(text(sql_check), {"mls": mls}).mappings().first()
-    if not property_result:
-        raise HTTPException(status_code=404, detail="Property with this MLS number not found")
-
-    # Get and process JSON file with flexible path
-    static_dir = os.path.join(os.getcwd(), "static", "contracts")  # الإضافة هنا
-    os.makedirs(static_dir, exist_ok=True)  # تأكد من وجود المجلد
-    file_path = None
-    
-    # Search for file containing mls in its name
-    for file in os.listdir(static_dir):
-        if str(mls) in file:  # Check if mls number is part of the filename
-            file_path = os.path.join(static_dir, file)
-            break
-    
-    if not file_path or not os.path.exists(file_path):
-        raise HTTPException(status_code=400, detail={"error": "File not found"})
-
-    try:
-        with open(file_path, "r") as file:
-            contract_data = json.load(file)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail={"error": "Invalid JSON format in file"})
+CLOSING_INSERTS = {
+    "sell": "sales/insert_sales_bulk.sql",
+    "rent": "rents/insert_rents_bulk.sql"
+}
 
-    # Save data in rents or sales based on contract type
-    contract_type = property_result.get("trans_type", "").lower()
-    current_date = contract_data.get("date", datetime.utcnow().isoformat())
+def build_closing(property_row, contract_data: Optional[dict], current_user: User) -> tuple[str, dict]:
+    if not property_row:
+        raise HTTPException(status_code=404, detail="Property with this MLS number not found")
+    if property_row["status"] == "closed":
+        raise HTTPException(status_code=409, detail="Property is already closed")
+    if contract_data is None:
+        raise HTTPException(status_code=400, detail={"error": "Contract not found"})
+    contract_type = (property_row["trans_type"] or "").lower()
+    if contract_type not in CLOSING_INSERTS:
+        raise HTTPException(status_code=400, detail={"error": "Invalid contract type, must be 'rent' or 'sale'"})
+    sellers = contract_data.get("sellers") or []
+    if not sellers:
+        raise HTTPException(status_code=400, detail={"error": "Contract has no sellers"})
 
-    insert_data = {
-        "property_id": property_result["property_id"],
+    return contract_type, {
+        "property_id": property_row["property_id"],
         "sold_price": contract_data.get("final_price"),
         "buyer_agent_commission": contract_data.get("buyer_commission"),
         "seller_agent_commission": contract_data.get("seller_commission"),
-        "date": current_date,
+        "date": contract_data.get("date", datetime.utcnow().isoformat()),
         "buyer_id": contract_data.get("buyer_agent_id"),
-        "seller_id": contract_data.get("sellers")[0].get("id"),
+        "seller_id": sellers[0].get("id"),
         "closed_by_id": current_user.user_id
     }
 
-    if contract_type == "rent":
-        sql_insert = load_sql("rents/insert_rent.sql")
-        db.execute(text(sql_insert), insert_data)
-    elif contract_type == "sell":
-        sql_insert = load_sql("sales/insert_sale.sql")
-        db.execute(text(sql_insert), insert_data)
-    else:
-        raise HTTPException(status_code=400, detail={"error": "Invalid contract type, must be 'rent' or 'sale'"})
-
-     # Update property status to 'closed'
-    sql_update = load_sql("property/close_contract.sql")
-    updated_property = db.execute(text(sql_update), {"mls": mls}).mappings().first()
-    if not updated_property:
-        raise HTTPException(status_code=404, detail="Failed to update property status")
+def close_contracts(db: Session, mls_nums: list[int], current_user: User) -> tuple[list[int], dict[int, HTTPException]]:
+    # Locks every property up front (FOR UPDATE), so a property cannot be closed twice by concurrent requests.
+    # Contracts that fail validation are reported back; the rest are written with one statement per table.
+    sql_lock = load_query("property/lock_properties_by_mls.sql")
+    locked = {row["mls_num"]: row for row in db.execute(sql_lock, {"mls_nums": mls_nums}).mappings()}
+    sql_contracts = load_query("contract/get_contracts_by_mls.sql")
+    contracts = {row.mls_num: row.payload for row in db.execute(sql_contracts, {"mls_nums": mls_nums})}
+
+    closings = {contract_type: [] for contract_type in CLOSING_INSERTS}
+    closed, failed = [], {}
+    for mls in dict.fromkeys(mls_nums):
+        try:
+            contract_type, closing = build_closing(locked.get(mls), contracts.get(mls), current_user)
+        except HTTPException as error:
+            failed[mls] = error
+            continue
+        closings[contract_type].append(closing)
+        closed.append(mls)
+
+    if not closed:
+        return closed, failed
+
+    for contract_type, rows in closings.items():
+        if rows:
+            db.execute(load_query(CLOSING_INSERTS[contract_type]), {"closings": json.dumps(rows)})
+
+    # Credit the listing agents on the leaderboard for the month of each closing
+    all_closings = [row for rows in closings.values() for row in rows]
+    db.execute(load_query("topten_agent/record_closing.sql"), {"closings": json.dumps(all_closings)})
+
+    # Update property status to 'closed'
+    property_ids = [row["property_id"] for row in all_closings]
+    db.execute(load_query("property/close_contract.sql"), {"property_ids": property_ids})
+    refresh_property_listing(db, property_ids)
+    refresh_rollups(db, property_ids)
 
     db.commit()
-    
+    count_cache.clear()
+    return closed, failed
+
+@router.put("/contract/close/{mls}", status_code=status.HTTP_200_OK)
+def close_contract(
+    mls: int, 
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
+):
+    _, failed = close_contracts(db, [mls], current_user)
+    if mls in failed:
+        raise failed[mls]
+
     return {
         "message": "Contract closed successfully"
     }
+
+@router.put("/contract/close", status_code=status.HTTP_200_OK)
+def close_contracts_bulk(
+    contracts: ContractBulkClose,
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
+):
+    closed, failed = close_contracts(db, contracts.mls_nums, current_user)
+
+    return {
+        "message": f"{len(closed)} contracts closed",
+        "closed": closed,
+        "failed": [
+            {"mls": mls, "status_code": error.status_code, "detail": error.detail}
+            for mls, error in failed.items()
+        ]
+    }
@@ -8,7 +8,7 @@ from app import database
 from ...models.user_model import User
 
 from app.utils.file_helper import load_sql
-from ...dependencies import get_current_user
+from ...dependencies import get_current_user, require_roles
 
 from .county_create import CountyCreate
 from .county_out import CountyOut
@@ -23,15 +23,8 @@ router = APIRouter(
 def create_county(
     county: CountyCreate,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_roles = [key for key, value in role_result.items() if value]
-
-    if "admin" not in current_user_roles:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     #check county
     sql = load_sql("county/get_county_by_title.sql")
     exist_county = db.execute(text(sql), {"title":county.title}).mappings().first()
@@ -99,11 +92,8 @@ def update_county_by_id(
 def get_county_by_id(
     county_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor")),
 ):
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("county/get_county_by_id.sql")
     rows = db.execute(text(sql), {"county_id": county_id}).mappings().all()
 
@@ -125,12 +115,8 @@ def get_county_by_id(
 @router.get("", response_model=List[CountyOut], status_code=status.HTTP_200_OK)
 def get_all_counties(
     db: Session = Depends(database.get_db),
-    current_user = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    # Role check
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("county/get_all_counties.sql")
     rows = db.execute(text(sql)).mappings().all()
 
@@ -153,11 +139,8 @@ def get_all_counties(
 def delete_county(
     county_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("county/get_county_by_id.sql")
     result = db.execute(text(sql), {"county_id": county_id})
     county = result.mappings().first()
@@ -4,14 +4,16 @@ import json
 from fastapi import Depends, HTTPException, APIRouter, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from .license_pagination import PaginatedLicenses
 
 from app import database
-from ...dependencies import get_current_user
+from ...dependencies import require_roles
 from ...models.user_model import User
-from ...utils.file_helper import load_sql
+from ...utils.file_helper import load_sql, load_query
+from ...utils.keyset import Keyset, SortColumn
 from ...utils.enums import LicenseStatus, LicenseType
-from ...utils.random_generator import generate_unique_license_num
+from ...utils.number_allocator import LICENSE_SPACE, allocate_number, is_unique_violation, ALLOCATION_RETRIES
 
 from ...routers.licenses.licenses_create import LicenseCreate
 from ...routers.licenses.licenses_out import LicenseOut
@@ -19,19 +21,21 @@ from ...routers.licenses.licenses_update import LicenseUpdate
 
 router = APIRouter(prefix="/licenses", tags=["Licenses"])
 
+LICENSE_SORT_COLUMNS = {
+    "license_id": SortColumn("l.license_id", "license_id"),
+    "lic_num": SortColumn("l.lic_num", "lic_num"),
+    "lic_status": SortColumn("l.lic_status", "lic_status"),
+    "lic_type": SortColumn("l.lic_type", "lic_type"),
+    "user_id": SortColumn("l.user_id", "user_id"),
+    "agency_id": SortColumn("l.agency_id", "agency_agency_id"),
+}
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 def create_license(
     license: LicenseCreate,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_roles = [key for key, value in role_result.items() if value]
-
-    if "admin" not in current_user_roles:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("user/get_user_by_id.sql")
     user_result = db.execute(text(sql), {"user_id": license.user_id}).mappings().first()
     if not user_result:
@@ -51,18 +55,19 @@ def create_license(
     
     license_data = license.model_dump()
 
-    lic_num = generate_unique_license_num(db)
-    license_data["lic_num"] = lic_num
-
     license_sql = load_sql("license/create_license.sql")
-    license_result = db.execute(text(license_sql), license_data)
-    new_license_id = license_result.scalar()
+    for attempt in range(ALLOCATION_RETRIES):
+        license_data["lic_num"] = str(allocate_number(db, LICENSE_SPACE))
+        try:
+            with db.begin_nested():
+                new_license_id = db.execute(text(license_sql), license_data).scalar()
+            break
+        except IntegrityError as e:
+            if attempt == ALLOCATION_RETRIES - 1 or not is_unique_violation(e, "lic_num"):
+                raise
 
     db.commit()
 
-    role_result = db.execute(text(role_sql), {"user_id": license.user_id}).mappings().first()
-    current_user_roles = [key for key, value in role_result.items() if value]
-
     sql = load_sql("license/get_license_by_id.sql")
     created_license = db.execute(text(sql), {"license_id": new_license_id}).mappings().first()
 
@@ -82,15 +87,8 @@ def update_license(
     license_id: int,
     license_in: LicenseUpdate,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    # Check user role
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role = [key for key, value in role_result.items() if value]
-    if "admin" not in current_user_role:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     # Fetch existing license
     get_sql = load_sql("license/get_license_by_id.sql")
     license_db = db.execute(text(get_sql), {"license_id": license_id}).mappings().first()
@@ -144,15 +142,8 @@ def update_license(
 @router.get("/me", response_model=LicenseOut, status_code=status.HTTP_200_OK)
 def get_user_license(
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("broker", "realtor")),
 ):
-    # Check user roles
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-
-    if not (roles.get("broker") or roles.get("realtor")):
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     # Load query for license by id
     sql = load_sql("license/get_license_by_user.sql")
     result = db.execute(text(sql), {"user_id": current_user.user_id}).mappings().first()
@@ -176,6 +167,7 @@ def get_all_licenses(
 
     sort_by: str = Query("license_id", regex="^(license_id|lic_num|lic_status|lic_type|user_id|agency_id)$"),
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None),
 
     lic_status: Optional[LicenseStatus] = Query(None),
     lic_type: Optional[LicenseType] = Query(None),
@@ -183,24 +175,11 @@ def get_all_licenses(
     filter_user_id: Optional[int] = Query(None),
 
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin")),
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-
-    if not roles["admin"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    if roles["admin"]:
-        role = "admin"
-    elif roles["broker"]:
-        role = "broker"
-    else:
-        role = "realtor"
-
     params = {
         "user_id": current_user.user_id,
-        "role": role,
+        "role": "admin",
         "lic_status": lic_status,
         "lic_type": lic_type,
         "agency_id": agency_id,
@@ -210,14 +189,14 @@ def get_all_licenses(
     # total count
     total_sql = load_sql("license/count_licenses.sql")
     total = db.execute(text(total_sql), params).scalar()
-    total_pages = (total + per_page - 1) // per_page
 
-    sql = load_sql("license/get_all_licenses.sql").format(sort_by=sort_by, sort_order=sort_order)
-    params.update({"limit": per_page, "offset": (page - 1) * per_page})
-    query_result = db.execute(text(sql), params)
+    keyset = Keyset(LICENSE_SORT_COLUMNS, LICENSE_SORT_COLUMNS["license_id"], sort_by, sort_order, page, per_page, cursor)
+    query = load_query("license/get_all_licenses.sql", **keyset.format_args)
+    params.update(keyset.params)
+    query_result = db.execute(query, params)
 
     licenses = []
-    for result in query_result.mappings():
+    for result in keyset.rows(query_result.mappings()):
         broker_data = {k.replace("broker_", ""): v for k, v in result.items() if k.startswith("broker_")}
         agency_data = {k[len("agency_"):]: v for k, v in result.items() if k.startswith("agency_")}
 
@@ -230,14 +209,7 @@ def get_all_licenses(
         )
 
     return {
-        "pagination": {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        },
+        "pagination": keyset.meta(total),
         "data": licenses
     }
 
@@ -245,26 +217,12 @@ def get_all_licenses(
 def get_license_by_id(
     license_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin")),
 ):
-    # Check user roles
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-
-    if not roles["admin"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    if roles["admin"]:
-        role = "admin"
-    elif roles["broker"]:
-        role = "broker"
-    else:
-        role = "realtor"
-
     # Load query for license by id
     sql = load_sql("license/get_license_by_id.sql")
     result = db.execute(text(sql),
-        {"user_id": current_user.user_id, "role": role, "license_id": license_id}
+        {"user_id": current_user.user_id, "role": "admin", "license_id": license_id}
     ).mappings().first()
 
     if not result:
@@ -283,13 +241,8 @@ def get_license_by_id(
 def delete_license(
     license_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if roles["admin"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     sql = load_sql("license/get_license_by_id.sql")
     license_existing = db.execute(text(sql), {"license_id": license_id}).mappings().first()
     if not license_existing:
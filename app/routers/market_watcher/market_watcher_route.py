@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app import database
+from app.utils.file_helper import load_query
+from app.utils.analytics_serializer import AnalyticsResponse, serialize_result
 
 from dateutil.relativedelta import relativedelta
 
@@ -23,99 +24,20 @@ def subtract_period(period: str):
         new_date = date_obj - relativedelta(years=1)
     else:
         raise ValueError("Invalid period.")
-    return new_date.strftime("%Y-%m-%d")
+    return new_date.date()
 
 
-@router.get("/")
+@router.get("/", response_class=AnalyticsResponse)
 def Market_watcher(
     period: str,
     area: str,
-    
+    live: bool = Query(False, description="Count from properties directly instead of the daily rollup"),
     db: Session = Depends(database.get_db)
 ):
     start_date = subtract_period(period)
-    end_date = datetime.today().strftime("%Y-%m-%d")
+    # Half-open range on the day after today, so last_updated is compared as-is and its index applies
+    end_date = datetime.today().date() + timedelta(days=1)
 
-    query_new = """
-        SELECT COUNT(*)
-        FROM properties p
-        JOIN addresses a ON p.property_id = a.property_id
-        WHERE a.area = :area
-        AND DATE(p.last_updated) BETWEEN :start_date AND :end_date 
-        AND p.status = 'active'
-    """
-    query_pending = """
-        SELECT COUNT(*) 
-        FROM properties p
-        JOIN addresses a ON p.property_id= a.property_id
-        WHERE a.area = :area
-        AND DATE(p.last_updated) BETWEEN :start_date AND :end_date 
-        AND p.status = 'pending'
-    """
-    query_closed = """
-        SELECT COUNT(*) 
-        FROM properties p
-        JOIN addresses a ON p.property_id = a.property_id
-        WHERE a.area = :area
-        AND DATE(p.last_updated) BETWEEN :start_date AND :end_date 
-        AND p.status = 'closed'
-    """
-    query_out = """
-        SELECT COUNT(*) 
-        FROM properties p
-        JOIN addresses a ON p.property_id = a.property_id
-        WHERE a.area = :area
-        AND DATE(p.last_updated) BETWEEN :start_date AND :end_date
-        AND p.status = 'out_of_market'
-    """
-    query_return = """
-        SELECT COUNT(*) 
-        FROM properties p
-        JOIN addresses a ON p.property_id = a.property_id
-        WHERE a.area = :area
-        AND DATE(p.last_updated) BETWEEN :start_date AND :end_date
-        AND p.last_updated != p.created_at
-    """
-
-    result1 = (
-        db.execute(
-            text(query_new),
-            {"area": area, "start_date": start_date, "end_date": end_date},
-        ).scalar()
-        or 0
-    )
-    result2 = (
-        db.execute(
-            text(query_pending),
-            {"area": area, "start_date": start_date, "end_date": end_date},
-        ).scalar()
-        or 0
-    )
-    result3 = (
-        db.execute(
-            text(query_closed),
-            {"area": area, "start_date": start_date, "end_date": end_date},
-        ).scalar()
-        or 0
-    )
-    result4 = (
-        db.execute(
-            text(query_out),
-            {"area": area, "start_date": start_date, "end_date": end_date},
-        ).scalar()
-        or 0
-    )
-    result5 = (
-        db.execute(
-            text(query_return),
-            {"area": area, "start_date": start_date, "end_date": end_date},
-        ).scalar()
-        or 0
-    )
-    return {
-        "new_listings_count": result1,
-        "pending_count": result2,
-        "closed_count": result3,
-        "out_of_market": result4,
-        "return_the_market": result5,
-    }
+    filename = "market_watcher/get_market_counts.sql" if live else "market_watcher/get_market_counts_rollup.sql"
+    counts = db.execute(load_query(filename), {"area": area, "start_date": start_date, "end_date": end_date})
+    return AnalyticsResponse(content=serialize_result(counts)[0])
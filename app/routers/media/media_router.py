@@ -0,0 +1,38 @@
+import re
+from fastapi import APIRouter, HTTPException, Request
+
+from ...utils.etag_helper import make_etag
+from ...utils.media import media_response
+from ...utils.validate_photo import photo_store
+
+router = APIRouter(
+    prefix="/media",
+    tags=["Media"]
+)
+
+# <sha[:2]>/<sha[2:4]>/<sha>.<ext>, optionally a derivative <size>/<sha>.<ext>.webp beside it
+PHOTO_PATH = re.compile(
+    r"^(?P<a>[0-9a-f]{2})/(?P<b>[0-9a-f]{2})/(?:(?P<size>thumb|medium)/)?"
+    r"(?P<sha>[0-9a-f]{64})\.(?P<ext>jpg|png|webp)(?P<derivative>\.webp)?$"
+)
+PHOTO_TYPES = {"jpg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+@router.get("/photos/{photo_path:path}")
+def get_photo(photo_path: str, request: Request):
+    # Photo URLs name the content hash, so each one is immutable and public
+    match = PHOTO_PATH.match(photo_path)
+    if (
+        not match
+        or match["sha"][:4] != match["a"] + match["b"]
+        or bool(match["size"]) != bool(match["derivative"])
+    ):
+        raise HTTPException(status_code=404, detail="Photo not found")
+
+    path = photo_store.root / photo_path
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Photo not found")
+
+    # A derivative is fixed by its source photo and size
+    etag = make_etag(f"{match['sha']}-{match['size']}" if match["size"] else match["sha"])
+    media_type = "image/webp" if match["derivative"] else PHOTO_TYPES[match["ext"]]
+    return media_response(request, path, f"photos/{photo_path}", media_type, etag)
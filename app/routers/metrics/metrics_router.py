@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, status
+
+from ...models.user_model import User
+from ...dependencies import require_roles
+from ...utils.pool_metrics import collect_pool_metrics
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+def get_pool_metrics(
+    current_user: User = Depends(require_roles("admin"))
+):
+    return collect_pool_metrics()
@@ -1,22 +1,35 @@
-from fastapi import APIRouter, Depends, Form, HTTPException, status, File, UploadFile, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, status, File, UploadFile, Query, Request
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
+import tempfile
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 import json
 
 from app import database
 
-from ...utils.file_helper import load_sql
+from ...utils.file_helper import load_sql, load_query
 from ...utils.out_helper import build_user_out
-from ...utils.random_generator import generate_unique_mls_num
-from ...dependencies import get_current_user
-from ...utils.validate_photo import save_photos, update_photos
+from ...utils.seller_helper import load_property_sellers
+from ...utils.keyset import Keyset, SortColumn
+from ...utils.count_strategy import count_cache, listing_total, window_total_column
+from ...utils.listing_helper import refresh_property_listing, refresh_property_listing_async
+from ...utils.rollup_helper import stale_buckets, refresh_rollups, refresh_rollups_async
+from ...utils.number_allocator import MLS_SPACE, allocate_number_async, allocate_numbers, is_unique_violation, ALLOCATION_RETRIES
+from ...utils.property_import import IMPORT_SPOOL_SIZE, import_format, validate_rows, copy_to_staging
+from ...utils.property_export import EXPORT_MEDIA_TYPES, stream_ndjson, stream_csv
+from ...dependencies import get_current_user, get_user_roles, require_roles, resolve_get_db
+from ...utils.validate_photo import save_photos, stage_photos, update_photos, photo_store
+from ...utils.photo_ingest import publish_photos, discard_photos
+from ...utils.photo_refs import image_hashes, acquire_photo_blobs, acquire_photo_blobs_async, release_photo_blobs
+from ...utils.photo_derivatives import build_derivatives, pending_derivatives
 
 from ...models.user_model import User
 
-from ..users.roles_enum import UserRole
-
 from ..users.user_out import UserOut
 from ..consumers.consumer_out import ConsumerOut
 from .property_out import PropertyOut
@@ -26,6 +39,7 @@ from ..addresses.address_update import AddressUpdate
 from ..additional.additional_update import AdditionalUpdate
 
 from .property_create import PropertyCreate
+from .property_import import PropertyImportRow, PropertyImportResult
 from .property_update import PropertyUpdate
 from ..additional.additional_create import AdditionalCreate
 from ..additional.additional_out import AdditionalOut
@@ -38,124 +52,105 @@ router = APIRouter(
     tags=["Properties"]
 )
 
+# sort_by values accepted by the listings, mapped to the column the cursor seeks on
+PROPERTY_SORT_COLUMNS = {
+    "property_id": SortColumn("pl.property_id", "property_id"),
+    "status": SortColumn("pl.status", "status"),
+    "mls_num": SortColumn("pl.mls_num", "mls_num"),
+    "price": SortColumn("pl.price", "price"),
+    "area": SortColumn("pl.area", "area", nullable=True),
+    "city": SortColumn("pl.city", "city", nullable=True),
+    "created_at": SortColumn("pl.created_at", "created_at"),
+}
+
+def listing_filters(city, area, min_price, max_price, mls_num, status_filter) -> dict:
+    # Parameters for the shared WHERE clause of the property_listing queries
+    return {
+        "city": f"%{city}%" if city else None,
+        "area": f"%{area}%" if area else None,
+        "min_price": min_price,
+        "max_price": max_price,
+        "mls_num": f"%{mls_num}%" if mls_num else None,
+        "status": status_filter.value if status_filter else None,
+    }
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_property(
     request: Request,
+    background_tasks: BackgroundTasks,
     property: PropertyCreate = Depends(PropertyCreate.as_form),
     additional: AdditionalCreate = Depends(AdditionalCreate.as_form),
     address: AddressCreate = Depends(AddressCreate.as_form),
     photos: List[UploadFile] = File(...),
     main_photo: str = Form(None),
-    db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: User = Depends(require_roles("realtor", "broker"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role = [key for key, value in role_result.items() if value]
-
-    if "realtor" in current_user_role or "broker" in current_user_role:
-        pass
-    else:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    # All sellers in one round-trip, ordered by id like get_property_sellers.sql
+    seller_ids = list(dict.fromkeys(property.sellers))
+    seller_rows = (await db.execute(load_query("consumer/get_consumers_by_ids.sql"), {"consumer_ids": seller_ids})).mappings().all()
+    if len(seller_rows) != len(seller_ids):
+        raise HTTPException(status_code=400, detail="invalid seller")
+    sellers = [ConsumerOut(**row) for row in seller_rows]
 
-    consumer_sql = load_sql("consumer/get_consumer_by_id.sql")
-    sellers = []
-    for seller in property.sellers:
-        seller_result = db.execute(text(consumer_sql), {"consumer_id": seller}).mappings().first()
-        if not seller_result:
-            raise HTTPException(status_code=400, detail="invalid seller")
-        seller_data = dict(seller_result)
-        sellers.append(ConsumerOut(**seller_data))
-        
-
-    mls_num = generate_unique_mls_num(db)
     base_url = str(request.base_url)
-    saved_files = save_photos(mls_num, photos, base_url, main_photo)
-
-    # Create property
-    db_property = property.model_dump()
-    db_property["created_by"] = current_user.user_id
-    db_property["created_at"] = datetime.now(timezone.utc)
-    db_property["last_updated"] = datetime.now(timezone.utc)
-    db_property["images_urls"] = json.dumps(saved_files)
-    db_property["mls_num"] = mls_num
-    db_property.pop("sellers", None)
-
-    property_sql = load_sql("property/create_property.sql")
-    property_result = db.execute(text(property_sql), db_property)
-    new_property_id = property_result.scalar()
-
-    #create sellers relationship
-    property_sellers_sql = load_sql("property/create_property_seller.sql")
-    for seller in property.sellers:
-        db.execute(text(property_sellers_sql), {"property_id": new_property_id, "seller_id":seller})
-
-    # Create property address
-    address_data = address.model_dump()
-    address_data["created_at"] = datetime.now(timezone.utc)
-    address_data["created_by"] = current_user.user_id
-    address_data["property_id"] = new_property_id
-    
-    address_sql = load_sql("address/create_property_address.sql")
-    address_result = db.execute(text(address_sql),address_data)
-    address_id = address_result.scalar()
-
-    # Create property additional
-    db_additional = additional.model_dump()
-    db_additional["property_id"] = new_property_id
-
-    additional_sql = load_sql("additional/create_additional.sql")
-    additional_result = db.execute(text(additional_sql), db_additional)
-    new_additional_id = additional_result.scalar()
+    saved_files, staged = await save_photos(photos, base_url, main_photo)
+    # Until published, the staged files are only temp files; remove them if anything below fails
+    try:
+        # Property, owners, address and additional go in one statement, which also returns the response row
+        db_property = property.model_dump()
+        db_property.pop("sellers", None)
+        db_property.update(address.model_dump())
+        db_property.update(additional.model_dump())
+        db_property["seller_ids"] = seller_ids
+        db_property["created_by"] = current_user.user_id
+        # asyncpg rejects aware datetimes for TIMESTAMP columns, so store naive UTC like psycopg2 did
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        db_property["created_at"] = now
+        db_property["last_updated"] = now
+        db_property["images_urls"] = json.dumps(saved_files)
+
+        # A number the allocator has checked can still be taken by the time of the insert; retry with a new one
+        property_query = load_query("property/create_property.sql")
+        for attempt in range(ALLOCATION_RETRIES):
+            db_property["mls_num"] = await allocate_number_async(db, MLS_SPACE)
+            try:
+                async with db.begin_nested():
+                    created_property = (await db.execute(property_query, db_property)).mappings().first()
+                break
+            except IntegrityError as e:
+                if attempt == ALLOCATION_RETRIES - 1 or not is_unique_violation(e, "mls_num"):
+                    raise
+        new_property_id = created_property["property_id"]
+
+        await acquire_photo_blobs_async(db, staged, image_hashes(saved_files))
+
+        await refresh_property_listing_async(db, [new_property_id])
+        await refresh_rollups_async(db, [new_property_id])
+        await db.commit()
+        # Moved into the store only once their photo_blobs references are committed, so a failed
+        # write never leaves a stored file that no row points at (photo_gc only sweeps rows)
+        await run_in_threadpool(publish_photos, photo_store, staged)
+    except BaseException:
+        discard_photos(staged)
+        raise
+    count_cache.clear()
+    # Thumbnails and WebP copies are made after the response; their URLs land in images_urls when done
+    background_tasks.add_task(build_derivatives, new_property_id, pending_derivatives(saved_files), resolve_get_db(request))
 
-    db.commit()
-    
-
-    sql = load_sql("property/get_property_by_id.sql")
-    created_property = db.execute(text(sql), {"property_id": new_property_id}).mappings().first()
-
-    address_dict = {
-        "address_id": created_property.get("address_address_id"),
-        "floor": created_property.get("address_floor"),
-        "apt": created_property.get("address_apt"),
-        "area": created_property.get("address_area"),
-        "city": created_property.get("address_city"),
-        "county": created_property.get("address_county"),
-        "created_at": created_property.get("address_created_at"),
-        "created_by": created_property.get("address_created_by"),
-        "building_num": created_property.get("address_building_num"),
-        "street" : created_property.get("address_street")
+    nested_prefixes = ("created_by_", "address_")
+    property_data = {
+        k: v for k, v in created_property.items()
+        if not any(k.startswith(prefix) for prefix in nested_prefixes)
     }
-    address_obj = AddressOut(**address_dict) if address_dict else None
-    
-    user_sql = load_sql("user/get_user_by_id.sql")
-    role_sql = load_sql("role/get_user_roles.sql")
-    additional_sql = load_sql("additional/get_additional_by_id.sql")
-
-    created_by_id = current_user.user_id
-    created_by_result = db.execute(text(user_sql), {"user_id": created_by_id}).mappings().first()
-    created_by_roles_result = db.execute(text(role_sql), {"user_id": created_by_id}).mappings().first()
-    created_by_roles = [key for key, value in created_by_roles_result.items() if value is True and key in UserRole.__members__] if created_by_roles_result else []
-    
-    if created_by_result:
-        created_by_data = dict(created_by_result)
-        created_by_data["roles"] = created_by_roles
-        created_by_obj = UserOut(
-            **created_by_data,
-            address = AddressOut(**created_by_result) if created_by_result.get("address_id") else None,
-        )
-    else:
-        created_by_obj = None
+    address_data = {k[len("address_"):]: v for k, v in created_property.items() if k.startswith("address_")}
 
-    property_out_data = dict(created_property)
-    property_out_data["address"] = address_obj
-    property_out_data["sellers"] = sellers
-    property_out_data["created_by_user"] = created_by_obj
-
-    created_additional = db.execute(text(additional_sql), {"property_id": new_property_id}).mappings().first()
     property_details = PropertyOut(
-        **property_out_data,
-        additional=created_additional
+        **property_data,
+        sellers=sellers,
+        created_by_user=build_user_out(created_property, "created_by_"),
+        address=AddressOut(**address_data),
+        additional=AdditionalOut(**created_property)
     )
 
     return {
@@ -163,6 +158,54 @@ async def create_property(
         "property": property_details,
     }
 
+@router.post("/import", response_model=PropertyImportResult, status_code=status.HTTP_200_OK)
+def import_properties(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, regex="^(csv|ndjson)$"),
+    dry_run: bool = False,
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(require_roles("realtor", "broker"))
+):
+    # Bulk create from CSV (one header row, flat columns) or NDJSON; sellers are consumer ids ("3,7" in CSV).
+    # Valid rows are imported together and every rejected row is reported; nothing has photos yet.
+    file_format = import_format(file, format)
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE, mode="w+", newline="") as buffer:
+        accepted, errors = validate_rows(file, file_format, buffer, PropertyImportRow)
+        imported = []
+        if accepted:
+            copy_to_staging(db, buffer)
+            rejected = db.execute(load_query("property/reject_import_sellers.sql")).mappings().all()
+            errors.extend(
+                {"row": row["row_num"], "errors": [f"sellers: unknown seller ids {row['seller_ids']}"]}
+                for row in rejected
+            )
+            remaining = accepted - len(rejected)
+            if remaining:
+                mls_nums = allocate_numbers(db, MLS_SPACE, remaining)
+                db.execute(load_query("property/assign_import_mls.sql"), {"mls_nums": mls_nums})
+                imported = db.execute(load_query("property/merge_property_import.sql"), {
+                    "created_by": current_user.user_id,
+                    "now": datetime.now(timezone.utc).replace(tzinfo=None)
+                }).mappings().all()
+
+    property_ids = [row["property_id"] for row in imported]
+    if dry_run or not property_ids:
+        db.rollback()
+    else:
+        refresh_property_listing(db, property_ids)
+        refresh_rollups(db, property_ids)
+        db.commit()
+        count_cache.clear()
+
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "imported": len(imported),
+        "failed": len(errors),
+        "dry_run": dry_run,
+        "properties": [] if dry_run else [dict(row) for row in imported],
+        "errors": errors
+    }
+
 @router.get("", response_model=PaginatedProperties, status_code=status.HTTP_200_OK)
 def get_all_properties(
     page: int = Query(1, ge=1),
@@ -170,6 +213,8 @@ def get_all_properties(
     
     sort_by: str = Query("property_id", regex="^(property_id|status|mls_num|price|area|city|created_at)$"),
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None),
+    count: str = Query("exact", regex="^(exact|estimated)$"),
     
     city: Optional[str] = Query(None),
     area: Optional[str] = Query(None),
@@ -179,35 +224,27 @@ def get_all_properties(
     status_filter: Optional[PropertyStatus] = Query(None),
 
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    if not current_user.roles.admin and not current_user.roles.broker and not current_user.roles.realtor:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    params = {
-        # "created_by": current_user.user_id,
-        "city": f"%{city}%" if city else None,
-        "area": f"%{area}%" if area else None,
-        "min_price": min_price,
-        "max_price": max_price,
-        "mls_num": f"%{mls_num}%" if mls_num else None,
-        "status": status_filter.value if status_filter else None,
-        "limit": per_page,
-        "offset": (page - 1) * per_page
-    }
-
-    total_sql = "SELECT COUNT(*) FROM properties"
-    total = db.execute(text(total_sql)).scalar()
-    total_pages = (total + per_page - 1) // per_page
-    
-    sql = load_sql("property/get_all_properties.sql")
-    sql = sql.format(sort_by=sort_by, sort_order=sort_order)
-    result = db.execute(text(sql), params)
+    params = listing_filters(city, area, min_price, max_price, mls_num, status_filter)
+    keyset = Keyset(PROPERTY_SORT_COLUMNS, PROPERTY_SORT_COLUMNS["property_id"], sort_by, sort_order, page, per_page, cursor)
+
+    total_column = window_total_column("properties", count, params, keyset.cursor)
+    query = load_query("property/get_all_properties.sql", **keyset.format_args, total=total_column)
+    rows = keyset.rows(db.execute(query, {**params, **keyset.params}).mappings().all())
+
+    total = listing_total(
+        db, "properties", count, params,
+        count_query=load_query("property/count_properties.sql"),
+        list_query=load_query("property/get_all_properties.sql", sort_by="pl.property_id", sort_order="asc", keyset="TRUE", total=""),
+        table="property_listing",
+        window_total=rows[0]["total_count"] if rows and total_column else None
+    )
 
-    sellers_sql = load_sql("property/get_property_sellers.sql")
+    sellers_by_property = load_property_sellers(db, [row["property_id"] for row in rows])
 
     properties = []
-    for row in result.mappings():
+    for row in rows:
         created_by_roles = [
             role for role in ["admin", "broker", "realtor", "buyer", "seller", "tenant"]
             if row.get(f"created_by_{role}") is True
@@ -223,11 +260,7 @@ def get_all_properties(
             created_by=row["created_by_created_by"], 
             created_at=row["created_by_created_at"] 
         )
-        sellers = []
-        sellers_result = db.execute(text(sellers_sql), {"property_id": row["property_id"]})
-        for seller in sellers_result.mappings():
-            seller_data = dict(seller)
-            sellers.append(ConsumerOut(**seller_data))
+        sellers = sellers_by_property[row["property_id"]]
             
         property = PropertyOut(
             property_id=row["property_id"],
@@ -274,16 +307,39 @@ def get_all_properties(
 
     return {
         "data": properties,
-        "pagination": {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
+        "pagination": keyset.meta(total)
     }
 
+@router.get("/export", status_code=status.HTTP_200_OK)
+def export_properties(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    sort_by: str = Query("property_id", regex="^(property_id|status|mls_num|price|area|city|created_at)$"),
+    sort_order: str = Query("asc", regex="^(asc|desc)$"),
+
+    city: Optional[str] = Query(None),
+    area: Optional[str] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    mls_num: Optional[int] = Query(None),
+    status_filter: Optional[PropertyStatus] = Query(None),
+
+    db: Session = Depends(database.get_db),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
+):
+    # Every listing matching the get_all_properties filters, streamed from a server-side cursor
+    params = listing_filters(city, area, min_price, max_price, mls_num, status_filter)
+    query = load_query(
+        "property/export_properties.sql",
+        sort_by=PROPERTY_SORT_COLUMNS[sort_by].column,
+        sort_order=sort_order
+    )
+    stream = stream_ndjson if format == "ndjson" else stream_csv
+    return StreamingResponse(
+        stream(db.get_bind(), query, params),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="properties.{format}"'}
+    )
+
 @router.get("/my-properties", response_model=PaginatedProperties, status_code=status.HTTP_200_OK)
 def my_properties(
     page: int = Query(1, ge=1),
@@ -291,6 +347,8 @@ def my_properties(
 
     sort_by: str = Query("property_id", regex="^(property_id|status|mls_num|price|area|city|created_at)$"),
     sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None),
+    count: str = Query("exact", regex="^(exact|estimated)$"),
     
     city: Optional[str] = Query(None),
     area: Optional[str] = Query(None),
@@ -310,22 +368,26 @@ def my_properties(
         "max_price": max_price,
         "mls_num": f"%{mls_num}%" if mls_num else None,
         "status": status_filter.value if status_filter else None,
-        "limit": per_page,
-        "offset": (page - 1) * per_page
     }
+    keyset = Keyset(PROPERTY_SORT_COLUMNS, PROPERTY_SORT_COLUMNS["property_id"], sort_by, sort_order, page, per_page, cursor)
 
     # Load SQL from files (SQL already has WHERE clauses with optional filters)
-    total_sql = load_sql("property/count_my_property.sql")
-    total = db.execute(text(total_sql), params).scalar()
-    total_pages = (total + per_page - 1) // per_page
+    total_column = window_total_column("my_properties", count, params, keyset.cursor)
+    query = load_query("property/get_my_property.sql", **keyset.format_args, total=total_column)
+    rows = keyset.rows(db.execute(query, {**params, **keyset.params}).mappings().all())
+
+    total = listing_total(
+        db, "my_properties", count, params,
+        count_query=load_query("property/count_my_property.sql"),
+        list_query=load_query("property/get_my_property.sql", sort_by="pl.property_id", sort_order="asc", keyset="TRUE", total=""),
+        table="property_listing",
+        window_total=rows[0]["total_count"] if rows and total_column else None
+    )
 
-    sql = load_sql("property/get_my_property.sql")
-    sql = sql.format(sort_by=sort_by, sort_order=sort_order)
-    result = db.execute(text(sql), params)
-    sellers_sql = load_sql("property/get_property_sellers.sql")
+    sellers_by_property = load_property_sellers(db, [row["property_id"] for row in rows])
 
     properties = []
-    for row in result.mappings():
+    for row in rows:
         created_by_roles = [
             role for role in ["admin", "broker", "realtor", "buyer", "seller", "tenant"]
             if row.get(f"created_by_{role}") is True
@@ -341,11 +403,7 @@ def my_properties(
             created_by=row["created_by_created_by"],
             created_at=row["created_by_created_at"]
         )
-        sellers = []
-        sellers_result = db.execute(text(sellers_sql), {"property_id": row["property_id"]})
-        for seller in sellers_result.mappings():
-            seller_data = dict(seller)
-            sellers.append(ConsumerOut(**seller_data))
+        sellers = sellers_by_property[row["property_id"]]
 
         address = AddressOut(
             address_id=row["address_address_id"],
@@ -391,14 +449,7 @@ def my_properties(
         properties.append(property)
 
     return {
-        "pagination": {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        },
+        "pagination": keyset.meta(total),
         "data": properties
     }
     
@@ -406,14 +457,8 @@ def my_properties(
 def get_property_by_id(
     property_id: int, 
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor")),
 ):
-    
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if roles["admin"] == False and roles["broker"] == False and roles["realtor"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     sql = load_sql("property/get_property_by_id.sql")
     result = db.execute(text(sql), {"property_id": property_id})
     row = result.mappings().first()
@@ -429,12 +474,7 @@ def get_property_by_id(
     }
     address_data = {k[len("address_"):]: v for k, v in row.items() if k.startswith("address_")}
 
-    sellers_sql = load_sql("property/get_property_sellers.sql")    
-    sellers = []
-    sellers_result = db.execute(text(sellers_sql), {"property_id": property_id})
-    for seller in sellers_result.mappings():
-        seller_data = dict(seller)
-        sellers.append(ConsumerOut(**seller_data))
+    sellers = load_property_sellers(db, [property_id])[property_id]
     
     property = PropertyOut(
         **property_data,
@@ -450,18 +490,8 @@ def get_property_by_id(
 def get_property_by_mls(
     mls: int,
     db: Session = Depends(database.get_db),
-    current_user : User = Depends(get_current_user)
+    current_user : User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role = [key for key, value in role_result.items() if value]
-
-    if "realtor" in current_user_role or "broker" in current_user_role or "admin" in current_user_role:
-        pass
-    else:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("property/get_property_by_mls.sql")
     row = db.execute(text(sql), { "mls": mls}).mappings().first()
 
@@ -476,12 +506,7 @@ def get_property_by_mls(
     }
     address_data = {k[len("address_"):]: v for k, v in row.items() if k.startswith("address_")}
 
-    sellers_sql = load_sql("property/get_property_sellers.sql")    
-    sellers = []
-    sellers_result = db.execute(text(sellers_sql), {"property_id": row["property_id"]})
-    for seller in sellers_result.mappings():
-        seller_data = dict(seller)
-        sellers.append(ConsumerOut(**seller_data))
+    sellers = load_property_sellers(db, [row["property_id"]])[row["property_id"]]
     
     property = PropertyOut(
         **property_data,
@@ -496,6 +521,7 @@ def get_property_by_mls(
 @router.put("/{property_id}")
 def update_property_by_id(
     request: Request,
+    background_tasks: BackgroundTasks,
     property_id : int ,
     property_data: PropertyUpdate = Depends(PropertyUpdate.as_form),
     address_data: AddressUpdate = Depends(AddressUpdate.as_form),
@@ -512,9 +538,7 @@ def update_property_by_id(
         raise HTTPException( status_code= 404 , detail="property not found")
     
     # Authorization check
-    role_sql = load_sql("role/get_user_roles.sql")
-    current_user_roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role = [key for key,value in current_user_roles.items() if value]
+    current_user_role = get_user_roles(current_user)
     if not (
         "admin" in current_user_role
         or ("broker" in current_user_role and (current_user.user_id in [ property["created_by_user_id"], property["created_by_created_by"] ] ) )
@@ -533,73 +557,92 @@ def update_property_by_id(
             seller_data = dict(seller_result)
             sellers.append(ConsumerOut(**seller_data))
     else :
-        sellers_sql = load_sql("property/get_property_sellers.sql")
-        property_sellers = db.execute(text(sellers_sql), {"property_id": property_id})
-        for seller in property_sellers.mappings():
-            seller_result = db.execute(text(consumer_sql), {"consumer_id": seller["consumer_id"]}).mappings().first()
-            seller_data = dict(seller_result)
-            sellers.append(ConsumerOut(**seller_data))
-
-
-    base_url = str(request.base_url)
-    saved_files = update_photos(property.mls_num, property['images_urls'], photos, property_data.preserve_images, base_url, main_photo)
-    del property_data.preserve_images
-
-    # Update address
-    if address_data:
-        db_address = {
-            k: v for k, v in address_data.model_dump(exclude_unset=True).items()
-            if v is not None
-        }
-        if db_address:
-            db_address["address_id"] = property["address_address_id"]
-            set_clause = ", ".join(f"{k} = :{k}" for k in db_address if k != "address_id")
-            sql = f"UPDATE addresses SET {set_clause} WHERE address_id = :address_id"
-            db.execute(text(sql), db_address)
-
-    # Update Additional
-    if additional_data:
-        db_additional = {
-            k: v for k, v in additional_data.model_dump(exclude_unset=True).items()
+        sellers = load_property_sellers(db, [property_id])[property_id]
+
+
+    # Hash and stage new photos before taking the row lock
+    staged = stage_photos(photos)
+    # Until published, the staged files are only temp files; remove them if anything below fails
+    try:
+        # Buckets the property may be about to leave (area or status change)
+        stale = stale_buckets(db, [property_id])
+
+        # Locked so concurrent photo updates cannot both apply their reference changes to the same images
+        current_images = db.execute(load_query("property/lock_property_images.sql"), {"property_id": property_id}).scalar()
+        base_url = str(request.base_url)
+        saved_files = update_photos(current_images, staged, property_data.preserve_images, base_url, main_photo)
+        del property_data.preserve_images
+
+        added = image_hashes(saved_files) - image_hashes(current_images)
+        acquire_photo_blobs(db, staged, added)
+        release_photo_blobs(db, image_hashes(current_images) - image_hashes(saved_files))
+
+        # Update address
+        if address_data:
+            db_address = {
+                k: v for k, v in address_data.model_dump(exclude_unset=True).items()
+                if v is not None
+            }
+            if db_address:
+                db_address["address_id"] = property["address_address_id"]
+                set_clause = ", ".join(f"{k} = :{k}" for k in db_address if k != "address_id")
+                sql = f"UPDATE addresses SET {set_clause} WHERE address_id = :address_id"
+                db.execute(text(sql), db_address)
+
+        # Update Additional
+        if additional_data:
+            db_additional = {
+                k: v for k, v in additional_data.model_dump(exclude_unset=True).items()
+                if v is not None
+            }
+            if db_additional:
+                db_additional["additional_id"] = property["additional_id"]
+                set_clause = ", ".join(f"{k} = :{k}" for k in db_additional if k != "additional_id")
+                sql = f"UPDATE additional SET {set_clause} WHERE additional_id = :additional_id"
+                db.execute(text(sql), db_additional)
+
+        # Update property
+        db_property = {
+            k: v for k, v in property_data.model_dump(exclude_unset=True, exclude={"address"}).items()
             if v is not None
         }
-        if db_additional:
-            db_additional["additional_id"] = property["additional_id"]
-            set_clause = ", ".join(f"{k} = :{k}" for k in db_additional if k != "additional_id")
-            sql = f"UPDATE additional SET {set_clause} WHERE additional_id = :additional_id"
-            db.execute(text(sql), db_additional)
-
-    # Update property
-    db_property = {
-        k: v for k, v in property_data.model_dump(exclude_unset=True, exclude={"address"}).items()
-        if v is not None
-    }
-    db_property["property_id"] = property_id
-    db_property.pop("sellers", None)
-    if property_data.status != property["status"]:
-        db_property["last_updated"] = datetime.now()
-    if saved_files:
-        db_property['images_urls'] = json.dumps(saved_files)
+        db_property["property_id"] = property_id
+        db_property.pop("sellers", None)
+        if property_data.status != property["status"]:
+            db_property["last_updated"] = datetime.now()
+        if saved_files != (current_images or []):
+            db_property['images_urls'] = json.dumps(saved_files)
         
-    set_clause = ", ".join(f"{k} = :{k}" for k in db_property)
+        set_clause = ", ".join(f"{k} = :{k}" for k in db_property)
     
-    sql = f"UPDATE PROPERTIES SET {set_clause} WHERE property_id= :property_id RETURNING property_id;"
-    updated_property_id = db.execute(text(sql), db_property).scalar()
-
-    if property_data.sellers:
-        current_sellers = db.execute(text("SELECT seller_id FROM property_owners WHERE property_id= :property_id"),{"property_id": updated_property_id}).scalars().all()
-        to_add = set(property_data.sellers) - set(current_sellers)
-        to_remove = set(current_sellers) - set(property_data.sellers)
-        if to_remove:
-            db.execute(
-            text("DELETE FROM property_owners WHERE property_id = :property_id AND seller_id = ANY(:ids)"),
-            {"property_id": property_id, "ids": list(to_remove)}
-        )
-        property_seller_sql = load_sql("property/create_property_seller.sql")
-        for seller in to_add:
-            db.execute(text(property_seller_sql),{"property_id":property_id, "seller_id":seller})
+        sql = f"UPDATE PROPERTIES SET {set_clause} WHERE property_id= :property_id RETURNING property_id;"
+        updated_property_id = db.execute(text(sql), db_property).scalar()
+
+        if property_data.sellers:
+            current_sellers = db.execute(text("SELECT seller_id FROM property_owners WHERE property_id= :property_id"),{"property_id": updated_property_id}).scalars().all()
+            to_add = set(property_data.sellers) - set(current_sellers)
+            to_remove = set(current_sellers) - set(property_data.sellers)
+            if to_remove:
+                db.execute(
+                text("DELETE FROM property_owners WHERE property_id = :property_id AND seller_id = ANY(:ids)"),
+                {"property_id": property_id, "ids": list(to_remove)}
+            )
+            property_seller_sql = load_sql("property/create_property_seller.sql")
+            for seller in to_add:
+                db.execute(text(property_seller_sql),{"property_id":property_id, "seller_id":seller})
         
-    db.commit()
+        refresh_property_listing(db, [property_id])
+        refresh_rollups(db, [property_id], stale)
+        db.commit()
+        # After the commit, as in create_property
+        publish_photos(photo_store, staged)
+    except BaseException:
+        discard_photos(staged)
+        raise
+    count_cache.clear()
+    pending = pending_derivatives(saved_files)
+    if pending:
+        background_tasks.add_task(build_derivatives, property_id, pending, resolve_get_db(request))
 
     # Fetch property data
     sql = load_sql("property/get_property_by_id.sql")
@@ -625,53 +668,35 @@ def update_property_by_id(
 def delete_property(
     property_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if roles["admin"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("property/get_property_by_id.sql")
     result = db.execute(text(sql), {"property_id": property_id})
     property = result.mappings().first()
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
 
+    stale = stale_buckets(db, [property_id])
+    images = db.execute(load_query("property/lock_property_images.sql"), {"property_id": property_id}).scalar()
+    release_photo_blobs(db, image_hashes(images))
     delete_sql = load_sql("additional/delete_additional.sql")
     db.execute(text(delete_sql), {"property_id": property_id})
     delete_sql = load_sql("property/delete_property.sql")
     db.execute(text(delete_sql), {"property_id": property_id})
+    refresh_rollups(db, [], stale)
     
     db.commit()
+    count_cache.clear()
     return {"message": "Property deleted successfully"}
 
 @router.get("/status-options", tags=["Properties"])
 def get_property_status_options(
-    db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role = [key for key, value in role_result.items() if value]
-
-    if "realtor" in current_user_role or "broker" in current_user_role or "admin" in current_user_role:
-        return [status.as_dict() for status in PropertyStatus]
-    else:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    return [status.as_dict() for status in PropertyStatus]
 
 @router.get("types_option")
 def get_property_type_options(
-    db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin", "broker", "realtor"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    role_result = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role = [key for key, value in role_result.items() if value]
-
-    if "realtor" in current_user_role or "broker" in current_user_role or "admin" in current_user_role:
-        pass
-    else:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     return [types.value for types in PropertyTypes]
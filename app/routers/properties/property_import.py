@@ -0,0 +1,32 @@
+from pydantic import BaseModel, model_validator
+from typing import Optional
+
+from .property_create import PropertyCreate
+from ..addresses.address_create import AddressCreate
+from ..additional.additional_create import AdditionalCreate
+
+class PropertyImportRow(PropertyCreate):
+    # One line of a bulk import: the POST /property fields plus its address and additional features.
+    # CSV rows are flat; NDJSON rows may be flat or nest "address" and "additional".
+    livable: Optional[bool] = None
+    address: AddressCreate
+    additional: AdditionalCreate = AdditionalCreate()
+
+    @model_validator(mode="before")
+    @classmethod
+    def nest_flat_fields(cls, values):
+        if not isinstance(values, dict):
+            return values
+        # Empty CSV cells mean "not given"
+        values = {k: v for k, v in values.items() if v not in ("", None)}
+        for key, model in (("address", AddressCreate), ("additional", AdditionalCreate)):
+            if key not in values:
+                values[key] = {name: values.pop(name) for name in list(values) if name in model.model_fields}
+        return values
+
+class PropertyImportResult(BaseModel):
+    imported: int
+    failed: int
+    dry_run: bool
+    properties: list[dict]
+    errors: list[dict]
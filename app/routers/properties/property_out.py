@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List
 from datetime import datetime
 from datetime import date
 
@@ -10,6 +10,16 @@ from app.routers.addresses.address_out import AddressOut
 
 from ...utils.enums import PropertyStatus, PropertyTypes, PropertyTransactionType
 
+class PropertyImage(BaseModel):
+    url: str
+    is_main: bool = False
+    # Content hash of the stored photo and the file name it was uploaded as; missing on legacy entries
+    sha256: Optional[str] = None
+    name: Optional[str] = None
+    # WebP derivatives; missing until the background job has made them
+    thumb_url: Optional[str] = None
+    medium_url: Optional[str] = None
+
 class PropertyOut(BaseModel):
     property_id: int
     description: str
@@ -29,7 +39,7 @@ class PropertyOut(BaseModel):
     exp_date: date
     created_at: datetime
     last_updated: datetime
-    images_urls: Optional[List[Dict]]
+    images_urls: Optional[List[PropertyImage]]
     mls_num: Optional[int] = None
     livable: Optional[bool] = None
     created_by_user: Optional[UserOut]
@@ -5,8 +5,10 @@ from sqlalchemy import text
 from app import database
 
 from ...utils.file_helper import load_sql
+from ...utils.principal_cache import principal_cache
+from ...utils.listing_helper import refresh_creator_listings
 from ...models.user_model import User
-from ...dependencies import get_current_user
+from ...dependencies import require_roles
 from ..roles.roles_update import RolesUpdate
 
 router = APIRouter(
@@ -19,14 +21,8 @@ def update_role(
     user_id: int,
     role_data: RolesUpdate,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if roles["admin"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     user_sql = load_sql("user/get_user_by_id.sql")
     user = db.execute(text(user_sql), {"user_id": user_id}).mappings().first()
     if user is None:
@@ -38,6 +34,8 @@ def update_role(
     set_clause = ", ".join(f"{k} = :{k}" for k in db_roles)
     sql = f"UPDATE ROLES SET {set_clause} WHERE user_id = :user_id RETURNING user_id;"
     updated_user_id = db.execute(text(sql), db_roles).scalar()
+    refresh_creator_listings(db, user_id)
     
     db.commit()
+    principal_cache.invalidate_user(user_id)
     return {"message": "Role updated successfully", "user_id": updated_user_id}
@@ -1,17 +1,19 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from datetime import datetime
+from datetime import date, datetime
 
 from app import database
+from app.utils.file_helper import load_query
+from app.utils.analytics_serializer import AnalyticsResponse, ORIENT_PATTERN, serialize_rows, serialize_result
 
 router = APIRouter(prefix="/Top_10_agent", tags=["Top 10 agent"])
 
-@router.get("/")
+@router.get("/", response_class=AnalyticsResponse)
 def get_closed_properties(
     month: int,
     year: int,
-
+    limit: int = Query(10, ge=1, le=100),
+    orient: str = Query("records", regex=ORIENT_PATTERN),
     db: Session = Depends(database.get_db)
 ):
     current_month = datetime.now().month
@@ -35,41 +37,41 @@ def get_closed_properties(
     else:
         prev_month, prev_year = month - 1, year
 
-    query_template = """
-        SELECT 
-            CONCAT(u.first_name, ' ', u.last_name) AS full_name, 
-            COUNT(p.status) AS closed_count, 
-            l.lic_num AS license_number,
-            COALESCE(SUM(p.price),0) AS total_price
-        FROM properties p
-        LEFT JOIN users u ON u.user_id = p.created_by
-        LEFT JOIN licenses l ON l.user_id = u.user_id
-        WHERE p.status = 'closed'
-        AND EXTRACT(MONTH FROM p.created_at) = :month
-        AND EXTRACT(YEAR FROM p.created_at) = :year
-        GROUP BY u.user_id, full_name, l.lic_num
-        ORDER BY closed_count DESC
-        LIMIT 10
-    """
-
-    # run for current month
-    current_query = text(query_template)
-    current_res = (
-        db.execute(current_query, {"month": month, "year": year}).mappings().all()
-    )
-
-    # run for previous month
-    prev_query = text(query_template)
-    prev_res = (
-        db.execute(prev_query, {"month": prev_month, "year": prev_year})
-        .mappings()
-        .all()
+    # Both months in one pass over agent_monthly_performance, ranked per month
+    month_start, prev_month_start = date(year, month, 1), date(prev_year, prev_month, 1)
+    result = db.execute(
+        load_query("topten_agent/get_top_agents_by_month.sql"),
+        {"months": [month_start, prev_month_start], "limit": limit}
     )
+    columns = list(result.keys())[1:]
+    rows = result.all()
 
-    return {
+    return AnalyticsResponse(content={
         "current_month": month,
-        "results": [dict(r) for r in current_res],
+        "results": serialize_rows(columns, [row[1:] for row in rows if row[0] == month_start], orient),
         "previous_month": prev_month,
-        "previous_results": [dict(r) for r in prev_res],
-    }
+        "previous_results": serialize_rows(columns, [row[1:] for row in rows if row[0] == prev_month_start], orient),
+    })
+
+@router.get("/range", response_class=AnalyticsResponse)
+def get_top_agents_by_range(
+    start: date,
+    end: date,
+    limit: int = Query(10, ge=1, le=100),
+    orient: str = Query("records", regex=ORIENT_PATTERN),
+    db: Session = Depends(database.get_db)
+):
+    # Closings are summed per calendar month, so the range covers whole months
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    start_month, end_month = start.replace(day=1), end.replace(day=1)
+    result = db.execute(
+        load_query("topten_agent/get_top_agents_by_range.sql"),
+        {"start_month": start_month, "end_month": end_month, "limit": limit}
+    )
 
+    return AnalyticsResponse(content={
+        "start_month": start_month,
+        "end_month": end_month,
+        "results": serialize_result(result, orient),
+    })
@@ -1,13 +1,6 @@
 from pydantic import BaseModel
 from .user_out import UserOut
-
-class PaginationMeta(BaseModel):
-    total: int
-    page: int
-    per_page: int
-    total_pages: int
-    has_next: bool
-    has_prev: bool
+from ...utils.pagination import PaginationMeta
 
 class PaginatedUser(BaseModel):
     data: list[UserOut]
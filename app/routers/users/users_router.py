@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+from typing import List, Optional
 from passlib.hash import bcrypt
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -8,8 +8,11 @@ from app import database
 
 from sqlalchemy.exc import IntegrityError
 
-from app.utils.file_helper import load_sql
-from ...dependencies import get_current_user
+from app.utils.file_helper import load_sql, load_query
+from app.utils.principal_cache import principal_cache
+from app.utils.keyset import Keyset, SortColumn
+from app.utils.listing_helper import refresh_creator_listings
+from ...dependencies import get_current_user, get_user_roles, require_roles
 
 from ...models.user_model import User
 
@@ -25,6 +28,10 @@ router = APIRouter(
     tags=["Users"]
 )
 
+USER_SORT_COLUMNS = {
+    "user_id": SortColumn("u.user_id", "user_id"),
+}
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 def create_user(
     user: UserCreate,
@@ -32,9 +39,7 @@ def create_user(
     current_user: User = Depends(get_current_user)
 ):
     #authorization check
-    role_sql = load_sql("role/get_user_roles.sql")
-    current_user_roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    current_user_role = [key for key,value in current_user_roles.items() if value]
+    current_user_role = get_user_roles(current_user)
     user_roles = set(user.role)
     if not (
         "admin" in current_user_role
@@ -79,18 +84,14 @@ def create_user(
 def get_all_users(
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(require_roles("admin", "broker", "realtor")),
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    
-    if roles["admin"] == False and roles["broker"] == False and roles["realtor"] == False:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    if roles["admin"] == True:
+    roles = get_user_roles(current_user)
+    if "admin" in roles:
         role = 'admin'
-    elif roles["broker"] == True:
+    elif "broker" in roles:
         role = 'broker'
     else:
         role = 'realtor'
@@ -98,18 +99,17 @@ def get_all_users(
     # total count
     total_sql = load_sql("user/count_all_users.sql")
     total = db.execute(text(total_sql), {"user_id": current_user.user_id, "role": role}).scalar()
-    total_pages = (total + per_page - 1) // per_page
 
-    sql = load_sql("user/get_all_users.sql")
-    result = db.execute(text(sql), {
+    keyset = Keyset(USER_SORT_COLUMNS, USER_SORT_COLUMNS["user_id"], "user_id", "asc", page, per_page, cursor)
+    query = load_query("user/get_all_users.sql", **keyset.format_args)
+    result = db.execute(query, {
         "user_id": current_user.user_id,
         "role": role,
-        "limit": per_page,
-        "offset": (page - 1) * per_page
+        **keyset.params
     })
 
     users = []
-    for row in result.mappings():
+    for row in keyset.rows(result.mappings()):
         roles = [role for role in ["admin", "broker", "realtor", "buyer", "seller", "tenant"] if row.get(role)]
         
         user = UserOut(
@@ -120,14 +120,7 @@ def get_all_users(
         users.append(user)
 
     return {
-        "pagination": {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        },
+        "pagination": keyset.meta(total),
         "data": users
     }
 
@@ -167,14 +160,15 @@ def get_user_by_id(
         raise HTTPException(status_code=404, detail="User not found")
 
     target_user_creator_id = row["created_by"]
+    current_user_roles = get_user_roles(current_user)
 
-    if current_user.roles.admin:
+    if "admin" in current_user_roles:
         pass  # admin can access any user
 
     elif current_user.user_id == user_id:
         pass  # user can access their own data
 
-    elif current_user.roles.broker:
+    elif "broker" in current_user_roles:
         if target_user_creator_id == current_user.user_id:
             pass # broker can access users he created
         else:
@@ -193,7 +187,7 @@ def get_user_by_id(
             if target_user_creator_id not in realtor_ids:
                 raise HTTPException(status_code=403, detail="Not authorized")
 
-    elif current_user.roles.realtor:
+    elif "realtor" in current_user_roles:
         if target_user_creator_id == current_user.user_id:
             pass # realtors can access users that they created
         else:
@@ -230,10 +224,11 @@ def update_user(
     creator = result.mappings().first()
 
 
-    if current_user.roles.admin == False:
-     if current_user.roles.realtor==True and current_user.user_id == creator["user_id"]:
+    current_user_roles = get_user_roles(current_user)
+    if "admin" not in current_user_roles:
+     if "realtor" in current_user_roles and current_user.user_id == creator["user_id"]:
         pass
-     elif current_user.roles.broker==True and (current_user.user_id == creator["user_id"] or current_user.user_id == creator["created_by"]):
+     elif "broker" in current_user_roles and (current_user.user_id == creator["user_id"] or current_user.user_id == creator["created_by"]):
         pass
      else:
         raise HTTPException(status_code=403, detail="Not authorized")
@@ -257,7 +252,9 @@ def update_user(
     
     sql_update = load_sql("user/update_user.sql")
     db.execute(text(sql_update), {"user_id": user_id, **data_to_update})
+    refresh_creator_listings(db, user_id)
     db.commit()
+    principal_cache.invalidate_user(user_id)
 
     
     result = db.execute(text(sql), {"user_id": user_id})
@@ -279,13 +276,8 @@ def update_user(
 def delete_user(
     user_id: int,
     db: Session = Depends(database.get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_roles("admin"))
 ):
-    role_sql = load_sql("role/get_user_roles.sql")
-    current_user_roles = db.execute(text(role_sql), {"user_id": current_user.user_id}).mappings().first()
-    if not current_user_roles.get("admin", False):
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     sql = load_sql("user/get_user_by_id.sql")
     user = db.execute(text(sql), {"user_id": user_id}).mappings().first()
     if not user:
@@ -295,6 +287,7 @@ def delete_user(
     try:
         db.execute(text(delete_sql), {"user_id": user_id})
         db.commit()
+        principal_cache.invalidate_user(user_id)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -0,0 +1,11 @@
+SELECT DISTINCT
+    a.city,
+    a.area,
+    p.property_type,
+    EXTRACT(YEAR FROM p.created_at)::INT AS year,
+    EXTRACT(MONTH FROM p.created_at)::INT AS month
+FROM properties p
+JOIN addresses a ON p.property_id = a.property_id
+WHERE p.property_id = ANY(:property_ids)
+    AND a.city IS NOT NULL
+    AND p.created_at IS NOT NULL;
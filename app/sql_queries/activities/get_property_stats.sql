@@ -0,0 +1,14 @@
+-- Per-month, per-type figures from the monthly cube
+SELECT
+    s.property_type,
+    s.year::INT AS year,
+    s.month::INT AS month,
+    SUM(s.listings)::INT AS number_of_closed,
+    (SUM(s.closed_price_sum) / NULLIF(SUM(s.closed_priced), 0))::FLOAT8 AS avg_closed_price
+FROM property_monthly_stats s
+WHERE s.city = :city
+    AND (:area IS NULL OR s.area = :area)
+    AND (:year IS NULL OR s.year = :year)
+    AND (:month IS NULL OR s.month = :month)
+GROUP BY s.year, s.month, s.property_type
+ORDER BY s.year, s.month, s.property_type;
@@ -0,0 +1,44 @@
+-- Year-over-year change per (type, month); empty unless both periods have data
+WITH current_stats AS (
+    SELECT
+        s.property_type,
+        s.year,
+        s.month,
+        SUM(s.listings) AS number_of_closed,
+        SUM(s.closed_price_sum) / NULLIF(SUM(s.closed_priced), 0) AS avg_closed_price
+    FROM property_monthly_stats s
+    WHERE s.city = :city
+        AND (:area IS NULL OR s.area = :area)
+        AND (:year IS NULL OR s.year = :year)
+        AND (:month IS NULL OR s.month = :month)
+    GROUP BY s.year, s.month, s.property_type
+),
+previous_stats AS (
+    SELECT
+        s.property_type,
+        s.year,
+        s.month,
+        SUM(s.listings) AS number_of_closed,
+        SUM(s.closed_price_sum) / NULLIF(SUM(s.closed_priced), 0) AS avg_closed_price
+    FROM property_monthly_stats s
+    WHERE s.city = :city
+        AND (:area IS NULL OR s.area = :area)
+        AND (:prev_year IS NULL OR s.year = :prev_year)
+        AND (:month IS NULL OR s.month = :month)
+    GROUP BY s.year, s.month, s.property_type
+)
+SELECT
+    c.property_type,
+    c.year::INT AS year_current,
+    c.month::INT AS month,
+    c.number_of_closed::INT AS number_of_closed_current,
+    c.avg_closed_price::FLOAT8 AS avg_closed_price_current,
+    p.year::INT AS year_prev,
+    p.number_of_closed::INT AS number_of_closed_prev,
+    p.avg_closed_price::FLOAT8 AS avg_closed_price_prev,
+    ((c.number_of_closed - p.number_of_closed) * 100.0 / NULLIF(p.number_of_closed, 0))::FLOAT8 AS number_of_closed_change_pct,
+    ((c.avg_closed_price - p.avg_closed_price) * 100.0 / NULLIF(p.avg_closed_price, 0))::FLOAT8 AS avg_closed_price_change_pct
+FROM current_stats c
+LEFT JOIN previous_stats p ON p.property_type = c.property_type AND p.month = c.month
+WHERE EXISTS (SELECT 1 FROM previous_stats)
+ORDER BY c.year, c.month, c.property_type, p.year;
@@ -0,0 +1,29 @@
+-- Serialize writers on the buckets refresh_property_monthly_stats.sql is about to recompute;
+-- see market_watcher/lock_market_buckets.sql for why.
+SELECT pg_advisory_xact_lock(hashtext('property_monthly_stats'), bucket.key)
+FROM (
+    SELECT DISTINCT hashtext(concat_ws('|', b.city, b.area, b.property_type, b.year, b.month)) AS key
+    FROM (
+        SELECT
+            a.city,
+            a.area,
+            p.property_type,
+            EXTRACT(YEAR FROM p.created_at)::INT AS year,
+            EXTRACT(MONTH FROM p.created_at)::INT AS month
+        FROM properties p
+        JOIN addresses a ON p.property_id = a.property_id
+        WHERE p.property_id = ANY(:property_ids)
+            AND a.city IS NOT NULL
+            AND p.created_at IS NOT NULL
+        UNION
+        SELECT stale.city, stale.area, stale.property_type, stale.year, stale.month
+        FROM unnest(
+            CAST(:cities AS TEXT[]),
+            CAST(:areas AS TEXT[]),
+            CAST(CAST(:property_types AS TEXT[]) AS property_type_enum[]),
+            CAST(:years AS INT[]),
+            CAST(:months AS INT[])
+        ) AS stale(city, area, property_type, year, month)
+    ) AS b
+    ORDER BY key
+) AS bucket;
@@ -0,0 +1,18 @@
+DELETE FROM property_monthly_stats;
+
+INSERT INTO property_monthly_stats (city, area, property_type, year, month, listings, closed_priced, closed_price_sum)
+SELECT
+    a.city,
+    a.area,
+    p.property_type,
+    EXTRACT(YEAR FROM p.created_at)::INT,
+    EXTRACT(MONTH FROM p.created_at)::INT,
+    COUNT(*),
+    COUNT(p.price) FILTER (WHERE p.status = 'closed'),
+    COALESCE(SUM(p.price) FILTER (WHERE p.status = 'closed'), 0)
+FROM properties p
+JOIN addresses a ON p.property_id = a.property_id
+WHERE p.livable = TRUE
+    AND a.city IS NOT NULL
+    AND p.created_at IS NOT NULL
+GROUP BY a.city, a.area, p.property_type, EXTRACT(YEAR FROM p.created_at), EXTRACT(MONTH FROM p.created_at);
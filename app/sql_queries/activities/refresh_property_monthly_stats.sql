@@ -0,0 +1,66 @@
+-- Recompute the (city, area, type, month) buckets of the given properties plus any buckets they just left
+WITH buckets AS (
+    SELECT
+        a.city,
+        a.area,
+        p.property_type,
+        EXTRACT(YEAR FROM p.created_at)::INT AS year,
+        EXTRACT(MONTH FROM p.created_at)::INT AS month
+    FROM properties p
+    JOIN addresses a ON p.property_id = a.property_id
+    WHERE p.property_id = ANY(:property_ids)
+        AND a.city IS NOT NULL
+        AND p.created_at IS NOT NULL
+    UNION
+    SELECT stale.city, stale.area, stale.property_type, stale.year, stale.month
+    FROM unnest(
+        CAST(:cities AS TEXT[]),
+        CAST(:areas AS TEXT[]),
+        CAST(CAST(:property_types AS TEXT[]) AS property_type_enum[]),
+        CAST(:years AS INT[]),
+        CAST(:months AS INT[])
+    ) AS stale(city, area, property_type, year, month)
+),
+fresh AS (
+    SELECT
+        b.city,
+        b.area,
+        b.property_type,
+        b.year,
+        b.month,
+        COUNT(*) AS listings,
+        COUNT(p.price) FILTER (WHERE p.status = 'closed') AS closed_priced,
+        COALESCE(SUM(p.price) FILTER (WHERE p.status = 'closed'), 0) AS closed_price_sum
+    FROM buckets b
+    JOIN addresses a ON a.city = b.city AND a.area = b.area
+    JOIN properties p ON p.property_id = a.property_id
+        AND p.property_type = b.property_type
+        AND p.created_at >= make_date(b.year, b.month, 1)
+        AND p.created_at < make_date(b.year, b.month, 1) + INTERVAL '1 month'
+    WHERE p.livable = TRUE
+    GROUP BY b.city, b.area, b.property_type, b.year, b.month
+),
+cleared AS (
+    DELETE FROM property_monthly_stats s
+    USING buckets b
+    WHERE s.city = b.city
+        AND s.area = b.area
+        AND s.property_type = b.property_type
+        AND s.year = b.year
+        AND s.month = b.month
+        AND NOT EXISTS (
+            SELECT 1 FROM fresh f
+            WHERE f.city = s.city
+                AND f.area = s.area
+                AND f.property_type = s.property_type
+                AND f.year = s.year
+                AND f.month = s.month
+        )
+)
+INSERT INTO property_monthly_stats (city, area, property_type, year, month, listings, closed_priced, closed_price_sum)
+SELECT city, area, property_type, year, month, listings, closed_priced, closed_price_sum
+FROM fresh
+ON CONFLICT (city, area, property_type, year, month) DO UPDATE SET
+    listings = EXCLUDED.listings,
+    closed_priced = EXCLUDED.closed_priced,
+    closed_price_sum = EXCLUDED.closed_price_sum;
@@ -27,4 +27,7 @@ FROM addresses a
 LEFT JOIN users u ON a.created_by = u.user_id
 LEFT JOIN roles r ON u.user_id=r.user_id
 
+WHERE {keyset}
+
+ORDER BY a.address_id {sort_order}
 LIMIT :limit OFFSET :offset;
\ No newline at end of file
@@ -42,6 +42,7 @@ WHERE
     AND (:broker_id IS NULL OR a.broker_id = :broker_id)
     AND (:created_by IS NULL OR a.created_by = :created_by)
     AND (:city IS NULL OR addr.city ILIKE :city)
+    AND {keyset}
 
-ORDER BY {sort_by} {sort_order}
+ORDER BY {sort_by} {sort_order}, a.agency_id {sort_order}
 LIMIT :limit OFFSET :offset;
@@ -0,0 +1 @@
+SELECT nextval(:sequence);
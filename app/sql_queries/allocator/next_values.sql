@@ -0,0 +1 @@
+SELECT nextval(:sequence) FROM generate_series(1, :count);
@@ -36,5 +36,7 @@ WHERE
     AND (:created_by IS NULL OR c.created_by = :created_by)
     AND (:created_by_type IS NULL OR c.created_by_type ILIKE :created_by_type)
     AND (:created_at IS NULL OR c.created_at::date = :created_at)
-ORDER BY {sort_by} {sort_order}
+    AND {keyset}
+
+ORDER BY {sort_by} {sort_order}, c.consumer_id {sort_order}
 LIMIT :limit OFFSET :offset;
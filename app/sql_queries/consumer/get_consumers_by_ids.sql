@@ -0,0 +1,5 @@
+SELECT
+    c.*
+FROM consumers AS c
+WHERE c.consumer_id = ANY(:consumer_ids)
+ORDER BY c.consumer_id;
@@ -0,0 +1,9 @@
+SELECT
+    c.contract_id,
+    c.mls_num,
+    c.payload::TEXT AS payload,
+    c.payload_sha256,
+    c.pdf_sha256,
+    c.pdf_size
+FROM contracts c
+WHERE c.mls_num = :mls;
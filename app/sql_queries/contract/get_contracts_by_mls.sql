@@ -0,0 +1,3 @@
+SELECT c.mls_num, c.payload
+FROM contracts c
+WHERE c.mls_num = ANY(:mls_nums);
@@ -0,0 +1,16 @@
+-- :filter is a JSON object matched by containment, served by the GIN index on payload
+SELECT
+    c.contract_id,
+    c.mls_num,
+    c.receiver_id,
+    c.payload,
+    c.pdf_sha256 IS NOT NULL AS has_pdf,
+    -- Versioned PDF link; immutable for as long as the contract keeps this PDF
+    CASE WHEN c.pdf_sha256 IS NOT NULL THEN '/contracts/' || c.mls_num || '/pdf?v=' || c.pdf_sha256 END AS pdf_url,
+    c.created_by,
+    c.created_at,
+    c.updated_at
+FROM contracts c
+WHERE c.payload @> CAST(:filter AS JSONB)
+ORDER BY c.contract_id
+LIMIT :limit OFFSET :offset;
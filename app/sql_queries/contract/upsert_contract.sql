@@ -0,0 +1,20 @@
+INSERT INTO contracts (mls_num, receiver_id, payload, payload_sha256, pdf_sha256, pdf_size, created_by)
+VALUES (
+    :mls_num,
+    :receiver_id,
+    CAST(:payload AS JSONB),
+    encode(sha256(convert_to(CAST(:payload AS JSONB)::TEXT, 'UTF8')), 'hex'),
+    :pdf_sha256,
+    :pdf_size,
+    :created_by
+)
+ON CONFLICT (mls_num) DO UPDATE SET
+    receiver_id = EXCLUDED.receiver_id,
+    payload = EXCLUDED.payload,
+    payload_sha256 = EXCLUDED.payload_sha256,
+    -- Re-signing without a new PDF keeps the previous one
+    pdf_sha256 = COALESCE(EXCLUDED.pdf_sha256, contracts.pdf_sha256),
+    pdf_size = COALESCE(EXCLUDED.pdf_size, contracts.pdf_size),
+    created_by = EXCLUDED.created_by,
+    updated_at = now()
+RETURNING contract_id, payload_sha256;
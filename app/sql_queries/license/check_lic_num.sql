@@ -0,0 +1,4 @@
+-- Existence check for a newly allocated license number (lic_num is text)
+SELECT license_id
+FROM licenses
+WHERE lic_num = CAST(:number AS TEXT);
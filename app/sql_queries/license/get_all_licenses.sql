@@ -35,6 +35,7 @@ WHERE
 AND (:lic_type IS NULL OR l.lic_type = :lic_type)
 AND (:agency_id IS NULL OR l.agency_id = :agency_id)
 AND (:filter_user_id IS NULL OR l.user_id = :filter_user_id)
+    AND {keyset}
 
-ORDER BY {sort_by} {sort_order}
+ORDER BY {sort_by} {sort_order}, l.license_id {sort_order}
 LIMIT :limit OFFSET :offset;
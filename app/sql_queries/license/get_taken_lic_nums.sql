@@ -0,0 +1 @@
+SELECT CAST(lic_num AS BIGINT) FROM licenses WHERE lic_num = ANY(CAST(:numbers AS TEXT[]));
@@ -0,0 +1,4 @@
+SELECT DISTINCT a.area, p.last_updated::date AS day
+FROM properties p
+JOIN addresses a ON p.property_id = a.property_id
+WHERE p.property_id = ANY(:property_ids);
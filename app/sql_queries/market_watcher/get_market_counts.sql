@@ -0,0 +1,12 @@
+-- Live counts in one pass; the range predicate on last_updated can use its index
+SELECT
+    COUNT(*) FILTER (WHERE p.status = 'active') AS new_listings_count,
+    COUNT(*) FILTER (WHERE p.status = 'pending') AS pending_count,
+    COUNT(*) FILTER (WHERE p.status = 'closed') AS closed_count,
+    COUNT(*) FILTER (WHERE p.status = 'out_of_market') AS out_of_market,
+    COUNT(*) FILTER (WHERE p.last_updated <> p.created_at) AS return_the_market
+FROM properties p
+JOIN addresses a ON p.property_id = a.property_id
+WHERE a.area = :area
+    AND p.last_updated >= :start_date
+    AND p.last_updated < :end_date;
@@ -0,0 +1,11 @@
+-- Same counts from the daily rollup: at most one row per day and status in the period
+SELECT
+    COALESCE(SUM(m.listings) FILTER (WHERE m.status = 'active'), 0) AS new_listings_count,
+    COALESCE(SUM(m.listings) FILTER (WHERE m.status = 'pending'), 0) AS pending_count,
+    COALESCE(SUM(m.listings) FILTER (WHERE m.status = 'closed'), 0) AS closed_count,
+    COALESCE(SUM(m.listings) FILTER (WHERE m.status = 'out_of_market'), 0) AS out_of_market,
+    COALESCE(SUM(m.returned), 0) AS return_the_market
+FROM market_status_daily m
+WHERE m.area = :area
+    AND m.day >= :start_date
+    AND m.day < :end_date;
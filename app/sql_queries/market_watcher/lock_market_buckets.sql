@@ -0,0 +1,19 @@
+-- Serialize writers on the (area, day) buckets refresh_market_rollup.sql is about to recompute.
+-- Each refresh recounts a bucket from its own snapshot and overwrites it, so two transactions adding to
+-- the same bucket would each write N+1; holding the bucket's lock until commit makes the second one
+-- recount after the first is visible. Locks are taken in key order so overlapping writers cannot deadlock.
+SELECT pg_advisory_xact_lock(hashtext('market_status_daily'), bucket.key)
+FROM (
+    SELECT DISTINCT hashtext(b.area || '|' || b.day) AS key
+    FROM (
+        SELECT a.area, p.last_updated::date AS day
+        FROM properties p
+        JOIN addresses a ON p.property_id = a.property_id
+        WHERE p.property_id = ANY(:property_ids)
+        UNION
+        SELECT stale.area, stale.day
+        FROM unnest(CAST(:areas AS TEXT[]), CAST(:days AS DATE[])) AS stale(area, day)
+    ) AS b
+    WHERE b.area IS NOT NULL
+    ORDER BY key
+) AS bucket;
@@ -0,0 +1,13 @@
+DELETE FROM market_status_daily;
+
+INSERT INTO market_status_daily (area, day, status, listings, returned)
+SELECT
+    a.area,
+    p.last_updated::date,
+    p.status,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE p.last_updated <> p.created_at)
+FROM properties p
+JOIN addresses a ON p.property_id = a.property_id
+WHERE p.last_updated IS NOT NULL
+GROUP BY a.area, p.last_updated::date, p.status;
@@ -0,0 +1,39 @@
+-- Recompute the (area, day) buckets of the given properties plus any buckets they just left
+WITH buckets AS (
+    SELECT a.area, p.last_updated::date AS day
+    FROM properties p
+    JOIN addresses a ON p.property_id = a.property_id
+    WHERE p.property_id = ANY(:property_ids)
+    UNION
+    SELECT stale.area, stale.day
+    FROM unnest(CAST(:areas AS TEXT[]), CAST(:days AS DATE[])) AS stale(area, day)
+),
+fresh AS (
+    SELECT
+        a.area,
+        p.last_updated::date AS day,
+        p.status,
+        COUNT(*) AS listings,
+        COUNT(*) FILTER (WHERE p.last_updated <> p.created_at) AS returned
+    FROM buckets b
+    JOIN addresses a ON a.area = b.area
+    JOIN properties p ON p.property_id = a.property_id
+        AND p.last_updated >= b.day
+        AND p.last_updated < b.day + 1
+    GROUP BY a.area, p.last_updated::date, p.status
+),
+cleared AS (
+    DELETE FROM market_status_daily m
+    USING buckets b
+    WHERE m.area = b.area
+        AND m.day = b.day
+        AND NOT EXISTS (
+            SELECT 1 FROM fresh f WHERE f.area = m.area AND f.day = m.day AND f.status = m.status
+        )
+)
+INSERT INTO market_status_daily (area, day, status, listings, returned)
+SELECT area, day, status, listings, returned
+FROM fresh
+ON CONFLICT (area, day, status) DO UPDATE SET
+    listings = EXCLUDED.listings,
+    returned = EXCLUDED.returned;
@@ -0,0 +1,8 @@
+-- One reference per (property, photo); rows are locked in sha256 order so concurrent writers cannot deadlock
+INSERT INTO photo_blobs (sha256, key, content_type, size, ref_count)
+SELECT b.sha256, b.key, b.content_type, b.size, 1
+FROM jsonb_to_recordset(CAST(:blobs AS JSONB)) AS b(sha256 TEXT, key TEXT, content_type TEXT, size BIGINT)
+ORDER BY b.sha256
+ON CONFLICT (sha256) DO UPDATE
+SET ref_count = photo_blobs.ref_count + 1,
+    released_at = NULL;
@@ -0,0 +1,14 @@
+-- One batch of unreferenced blobs past the grace period. SKIP LOCKED leaves rows a writer is re-acquiring.
+-- The caller unlinks the files before committing: a writer waiting to re-acquire one of these rows then
+-- inserts a fresh row and publishes its own copy of the file.
+DELETE FROM photo_blobs
+WHERE sha256 IN (
+    SELECT sha256
+    FROM photo_blobs
+    WHERE ref_count = 0
+      AND released_at < :released_before
+    ORDER BY released_at
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING key;
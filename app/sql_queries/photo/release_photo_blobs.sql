@@ -0,0 +1,13 @@
+-- Drops one reference per hash; blobs reaching zero are left for the collector (photo/collect_photo_blobs.sql)
+WITH locked AS (
+    SELECT sha256
+    FROM photo_blobs
+    WHERE sha256 = ANY(:hashes)
+    ORDER BY sha256
+    FOR UPDATE
+)
+UPDATE photo_blobs b
+SET ref_count = GREATEST(b.ref_count - 1, 0),
+    released_at = CASE WHEN b.ref_count <= 1 THEN CURRENT_TIMESTAMP ELSE b.released_at END
+FROM locked
+WHERE b.sha256 = locked.sha256;
@@ -0,0 +1,12 @@
+-- One freshly drawn MLS number per remaining staged row, in row order
+UPDATE property_import_staging s
+SET mls_num = m.mls_num
+FROM (
+    SELECT numbered.row_num, n.mls_num
+    FROM (
+        SELECT row_num, ROW_NUMBER() OVER (ORDER BY row_num) AS position
+        FROM property_import_staging
+    ) numbered
+    JOIN unnest(CAST(:mls_nums AS INTEGER[])) WITH ORDINALITY AS n(mls_num, position) USING (position)
+) m
+WHERE s.row_num = m.row_num;
@@ -1,3 +1,4 @@
+-- Existence check for a newly allocated MLS number
 SELECT property_id
 FROM properties
-WHERE mls_num = :mls;
\ No newline at end of file
+WHERE mls_num = :number;
@@ -1,4 +1,4 @@
 UPDATE properties
 SET status = 'closed'
-WHERE mls_num = :mls
-RETURNING property_id, mls_num, status;
\ No newline at end of file
+WHERE property_id = ANY(:property_ids)
+RETURNING property_id, mls_num, status;
@@ -1,11 +1,9 @@
 SELECT COUNT(*)
-FROM properties p
-LEFT JOIN addresses a ON p.property_id = a.property_id
-WHERE
-    p.created_by = :created_by
-    AND (:city IS NULL OR a.city ILIKE :city)
-    AND (:area IS NULL OR a.area ILIKE :area)
-    AND (:min_price IS NULL OR p.price >= :min_price)
-    AND (:max_price IS NULL OR p.price <= :max_price)
-    AND (:mls_num IS NULL OR p.mls_num::TEXT ILIKE :mls_num)
-    AND (:status IS NULL OR p.status = :status);
+FROM property_listing pl
+WHERE pl.created_by = :created_by
+    AND (:city IS NULL OR pl.city ILIKE :city)
+    AND (:area IS NULL OR pl.area ILIKE :area)
+    AND (:min_price IS NULL OR pl.price >= :min_price)
+    AND (:max_price IS NULL OR pl.price <= :max_price)
+    AND (:mls_num IS NULL OR pl.mls_num::TEXT ILIKE :mls_num)
+    AND (:status IS NULL OR pl.status = :status);
\ No newline at end of file
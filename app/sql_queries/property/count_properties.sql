@@ -0,0 +1,8 @@
+SELECT COUNT(*)
+FROM property_listing pl
+WHERE (:city IS NULL OR pl.city ILIKE :city)
+    AND (:area IS NULL OR pl.area ILIKE :area)
+    AND (:min_price IS NULL OR pl.price >= :min_price)
+    AND (:max_price IS NULL OR pl.price <= :max_price)
+    AND (:mls_num IS NULL OR pl.mls_num::TEXT ILIKE :mls_num)
+    AND (:status IS NULL OR pl.status = :status);
@@ -0,0 +1,39 @@
+-- Per-request staging table for POST /property/import, filled with COPY and dropped at commit
+CREATE TEMP TABLE property_import_staging (
+    row_num INTEGER PRIMARY KEY,
+    mls_num INTEGER,
+    sellers INTEGER[] NOT NULL,
+    description TEXT,
+    show_inst TEXT,
+    price INTEGER,
+    property_type property_type_enum,
+    bedrooms INTEGER,
+    bathrooms DOUBLE PRECISION,
+    property_realtor_commission DOUBLE PRECISION,
+    buyer_realtor_commission DOUBLE PRECISION,
+    area_space INTEGER,
+    year_built INTEGER,
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
+    status property_status_enum,
+    trans_type property_transaction_type_enum,
+    exp_date DATE,
+    livable BOOLEAN,
+    floor INTEGER,
+    apt INTEGER,
+    area TEXT,
+    city TEXT,
+    county TEXT,
+    building_num TEXT,
+    street TEXT,
+    elevator BOOLEAN,
+    balcony INTEGER,
+    ac BOOLEAN,
+    fan_number INTEGER,
+    garage BOOLEAN,
+    garden BOOLEAN,
+    solar_system BOOLEAN,
+    water TEXT,
+    jacuzzi BOOLEAN,
+    pool BOOLEAN
+) ON COMMIT DROP;
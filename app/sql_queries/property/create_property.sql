@@ -1,47 +1,145 @@
-INSERT INTO PROPERTIES (
-    created_by,
-    description,
-    show_inst,
-    price,
-    property_type,
-    bedrooms,
-    bathrooms,
-    property_realtor_commission,
-    buyer_realtor_commission,
-    area_space,
-    year_built,
-    latitude,
-    longitude,
-    status,
-    trans_type,
-    exp_date,
-    created_at,
-    last_updated ,
-    images_urls,
-    mls_num,
-    livable
+-- One statement writes the property, its owners, address and additional record and returns
+-- the row in the shape of get_property_by_id.sql, so create needs no read-back
+WITH new_property AS (
+    INSERT INTO properties (
+        created_by,
+        description,
+        show_inst,
+        price,
+        property_type,
+        bedrooms,
+        bathrooms,
+        property_realtor_commission,
+        buyer_realtor_commission,
+        area_space,
+        year_built,
+        latitude,
+        longitude,
+        status,
+        trans_type,
+        exp_date,
+        created_at,
+        last_updated,
+        images_urls,
+        mls_num,
+        livable
+    )
+    VALUES (
+        :created_by,
+        :description,
+        :show_inst,
+        :price,
+        :property_type,
+        :bedrooms,
+        :bathrooms,
+        :property_realtor_commission,
+        :buyer_realtor_commission,
+        :area_space,
+        :year_built,
+        :latitude,
+        :longitude,
+        :status,
+        :trans_type,
+        :exp_date,
+        :created_at,
+        :last_updated,
+        :images_urls,
+        :mls_num,
+        :livable
+    )
+    RETURNING *
+),
+new_owners AS (
+    INSERT INTO property_owners (property_id, seller_id)
+    SELECT np.property_id, seller.id
+    FROM new_property np
+    CROSS JOIN (SELECT DISTINCT unnest(CAST(:seller_ids AS integer[])) AS id) AS seller
+),
+new_address AS (
+    -- VALUES (not INSERT ... SELECT) so the parameter types come from the target columns
+    INSERT INTO addresses (floor, apt, area, city, county, created_at, created_by, building_num, street, property_id)
+    VALUES (
+        :floor, :apt, :area, :city, :county, :created_at, :created_by, :building_num, :street,
+        (SELECT property_id FROM new_property)
+    )
+    RETURNING *
+),
+new_additional AS (
+    INSERT INTO additional (elevator, balcony, ac, fan_number, garage, garden, solar_system, water, jacuzzi, pool, property_id)
+    VALUES (
+        :elevator, :balcony, :ac, :fan_number, :garage, :garden, :solar_system, :water, :jacuzzi, :pool,
+        (SELECT property_id FROM new_property)
+    )
+    RETURNING *
 )
-VALUES(
-    :created_by,
-    :description,
-    :show_inst,
-    :price,
-    :property_type,
-    :bedrooms,
-    :bathrooms,
-    :property_realtor_commission,
-    :buyer_realtor_commission,
-    :area_space,
-    :year_built,
-    :latitude,
-    :longitude,
-    :status,
-    :trans_type,
-    :exp_date,
-    :created_at,
-    :last_updated ,
-    :images_urls,
-    :mls_num,
-    :livable
-)
-RETURNING property_id;
\ No newline at end of file
+SELECT
+    p.property_id,
+    p.description,
+    p.show_inst,
+    p.price,
+    p.property_type,
+    p.bedrooms,
+    p.bathrooms,
+    p.property_realtor_commission,
+    p.buyer_realtor_commission,
+    p.area_space,
+    p.year_built,
+    p.latitude,
+    p.longitude,
+    p.status,
+    p.trans_type,
+    p.exp_date,
+    p.created_at,
+    p.last_updated,
+    p.images_urls,
+    p.mls_num,
+    p.livable,
+
+    -- Created by user fields prefixed with created_by_
+    creator.user_id AS created_by_user_id,
+    creator.first_name AS created_by_first_name,
+    creator.last_name AS created_by_last_name,
+    creator.email AS created_by_email,
+    creator.phone_number AS created_by_phone_number,
+    creator.created_by AS created_by_created_by,
+    creator.created_at AS created_by_created_at,
+
+    -- Created by roles prefixed
+    creator_roles.admin AS created_by_admin,
+    creator_roles.broker AS created_by_broker,
+    creator_roles.realtor AS created_by_realtor,
+    creator_roles.buyer AS created_by_buyer,
+    creator_roles.seller AS created_by_seller,
+    creator_roles.tenant AS created_by_tenant,
+
+    -- Address fields
+    a.address_id AS address_address_id,
+    a.floor AS address_floor,
+    a.apt AS address_apt,
+    a.area AS address_area,
+    a.city AS address_city,
+    a.county AS address_county,
+    a.created_at AS address_created_at,
+    a.created_by AS address_created_by,
+    a.building_num AS address_building_num,
+    a.street AS address_street,
+
+    -- Additional fields
+    ad.additional_id,
+    ad.elevator,
+    ad.balcony,
+    ad.ac,
+    ad.fan_number,
+    ad.garage,
+    ad.garden,
+    ad.solar_system,
+    ad.water,
+    ad.jacuzzi,
+    ad.pool
+
+FROM new_property p
+CROSS JOIN new_address a
+CROSS JOIN new_additional ad
+
+LEFT JOIN users creator ON p.created_by = creator.user_id
+LEFT JOIN roles creator_roles ON creator.user_id = creator_roles.user_id;
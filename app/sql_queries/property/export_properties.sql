@@ -0,0 +1,58 @@
+-- Flat listing rows for GET /property/export; same filters as get_all_properties.sql, no paging.
+-- Columns follow the bulk import format, so an export can be imported elsewhere.
+SELECT
+    pl.property_id,
+    pl.mls_num,
+    ARRAY(
+        SELECT po.seller_id FROM property_owners po
+        WHERE po.property_id = pl.property_id
+        ORDER BY po.seller_id
+    ) AS sellers,
+    pl.description,
+    pl.show_inst,
+    pl.price,
+    pl.property_type,
+    pl.bedrooms,
+    pl.bathrooms,
+    pl.property_realtor_commission,
+    pl.buyer_realtor_commission,
+    pl.area_space,
+    pl.year_built,
+    pl.latitude,
+    pl.longitude,
+    pl.status,
+    pl.trans_type,
+    pl.exp_date,
+    pl.livable,
+    pl.created_at,
+    pl.last_updated,
+    pl.created_by_user_id AS created_by,
+    pl.floor,
+    pl.apt,
+    pl.area,
+    pl.city,
+    pl.county,
+    pl.building_num,
+    pl.street,
+    pl.elevator,
+    pl.balcony,
+    pl.ac,
+    pl.fan_number,
+    pl.garage,
+    pl.garden,
+    pl.solar_system,
+    pl.water,
+    pl.jacuzzi,
+    pl.pool,
+    pl.images_urls
+
+FROM property_listing pl
+
+WHERE (:city IS NULL OR pl.city ILIKE :city)
+    AND (:area IS NULL OR pl.area ILIKE :area)
+    AND (:min_price IS NULL OR pl.price >= :min_price)
+    AND (:max_price IS NULL OR pl.price <= :max_price)
+    AND (:mls_num IS NULL OR pl.mls_num::TEXT ILIKE :mls_num)
+    AND (:status IS NULL OR pl.status = :status)
+
+ORDER BY {sort_by} {sort_order}, pl.property_id {sort_order};
@@ -1,80 +1,79 @@
-SELECT DISTINCT ON (p.property_id)
+SELECT
     -- Property fields
-    p.property_id,
-    p.description,
-    p.show_inst,
-    p.price,
-    p.property_type,
-    p.bedrooms,
-    p.bathrooms,
-    p.property_realtor_commission,
-    p.buyer_realtor_commission,
-    p.area_space,
-    p.year_built,
-    p.latitude,
-    p.longitude,
-    p.status,
-    p.trans_type,
-    p.exp_date,
-    p.created_at,
-    p.last_updated,
-    p.images_urls,
-    p.mls_num,
-    p.livable,
+    pl.property_id,
+    pl.description,
+    pl.show_inst,
+    pl.price,
+    pl.property_type,
+    pl.bedrooms,
+    pl.bathrooms,
+    pl.property_realtor_commission,
+    pl.buyer_realtor_commission,
+    pl.area_space,
+    pl.year_built,
+    pl.latitude,
+    pl.longitude,
+    pl.status,
+    pl.trans_type,
+    pl.exp_date,
+    pl.created_at,
+    pl.last_updated,
+    pl.images_urls,
+    pl.mls_num,
+    pl.livable,
 
     -- Created by user fields
-    cb.user_id AS created_by_user_id,
-    cb.first_name AS created_by_first_name,
-    cb.last_name AS created_by_last_name,
-    cb.email AS created_by_email,
-    cb.phone_number AS created_by_phone_number,
-    cb.created_at AS created_by_created_at,
-    cb.created_by AS created_by_created_by,
+    pl.created_by_user_id,
+    pl.created_by_first_name,
+    pl.created_by_last_name,
+    pl.created_by_email,
+    pl.created_by_phone_number,
+    pl.created_by_created_at,
+    pl.created_by_created_by,
 
-    rcb.admin AS created_by_admin,
-    rcb.broker AS created_by_broker,
-    rcb.realtor AS created_by_realtor,
-    rcb.buyer AS created_by_buyer,
-    rcb.seller AS created_by_seller,
-    rcb.tenant AS created_by_tenant,
+    -- Created by roles
+    pl.created_by_admin,
+    pl.created_by_broker,
+    pl.created_by_realtor,
+    pl.created_by_buyer,
+    pl.created_by_seller,
+    pl.created_by_tenant,
 
     -- Address fields
-    a.address_id,
-    a.floor,
-    a.apt,
-    a.area,
-    a.city,
-    a.county,
-    a.created_by AS address_created_by,
-    a.created_at AS address_created_at,
-    a.building_num,
-    a.street,
+    pl.address_id,
+    pl.floor,
+    pl.apt,
+    pl.area,
+    pl.city,
+    pl.county,
+    pl.address_created_by,
+    pl.address_created_at,
+    pl.building_num,
+    pl.street,
 
     -- Additional fields
-    ad.elevator,
-    ad.balcony,
-    ad.ac,
-    ad.fan_number, 
-    ad.garage, 
-    ad.garden, 
-    ad.solar_system, 
-    ad.water, 
-    ad.jacuzzi,
-    ad.pool
-    
-FROM properties p
-LEFT JOIN users cb ON p.created_by = cb.user_id
-LEFT JOIN roles rcb ON cb.user_id = rcb.user_id
+    pl.elevator,
+    pl.balcony,
+    pl.ac,
+    pl.fan_number,
+    pl.garage,
+    pl.garden,
+    pl.solar_system,
+    pl.water,
+    pl.jacuzzi,
+    pl.pool
+    -- COUNT(*) OVER() AS total_count for exact offset pages (count_strategy.window_total_column), else nothing
+    {total}
 
-LEFT JOIN addresses a ON p.property_id = a.property_id
-LEFT JOIN additional ad ON p.property_id = ad.property_id
+FROM property_listing pl
 
-WHERE (:city IS NULL OR a.city ILIKE :city)
-    AND (:area IS NULL OR a.area ILIKE :area)
-    AND (:min_price IS NULL OR p.price >= :min_price)
-    AND (:max_price IS NULL OR p.price <= :max_price)
-    AND (:mls_num IS NULL OR p.mls_num::TEXT ILIKE :mls_num)
-    AND (:status IS NULL OR p.status = :status)
+WHERE (:city IS NULL OR pl.city ILIKE :city)
+    AND (:area IS NULL OR pl.area ILIKE :area)
+    AND (:min_price IS NULL OR pl.price >= :min_price)
+    AND (:max_price IS NULL OR pl.price <= :max_price)
+    AND (:mls_num IS NULL OR pl.mls_num::TEXT ILIKE :mls_num)
+    AND (:status IS NULL OR pl.status = :status)
+    AND {keyset}
 
-ORDER BY {sort_by} {sort_order}
-LIMIT :limit OFFSET :offset;
+ORDER BY {sort_by} {sort_order}, pl.property_id {sort_order}
+LIMIT :limit OFFSET :offset;
\ No newline at end of file
@@ -1,4 +1,5 @@
 SELECT
+    op.property_id AS property_id,
     o.consumer_id AS consumer_id,
     o.name AS name,
     o.father_name AS father_name,
@@ -15,5 +16,6 @@ SELECT
     o.created_at AS created_at
 
 FROM property_owners op
-LEFT JOIN consumers o ON op.seller_id = o.consumer_id
-WHERE op.property_id = :property_id
+JOIN consumers o ON op.seller_id = o.consumer_id
+WHERE op.property_id = ANY(:property_ids)
+ORDER BY op.property_id, o.consumer_id
@@ -0,0 +1 @@
+SELECT mls_num FROM properties WHERE mls_num = ANY(:numbers);
@@ -0,0 +1,6 @@
+-- Row locks for closing; taken in property_id order so concurrent bulk closes cannot deadlock
+SELECT p.property_id, p.mls_num, p.status, p.trans_type
+FROM properties p
+WHERE p.mls_num = ANY(:mls_nums)
+ORDER BY p.property_id
+FOR UPDATE;
@@ -0,0 +1,5 @@
+-- Row lock for read-modify-write of images_urls (photo updates, photo references, derivative URLs)
+SELECT p.images_urls
+FROM properties p
+WHERE p.property_id = :property_id
+FOR UPDATE;
@@ -0,0 +1,39 @@
+-- Set-based merge of the staged rows: one statement writes properties, addresses, additional and owners
+WITH new_properties AS (
+    INSERT INTO properties (
+        created_by, description, show_inst, price, property_type, bedrooms, bathrooms,
+        property_realtor_commission, buyer_realtor_commission, area_space, year_built,
+        latitude, longitude, status, trans_type, exp_date, created_at, last_updated, mls_num, livable
+    )
+    SELECT
+        :created_by, s.description, s.show_inst, s.price, s.property_type, s.bedrooms, s.bathrooms,
+        s.property_realtor_commission, s.buyer_realtor_commission, s.area_space, s.year_built,
+        s.latitude, s.longitude, s.status, s.trans_type, s.exp_date, :now, :now, s.mls_num, s.livable
+    FROM property_import_staging s
+    ORDER BY s.row_num
+    RETURNING property_id, mls_num
+),
+staged AS (
+    SELECT s.*, np.property_id
+    FROM property_import_staging s
+    JOIN new_properties np ON np.mls_num = s.mls_num
+),
+new_addresses AS (
+    INSERT INTO addresses (floor, apt, area, city, county, created_at, created_by, building_num, street, property_id)
+    SELECT floor, apt, area, city, county, :now, :created_by, building_num, street, property_id
+    FROM staged
+),
+new_additional AS (
+    INSERT INTO additional (elevator, balcony, ac, fan_number, garage, garden, solar_system, water, jacuzzi, pool, property_id)
+    SELECT elevator, balcony, ac, fan_number, garage, garden, solar_system, water, jacuzzi, pool, property_id
+    FROM staged
+),
+new_owners AS (
+    INSERT INTO property_owners (property_id, seller_id)
+    SELECT DISTINCT st.property_id, seller.id
+    FROM staged st
+    CROSS JOIN LATERAL unnest(st.sellers) AS seller(id)
+)
+SELECT row_num, property_id, mls_num
+FROM staged
+ORDER BY row_num;
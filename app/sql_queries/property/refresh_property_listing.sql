@@ -0,0 +1,142 @@
+-- Upsert the pre-joined listing row for every property matching the scope condition
+INSERT INTO property_listing (
+    property_id, description, show_inst, price,
+    property_type, bedrooms, bathrooms, property_realtor_commission,
+    buyer_realtor_commission, area_space, year_built, latitude,
+    longitude, status, trans_type, exp_date,
+    created_at, last_updated, images_urls, mls_num,
+    livable, created_by, created_by_user_id, created_by_first_name,
+    created_by_last_name, created_by_email, created_by_phone_number, created_by_created_at,
+    created_by_created_by, created_by_admin, created_by_broker, created_by_realtor,
+    created_by_buyer, created_by_seller, created_by_tenant, address_id,
+    floor, apt, area, city,
+    county, address_created_by, address_created_at, building_num,
+    street, additional_id, elevator, balcony,
+    ac, fan_number, garage, garden,
+    solar_system, water, jacuzzi, pool
+)
+-- DISTINCT ON guards the upsert against a property with more than one additional row
+SELECT DISTINCT ON (p.property_id)
+    p.property_id,
+    p.description,
+    p.show_inst,
+    p.price,
+    p.property_type,
+    p.bedrooms,
+    p.bathrooms,
+    p.property_realtor_commission,
+    p.buyer_realtor_commission,
+    p.area_space,
+    p.year_built,
+    p.latitude,
+    p.longitude,
+    p.status,
+    p.trans_type,
+    p.exp_date,
+    p.created_at,
+    p.last_updated,
+    p.images_urls,
+    p.mls_num,
+    p.livable,
+    p.created_by,
+
+    cb.user_id,
+    cb.first_name,
+    cb.last_name,
+    cb.email,
+    cb.phone_number,
+    cb.created_at,
+    cb.created_by,
+
+    rcb.admin,
+    rcb.broker,
+    rcb.realtor,
+    rcb.buyer,
+    rcb.seller,
+    rcb.tenant,
+
+    a.address_id,
+    a.floor,
+    a.apt,
+    a.area,
+    a.city,
+    a.county,
+    a.created_by,
+    a.created_at,
+    a.building_num,
+    a.street,
+
+    ad.additional_id,
+    ad.elevator,
+    ad.balcony,
+    ad.ac,
+    ad.fan_number,
+    ad.garage,
+    ad.garden,
+    ad.solar_system,
+    ad.water,
+    ad.jacuzzi,
+    ad.pool
+FROM properties p
+LEFT JOIN users cb ON p.created_by = cb.user_id
+LEFT JOIN roles rcb ON cb.user_id = rcb.user_id
+LEFT JOIN addresses a ON p.property_id = a.property_id
+LEFT JOIN additional ad ON p.property_id = ad.property_id
+WHERE {scope}
+ORDER BY p.property_id, ad.additional_id
+ON CONFLICT (property_id) DO UPDATE SET
+    description = EXCLUDED.description,
+    show_inst = EXCLUDED.show_inst,
+    price = EXCLUDED.price,
+    property_type = EXCLUDED.property_type,
+    bedrooms = EXCLUDED.bedrooms,
+    bathrooms = EXCLUDED.bathrooms,
+    property_realtor_commission = EXCLUDED.property_realtor_commission,
+    buyer_realtor_commission = EXCLUDED.buyer_realtor_commission,
+    area_space = EXCLUDED.area_space,
+    year_built = EXCLUDED.year_built,
+    latitude = EXCLUDED.latitude,
+    longitude = EXCLUDED.longitude,
+    status = EXCLUDED.status,
+    trans_type = EXCLUDED.trans_type,
+    exp_date = EXCLUDED.exp_date,
+    created_at = EXCLUDED.created_at,
+    last_updated = EXCLUDED.last_updated,
+    images_urls = EXCLUDED.images_urls,
+    mls_num = EXCLUDED.mls_num,
+    livable = EXCLUDED.livable,
+    created_by = EXCLUDED.created_by,
+    created_by_user_id = EXCLUDED.created_by_user_id,
+    created_by_first_name = EXCLUDED.created_by_first_name,
+    created_by_last_name = EXCLUDED.created_by_last_name,
+    created_by_email = EXCLUDED.created_by_email,
+    created_by_phone_number = EXCLUDED.created_by_phone_number,
+    created_by_created_at = EXCLUDED.created_by_created_at,
+    created_by_created_by = EXCLUDED.created_by_created_by,
+    created_by_admin = EXCLUDED.created_by_admin,
+    created_by_broker = EXCLUDED.created_by_broker,
+    created_by_realtor = EXCLUDED.created_by_realtor,
+    created_by_buyer = EXCLUDED.created_by_buyer,
+    created_by_seller = EXCLUDED.created_by_seller,
+    created_by_tenant = EXCLUDED.created_by_tenant,
+    address_id = EXCLUDED.address_id,
+    floor = EXCLUDED.floor,
+    apt = EXCLUDED.apt,
+    area = EXCLUDED.area,
+    city = EXCLUDED.city,
+    county = EXCLUDED.county,
+    address_created_by = EXCLUDED.address_created_by,
+    address_created_at = EXCLUDED.address_created_at,
+    building_num = EXCLUDED.building_num,
+    street = EXCLUDED.street,
+    additional_id = EXCLUDED.additional_id,
+    elevator = EXCLUDED.elevator,
+    balcony = EXCLUDED.balcony,
+    ac = EXCLUDED.ac,
+    fan_number = EXCLUDED.fan_number,
+    garage = EXCLUDED.garage,
+    garden = EXCLUDED.garden,
+    solar_system = EXCLUDED.solar_system,
+    water = EXCLUDED.water,
+    jacuzzi = EXCLUDED.jacuzzi,
+    pool = EXCLUDED.pool;
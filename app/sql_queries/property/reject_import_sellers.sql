@@ -0,0 +1,13 @@
+-- Drops staged rows naming sellers that do not exist and reports them
+WITH missing AS (
+    SELECT s.row_num, array_agg(DISTINCT seller.id ORDER BY seller.id) AS seller_ids
+    FROM property_import_staging s
+    CROSS JOIN LATERAL unnest(s.sellers) AS seller(id)
+    LEFT JOIN consumers c ON c.consumer_id = seller.id
+    WHERE c.consumer_id IS NULL
+    GROUP BY s.row_num
+)
+DELETE FROM property_import_staging s
+USING missing
+WHERE s.row_num = missing.row_num
+RETURNING s.row_num, missing.seller_ids;
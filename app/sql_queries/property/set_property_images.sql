@@ -0,0 +1,3 @@
+UPDATE properties
+SET images_urls = CAST(:images_urls AS JSONB)
+WHERE property_id = :property_id;
@@ -0,0 +1,30 @@
+-- One row per closed sale; :closings is a JSON array of objects with the columns below
+INSERT INTO sales_trans (
+    property_id,
+    sold_price,
+    buyer_agent_commission,
+    seller_agent_commission,
+    date,
+    buyer_id,
+    seller_id,
+    closed_by_id
+)
+SELECT
+    c.property_id,
+    c.sold_price,
+    c.buyer_agent_commission,
+    c.seller_agent_commission,
+    c.date,
+    c.buyer_id,
+    c.seller_id,
+    c.closed_by_id
+FROM jsonb_to_recordset(CAST(:closings AS JSONB)) AS c(
+    property_id INT,
+    sold_price NUMERIC,
+    buyer_agent_commission FLOAT8,
+    seller_agent_commission FLOAT8,
+    date DATE,
+    buyer_id INT,
+    seller_id INT,
+    closed_by_id INT
+);
@@ -0,0 +1,22 @@
+-- Top :limit agents for each of the requested months, ranked within the month
+WITH ranked AS (
+    SELECT
+        m.month,
+        m.user_id,
+        m.closed_count,
+        m.total_price,
+        ROW_NUMBER() OVER (PARTITION BY m.month ORDER BY m.closed_count DESC, m.total_price DESC, m.user_id) AS rank
+    FROM agent_monthly_performance m
+    WHERE m.month = ANY(:months)
+)
+SELECT
+    r.month,
+    CONCAT(u.first_name, ' ', u.last_name) AS full_name,
+    r.closed_count,
+    l.lic_num AS license_number,
+    r.total_price::FLOAT8 AS total_price
+FROM ranked r
+JOIN users u ON u.user_id = r.user_id
+LEFT JOIN licenses l ON l.user_id = u.user_id
+WHERE r.rank <= :limit
+ORDER BY r.month, r.rank;
@@ -0,0 +1,22 @@
+-- Top :limit agents over the months from :start_month to :end_month inclusive
+WITH totals AS (
+    SELECT
+        m.user_id,
+        SUM(m.closed_count) AS closed_count,
+        SUM(m.total_price) AS total_price
+    FROM agent_monthly_performance m
+    WHERE m.month >= :start_month
+        AND m.month <= :end_month
+    GROUP BY m.user_id
+    ORDER BY closed_count DESC, total_price DESC, m.user_id
+    LIMIT :limit
+)
+SELECT
+    CONCAT(u.first_name, ' ', u.last_name) AS full_name,
+    t.closed_count::INT AS closed_count,
+    l.lic_num AS license_number,
+    t.total_price::FLOAT8 AS total_price
+FROM totals t
+JOIN users u ON u.user_id = t.user_id
+LEFT JOIN licenses l ON l.user_id = u.user_id
+ORDER BY t.closed_count DESC, t.total_price DESC, t.user_id;
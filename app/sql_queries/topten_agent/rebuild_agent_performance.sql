@@ -0,0 +1,11 @@
+DELETE FROM agent_monthly_performance;
+
+INSERT INTO agent_monthly_performance (month, user_id, closed_count, total_price)
+SELECT date_trunc('month', t.date)::DATE, p.created_by, COUNT(*), COALESCE(SUM(t.sold_price), 0)
+FROM (
+    SELECT property_id, date, sold_price FROM sales_trans
+    UNION ALL
+    SELECT property_id, date, sold_price FROM rents_trans
+) t
+JOIN properties p ON p.property_id = t.property_id
+GROUP BY date_trunc('month', t.date), p.created_by;
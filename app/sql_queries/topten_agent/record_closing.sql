@@ -0,0 +1,11 @@
+-- Credit closed sales and rents to their listing agents for the month of each closing date.
+-- :closings is a JSON array of {property_id, date, sold_price}; rows are summed first because
+-- ON CONFLICT cannot update the same (month, user_id) twice in one statement.
+INSERT INTO agent_monthly_performance (month, user_id, closed_count, total_price)
+SELECT date_trunc('month', c.date)::DATE, p.created_by, COUNT(*), COALESCE(SUM(c.sold_price), 0)
+FROM jsonb_to_recordset(CAST(:closings AS JSONB)) AS c(property_id INT, date DATE, sold_price NUMERIC)
+JOIN properties p ON p.property_id = c.property_id
+GROUP BY date_trunc('month', c.date), p.created_by
+ON CONFLICT (month, user_id) DO UPDATE SET
+    closed_count = agent_monthly_performance.closed_count + EXCLUDED.closed_count,
+    total_price = agent_monthly_performance.total_price + EXCLUDED.total_price;
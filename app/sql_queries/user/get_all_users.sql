@@ -1,4 +1,4 @@
-SELECT 
+SELECT DISTINCT ON (u.user_id)
     u.*, 
     d.address_id,
     d.floor,
@@ -18,7 +18,7 @@ SELECT
 FROM users u
 LEFT JOIN roles r ON r.user_id = u.user_id
 LEFT JOIN addresses d ON d.created_by = u.user_id
-WHERE
+WHERE (
     (:role = 'admin')
     OR
     (:role = 'realtor' AND u.created_by = :user_id)
@@ -29,4 +29,9 @@ WHERE
             SELECT u1.user_id FROM users u1 WHERE u1.created_by = :user_id
         )
     ))
+)
+    AND {keyset}
+
+-- A user can have several addresses; keep one row per user so pages line up with the count
+ORDER BY u.user_id {sort_order}, d.address_id
 LIMIT :limit OFFSET :offset;
@@ -0,0 +1,44 @@
+from decimal import Decimal
+from typing import Sequence
+import orjson
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.engine import Result
+
+# Shared output path for the analytics endpoints (stats, market watcher, top-ten agents).
+# Rows are cleaned column by column: float/Decimal columns become float arrays and every
+# NaN/Inf is replaced with None through one NumPy mask, instead of checking each cell in Python.
+# NumPy is imported on first use so that workers which never serve analytics do not pay for it.
+
+ORIENTS = ("records", "split")
+ORIENT_PATTERN = "^(records|split)$"
+
+def _clean_column(values: Sequence) -> list:
+    sample = next((v for v in values if v is not None), None)
+    if not isinstance(sample, (float, Decimal)):
+        return list(values)
+    import numpy as np
+    numbers = np.array(values, dtype=np.float64)  # None -> NaN
+    cleaned = numbers.astype(object)
+    cleaned[~np.isfinite(numbers)] = None
+    return cleaned.tolist()
+
+def serialize_rows(columns: Sequence[str], rows: Sequence[Sequence], orient: str = "records"):
+    # "records": [{column: value}, ...]; "split": {"columns": [...], "data": [[...], ...]}
+    cleaned = [_clean_column(values) for values in zip(*rows)] if rows else [[] for _ in columns]
+    data = zip(*cleaned)
+    if orient == "split":
+        return {"columns": list(columns), "data": [list(row) for row in data]}
+    return [dict(zip(columns, row)) for row in data]
+
+def serialize_result(result: Result, orient: str = "records"):
+    return serialize_rows(list(result.keys()), result.all(), orient)
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+class AnalyticsResponse(ORJSONResponse):
+    # orjson encodes dates, enums and NumPy scalars natively; Decimal falls back to float
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
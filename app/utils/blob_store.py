@@ -0,0 +1,73 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+# Content-addressed files on local disk: a blob lives at <root>/<sha[:2]>/<sha[2:4]>/<sha>, so identical
+# content is stored once and a blob never changes after it is written.
+
+BLOB_DIR = Path(os.getenv("BLOB_DIR", os.path.join(os.getcwd(), "storage", "blobs")))
+BLOB_CHUNK_SIZE = int(os.getenv("BLOB_CHUNK_SIZE", str(1024 * 1024)))
+
+class BlobStore:
+    def __init__(self, root: Path = BLOB_DIR, chunk_size: int = BLOB_CHUNK_SIZE):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+
+    def path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def exists(self, sha256: str) -> bool:
+        return self.path(sha256).is_file()
+
+    @property
+    def tmp_dir(self) -> Path:
+        # Same file system as the blobs, so publishing is a rename
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return tmp_dir
+
+    def _temp_file(self):
+        return tempfile.NamedTemporaryFile(dir=self.tmp_dir, delete=False)
+
+    def publish(self, tmp_path: str, key: str):
+        # Moves a fully written, fsynced temp file under its key; identical content already stored wins
+        target = self.path(key)
+        if target.exists():
+            os.unlink(tmp_path)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, target)
+
+    def delete(self, key: str):
+        self.path(key).unlink(missing_ok=True)
+
+    def _commit(self, tmp, sha256: str):
+        # fsync before the rename so a crash never leaves a truncated blob under its final name
+        tmp.flush()
+        os.fsync(tmp.fileno())
+        tmp.close()
+        self.publish(tmp.name, sha256)
+
+    async def put_upload(self, upload: UploadFile) -> tuple[str, int]:
+        # Streams the upload in chunks (never whole in memory); disk writes run off the event loop
+        digest = hashlib.sha256()
+        size = 0
+        tmp = await run_in_threadpool(self._temp_file)
+        try:
+            while chunk := await upload.read(self.chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+                await run_in_threadpool(tmp.write, chunk)
+            sha256 = digest.hexdigest()
+            await run_in_threadpool(self._commit, tmp, sha256)
+        except BaseException:
+            tmp.close()
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
+            raise
+        return sha256, size
+
+blob_store = BlobStore()
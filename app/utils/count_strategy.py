@@ -0,0 +1,72 @@
+import os
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from .ttl_cache import TTLCache
+
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "10"))
+COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", "512"))
+
+# Listing totals keyed by (listing, mode, normalized filters); cleared when listed rows change
+count_cache = TTLCache(COUNT_CACHE_TTL, COUNT_CACHE_SIZE)
+
+# Appended to a listing's select list; counts every row matching the filters, so Postgres reads them all before LIMIT
+WINDOW_TOTAL = ", COUNT(*) OVER() AS total_count"
+
+def filter_key(filters: dict) -> tuple:
+    # Unset filters do not change the count, so leave them out of the key
+    return tuple(sorted((k, v) for k, v in filters.items() if v is not None))
+
+def window_total_column(listing: str, mode: str, filters: dict, cursor) -> str:
+    # Only an exact, uncached total for an offset page is worth taking from the page query. A cursor predicate
+    # narrows the rows so the window would not be the total, and "estimated" must not pay for a full count.
+    if mode != "exact" or cursor or count_cache.get((listing, mode, filter_key(filters))) is not None:
+        return ""
+    return WINDOW_TOTAL
+
+def table_estimate(db: Session, table: str) -> Optional[int]:
+    # Planner statistics; -1 (never analyzed) or 0 on a fresh table are not usable
+    reltuples = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table}
+    ).scalar()
+    return reltuples if reltuples and reltuples > 0 else None
+
+def plan_estimate(db: Session, query: TextClause, params: dict) -> int:
+    # Planner row estimate for the listing query with no LIMIT (LIMIT NULL means ALL)
+    plan = db.execute(
+        text("EXPLAIN (FORMAT JSON) " + query.text),
+        {**params, "limit": None, "offset": 0}
+    ).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def listing_total(
+    db: Session,
+    listing: str,
+    mode: str,
+    filters: dict,
+    count_query: TextClause,
+    list_query: TextClause,
+    table: str,
+    window_total: Optional[int] = None
+) -> int:
+    # mode "exact": COUNT(*) OVER() from the page query when window_total_column added it, else the filtered count query.
+    # mode "estimated": pg_class.reltuples for an unfiltered listing, EXPLAIN estimate otherwise.
+    key = (listing, mode, filter_key(filters))
+    total = count_cache.get(key)
+    if total is not None:
+        return total
+
+    if mode == "estimated":
+        total = table_estimate(db, table) if not filter_key(filters) else None
+        if total is None:
+            total = plan_estimate(db, list_query, filters)
+    elif window_total is not None:
+        total = window_total
+    else:
+        total = db.execute(count_query, filters).scalar()
+
+    count_cache.set(key, total)
+    return total
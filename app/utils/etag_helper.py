@@ -0,0 +1,16 @@
+from fastapi import Request
+
+# Conditional GET support: strong ETags are quoted content hashes
+
+def make_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
@@ -1,5 +1,105 @@
+import logging
+import os
+import re
+import threading
+import time
 from pathlib import Path
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+SQL_DIR = Path(__file__).parent.parent / "sql_queries"
+APP_DIR = Path(__file__).parent.parent
+
+logger = logging.getLogger(__name__)
+
+# Enable with SQL_HOT_RELOAD=true in development to pick up edited .sql files without a restart
+SQL_HOT_RELOAD = os.getenv("SQL_HOT_RELOAD", "false").lower() == "true"
+SQL_WATCH_INTERVAL = float(os.getenv("SQL_WATCH_INTERVAL", "1"))
+
+_sql_cache: dict[str, str] = {}
+_query_cache: dict[tuple, TextClause] = {}
+_mtimes: dict[str, float] = {}
+_lock = threading.Lock()
+_watcher: threading.Thread | None = None
+
+_load_sql_pattern = re.compile(r"""load_(?:sql|query)\(\s*["']([^"']+\.sql)["']""")
+
+def _read_all() -> tuple[dict[str, str], dict[str, float]]:
+    sql_files = {}
+    mtimes = {}
+    for path in SQL_DIR.rglob("*.sql"):
+        name = path.relative_to(SQL_DIR).as_posix()
+        sql_files[name] = path.read_text()
+        mtimes[name] = path.stat().st_mtime
+    return sql_files, mtimes
+
+def preload_sql():
+    # Load every .sql file once and drop any compiled queries built from the previous contents
+    global _sql_cache, _mtimes
+    sql_files, mtimes = _read_all()
+    with _lock:
+        _sql_cache = sql_files
+        _mtimes = mtimes
+        _query_cache.clear()
+
+def verify_sql_references():
+    # Fail fast at startup if any load_sql("...") call points at a file that does not exist
+    missing = set()
+    for path in APP_DIR.rglob("*.py"):
+        for name in _load_sql_pattern.findall(path.read_text(encoding="utf-8")):
+            if name not in _sql_cache:
+                missing.add(f"{name} (referenced in {path.relative_to(APP_DIR.parent).as_posix()})")
+    if missing:
+        raise RuntimeError("Missing SQL files: " + ", ".join(sorted(missing)))
+
+def _changed() -> bool:
+    current = {
+        path.relative_to(SQL_DIR).as_posix(): path.stat().st_mtime
+        for path in SQL_DIR.rglob("*.sql")
+    }
+    return current != _mtimes
+
+def _watch():
+    while True:
+        time.sleep(SQL_WATCH_INTERVAL)
+        try:
+            if _changed():
+                preload_sql()
+                logger.info("SQL queries reloaded")
+        except OSError as e:
+            logger.warning("SQL watcher error: %s", e)
+
+def start_sql_watcher():
+    global _watcher
+    if _watcher is None:
+        _watcher = threading.Thread(target=_watch, name="sql-watcher", daemon=True)
+        _watcher.start()
+
+def init_sql_registry():
+    preload_sql()
+    verify_sql_references()
+    if SQL_HOT_RELOAD:
+        start_sql_watcher()
 
 def load_sql(filename: str) -> str:
-    sql_path = Path(__file__).parent.parent / "sql_queries" / filename
-    return sql_path.read_text()
+    sql = _sql_cache.get(filename)
+    if sql is None:
+        # Not preloaded (e.g. scripts or a file added after startup): read it once and keep it
+        sql_path = SQL_DIR / filename
+        sql = sql_path.read_text()
+        with _lock:
+            _sql_cache[filename] = sql
+    return sql
+
+def load_query(filename: str, **format_args) -> TextClause:
+    # Compiled text() objects, cached per file and per set of format arguments (e.g. sort_by)
+    key = (filename, tuple(sorted(format_args.items())))
+    query = _query_cache.get(key)
+    if query is None:
+        sql = load_sql(filename)
+        if format_args:
+            sql = sql.format(**format_args)
+        query = text(sql)
+        with _lock:
+            _query_cache[key] = query
+    return query
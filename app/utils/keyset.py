@@ -0,0 +1,125 @@
+import base64
+import binascii
+import json
+from typing import NamedTuple, Optional
+from fastapi import HTTPException
+
+class SortColumn(NamedTuple):
+    column: str  # qualified SQL expression, e.g. "a.city"
+    key: str  # name of the column in the result row
+    nullable: bool = False
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(payload, dict) or not {"s", "o", "d", "v", "id"} <= payload.keys():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+class Keyset:
+    # Cursor pagination that seeks on (sort column, primary key) instead of skipping OFFSET rows.
+    # Listing SQL files take {sort_by} {sort_order} and {keyset} and order by "{sort_by} {sort_order}, <pk> {sort_order}".
+    # Without a cursor the page/per_page offset is used, so both modes share one query.
+    def __init__(
+        self,
+        sort_columns: dict[str, SortColumn],
+        primary_key: SortColumn,
+        sort_by: str,
+        sort_order: str,
+        page: int,
+        per_page: int,
+        cursor: Optional[str] = None
+    ):
+        self.sort_by = sort_by
+        self.sort_order = sort_order
+        self.sort = sort_columns[sort_by]
+        self.pk = primary_key
+        self.page = page
+        self.per_page = per_page
+        self.cursor = decode_cursor(cursor) if cursor else None
+        if self.cursor and (self.cursor["s"] != sort_by or self.cursor["o"] != sort_order):
+            raise HTTPException(status_code=400, detail="Cursor does not match sort_by/sort_order")
+        self.backwards = bool(self.cursor) and self.cursor["d"] == "prev"
+
+    @property
+    def direction(self) -> str:
+        # Walking backwards reads the reversed order and flips the rows afterwards
+        if not self.backwards:
+            return self.sort_order
+        return "desc" if self.sort_order == "asc" else "asc"
+
+    def _predicate(self) -> str:
+        if not self.cursor:
+            return "TRUE"
+        op = ">" if self.direction == "asc" else "<"
+        col, pk = self.sort.column, self.pk.column
+        if col == pk:
+            return f"{pk} {op} :cursor_id"
+        # Postgres sorts NULLs last ascending and first descending
+        if self.cursor["v"] is None:
+            if self.direction == "asc":
+                return f"({col} IS NULL AND {pk} {op} :cursor_id)"
+            return f"(({col} IS NULL AND {pk} {op} :cursor_id) OR {col} IS NOT NULL)"
+        predicate = f"({col}, {pk}) {op} (:cursor_value, :cursor_id)"
+        if self.sort.nullable and self.direction == "asc":
+            predicate = f"({predicate} OR {col} IS NULL)"
+        return predicate
+
+    @property
+    def format_args(self) -> dict:
+        return {"sort_by": self.sort.column, "sort_order": self.direction, "keyset": self._predicate()}
+
+    @property
+    def params(self) -> dict:
+        # One extra row tells whether another page exists in the direction of travel
+        params = {"limit": self.per_page + 1, "offset": 0 if self.cursor else (self.page - 1) * self.per_page}
+        if self.cursor:
+            params["cursor_id"] = self.cursor["id"]
+            if self.cursor["v"] is not None:
+                params["cursor_value"] = self.cursor["v"]
+        return params
+
+    def rows(self, rows) -> list:
+        rows = list(rows)
+        self._has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if self.backwards:
+            rows.reverse()
+        self._first = rows[0] if rows else None
+        self._last = rows[-1] if rows else None
+        return rows
+
+    def _cursor_for(self, row, direction: str) -> str:
+        return encode_cursor({
+            "s": self.sort_by,
+            "o": self.sort_order,
+            "d": direction,
+            "v": row[self.sort.key],
+            "id": row[self.pk.key]
+        })
+
+    def meta(self, total: int) -> dict:
+        total_pages = (total + self.per_page - 1) // self.per_page
+        if self.cursor:
+            has_next = self._has_more if not self.backwards else True
+            has_prev = self._has_more if self.backwards else True
+        else:
+            has_next = self.page < total_pages
+            has_prev = self.page > 1
+        return {
+            "total": total,
+            "page": self.page,
+            "per_page": self.per_page,
+            "total_pages": total_pages,
+            "has_next": has_next,
+            "has_prev": has_prev,
+            "next_cursor": self._cursor_for(self._last, "next") if has_next and self._last else None,
+            "prev_cursor": self._cursor_for(self._first, "prev") if has_prev and self._first else None
+        }
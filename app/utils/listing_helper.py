@@ -0,0 +1,26 @@
+from typing import Iterable
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .file_helper import load_query
+
+# Keep property_listing in step with its source rows; call inside the writing transaction, before commit.
+# Deleted properties need no call: their listing row goes with them (ON DELETE CASCADE).
+
+def refresh_property_listing(db: Session, property_ids: Iterable[int]):
+    query = load_query("property/refresh_property_listing.sql", scope="p.property_id = ANY(:property_ids)")
+    db.execute(query, {"property_ids": list(property_ids)})
+
+async def refresh_property_listing_async(db: AsyncSession, property_ids: Iterable[int]):
+    query = load_query("property/refresh_property_listing.sql", scope="p.property_id = ANY(:property_ids)")
+    await db.execute(query, {"property_ids": list(property_ids)})
+
+def refresh_creator_listings(db: Session, user_id: int):
+    # Creator name, contact and roles are copied into every listing row they created
+    query = load_query("property/refresh_property_listing.sql", scope="p.created_by = :user_id")
+    db.execute(query, {"user_id": user_id})
+
+def rebuild_property_listing(db: Session | Connection):
+    # Every row at once, for seeded or bulk-loaded databases
+    db.execute(load_query("property/refresh_property_listing.sql", scope="TRUE"))
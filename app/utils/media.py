@@ -0,0 +1,187 @@
+"""
+Media responses for stored files (property photos, contract PDFs).
+
+MEDIA_MODE "app" (default) streams the file from this process with strong ETags and single Range
+requests. MEDIA_MODE "x-accel" only answers with headers and an X-Accel-Redirect to an internal nginx
+location, so nginx sends the bytes (and handles Range) and API workers are never tied up streaming.
+Public photos do not reach the API at all behind the generated config:
+
+    python -m app.utils.media --upstream 127.0.0.1:8000 > /etc/nginx/conf.d/nrep.conf
+"""
+import argparse
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Optional
+from fastapi import Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from .blob_store import BLOB_DIR
+from .etag_helper import etag_matches
+
+MEDIA_MODE = os.getenv("MEDIA_MODE", "app")
+# Where media URLs point, e.g. a separate nginx/CDN host; the API host when unset
+MEDIA_BASE_URL = os.getenv("MEDIA_BASE_URL")
+MEDIA_CHUNK_SIZE = int(os.getenv("MEDIA_CHUNK_SIZE", str(64 * 1024)))
+# nginx location prefix that maps onto the file system and is only reachable through X-Accel-Redirect
+MEDIA_INTERNAL_PREFIX = "/_media"
+
+# Content-addressed URLs never change meaning, so caches may keep them for a year without revalidating
+IMMUTABLE = "public, max-age=31536000, immutable"
+PRIVATE_IMMUTABLE = "private, max-age=31536000, immutable"
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def media_base_url(request_base_url: str) -> str:
+    return (MEDIA_BASE_URL or request_base_url).rstrip("/")
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    # Inclusive (start, end) of a single byte range; None means send the whole file.
+    # Multiple ranges are answered with the whole file, which RFC 9110 allows.
+    match = _RANGE.match(header.strip()) if header else None
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if size == 0:
+        # No byte of an empty file can be addressed, suffix ranges included
+        raise ValueError("empty file")
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+def _read_file(path: Path, start: int, length: int) -> Iterator[bytes]:
+    # Sync generator; StreamingResponse iterates it on the thread pool
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(MEDIA_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+def media_response(
+    request: Request,
+    path: Path,
+    internal_uri: str,
+    media_type: str,
+    etag: str,
+    cache_control: str = IMMUTABLE,
+    filename: Optional[str] = None
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if MEDIA_MODE == "x-accel":
+        # nginx serves the bytes, Range included, and keeps these headers
+        headers["X-Accel-Redirect"] = f"{MEDIA_INTERNAL_PREFIX}/{internal_uri}"
+        return Response(media_type=media_type, headers=headers)
+
+    size = path.stat().st_size
+    # If-Range: a range only applies to the representation the client already has
+    if_range = request.headers.get("if-range")
+    range_header = request.headers.get("range") if not if_range or if_range.strip() == etag else None
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_read_file(path, 0, size), media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _read_file(path, start, end - start + 1),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers
+    )
+
+NGINX_TEMPLATE = """\
+# Generated by python -m app.utils.media; set MEDIA_MODE=x-accel on the API.
+# Derivatives are tagged "<sha>-<size>", originals "<sha>"
+map $photo_size $photo_etag_suffix {{
+    "" "";
+    default -$photo_size;
+}}
+
+upstream nrep_api {{
+    server {upstream};
+    keepalive 32;
+}}
+
+server {{
+    listen {listen};
+    server_name {server_name};
+
+    # Property photos are public and content addressed: served here without touching the API.
+    # nginx's own ETag is mtime-size; send the content hash the API sends instead (routers/media).
+    location ~ "^/media/photos/(?<photo_path>[0-9a-f]{{2}}/[0-9a-f]{{2}}/(?:(?<photo_size>thumb|medium)/)?(?<photo_sha>[0-9a-f]{{64}})\\.(?:jpg|png|webp)(?:\\.webp)?)$" {{
+        alias {photo_dir}/$photo_path;
+        etag off;
+        add_header ETag "\\"$photo_sha$photo_etag_suffix\\"" always;
+        add_header Cache-Control "{immutable}" always;
+    }}
+    # Anything else under the photo directory (temp uploads, malformed paths)
+    location /media/photos/ {{
+        return 404;
+    }}
+
+    # Files the API has authorized (X-Accel-Redirect); not reachable from outside
+    location {internal}/photos/ {{
+        internal;
+        alias {photo_dir}/;
+    }}
+    location {internal}/blobs/ {{
+        internal;
+        alias {blob_dir}/;
+    }}
+
+    location / {{
+        proxy_pass http://nrep_api;
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_set_header Host $host;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+    }}
+}}
+"""
+
+def nginx_config(upstream: str, server_name: str = "_", listen: str = "80") -> str:
+    # validate_photo builds its URLs with media_base_url, so it is imported here rather than at the top
+    from .validate_photo import PHOTO_DIR
+
+    return NGINX_TEMPLATE.format(
+        upstream=upstream,
+        server_name=server_name,
+        listen=listen,
+        photo_dir=Path(PHOTO_DIR).resolve(),
+        blob_dir=Path(BLOB_DIR).resolve(),
+        internal=MEDIA_INTERNAL_PREFIX,
+        immutable=IMMUTABLE
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Print an nginx config for the media tier")
+    parser.add_argument("--upstream", default="127.0.0.1:8000", help="API address (uvicorn)")
+    parser.add_argument("--server-name", default="_")
+    parser.add_argument("--listen", default="80")
+    args = parser.parse_args()
+    print(nginx_config(args.upstream, args.server_name, args.listen), end="")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import hashlib
+import os
+from typing import NamedTuple
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .file_helper import load_query
+
+# MLS and license numbers come from database sequences, so concurrent creates never draw the same one.
+# The sequence value is passed through a keyed Feistel permutation of the number range, which keeps
+# numbers unique but not guessable from one another. The existence check only matters for numbers
+# handed out by the old random generator, and a unique violation on insert is retried with a new number.
+
+# Its own key: reusing the JWT secret would tie the number order to token signing
+NUMBER_ALLOCATOR_KEY = os.getenv("NUMBER_ALLOCATOR_KEY", "")
+# "false" hands out plain consecutive numbers
+NUMBER_ALLOCATOR_PERMUTE = os.getenv("NUMBER_ALLOCATOR_PERMUTE", "true").lower() == "true"
+ALLOCATION_RETRIES = 5
+
+def init_number_allocator():
+    # Called once at startup, so a missing key stops the app instead of the first create
+    if not NUMBER_ALLOCATOR_PERMUTE:
+        return
+    if not NUMBER_ALLOCATOR_KEY:
+        raise RuntimeError("NUMBER_ALLOCATOR_KEY must be set while NUMBER_ALLOCATOR_PERMUTE is on.")
+    if NUMBER_ALLOCATOR_KEY == os.getenv("SECRET_KEY"):
+        raise RuntimeError("NUMBER_ALLOCATOR_KEY must differ from SECRET_KEY.")
+
+class FeistelPermutation:
+    # Bijection on range(size): a balanced Feistel network on radix**2 values, with cycle walking to
+    # stay inside size (radix**2 is under 10x size here, so a walk takes about one extra step)
+    def __init__(self, size: int, key: str, rounds: int = 4):
+        self.size = size
+        self.radix = 1
+        while self.radix * self.radix < size:
+            self.radix *= 10
+        self.key = key.encode()
+        self.rounds = rounds
+
+    def _round(self, value: int, round_num: int) -> int:
+        digest = hashlib.blake2b(f"{round_num}:{value}".encode(), key=self.key[:64], digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.radix
+
+    def _encrypt(self, value: int) -> int:
+        left, right = divmod(value, self.radix)
+        for round_num in range(self.rounds):
+            left, right = right, (left + self._round(right, round_num)) % self.radix
+        return left * self.radix + right
+
+    def __call__(self, value: int) -> int:
+        value = self._encrypt(value)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+class NumberSpace(NamedTuple):
+    sequence: str
+    low: int
+    high: int  # exclusive
+    taken_sql: str  # one number: :number -> any row
+    taken_many_sql: str  # :numbers -> the taken ones
+    label: str
+
+MLS_SPACE = NumberSpace("mls_num_seq", 100000, 1000000, "property/check_mls.sql", "property/get_taken_mls_nums.sql", "MLS")
+LICENSE_SPACE = NumberSpace(
+    "license_num_seq", 10**13, 10**14, "license/check_lic_num.sql", "license/get_taken_lic_nums.sql", "license"
+)
+
+_permutations: dict[str, FeistelPermutation] = {}
+
+def _to_number(space: NumberSpace, position: int) -> int:
+    size = space.high - space.low
+    if position >= size:
+        raise HTTPException(status_code=503, detail=f"All {space.label} numbers have been allocated.")
+    if not NUMBER_ALLOCATOR_PERMUTE:
+        return space.low + position
+    permutation = _permutations.get(space.sequence)
+    if permutation is None:
+        init_number_allocator()
+        permutation = _permutations[space.sequence] = FeistelPermutation(size, NUMBER_ALLOCATOR_KEY)
+    return space.low + permutation(position)
+
+def _exhausted(space: NumberSpace):
+    return HTTPException(status_code=503, detail=f"Could not allocate a free {space.label} number. Please try again.")
+
+def allocate_number(db: Session, space: NumberSpace) -> int:
+    for _ in range(ALLOCATION_RETRIES):
+        position = db.execute(load_query("allocator/next_value.sql"), {"sequence": space.sequence}).scalar()
+        number = _to_number(space, position)
+        if not db.execute(load_query(space.taken_sql), {"number": number}).first():
+            return number
+    raise _exhausted(space)
+
+async def allocate_number_async(db: AsyncSession, space: NumberSpace) -> int:
+    for _ in range(ALLOCATION_RETRIES):
+        position = (await db.execute(load_query("allocator/next_value.sql"), {"sequence": space.sequence})).scalar()
+        number = _to_number(space, position)
+        if not (await db.execute(load_query(space.taken_sql), {"number": number})).first():
+            return number
+    raise _exhausted(space)
+
+def allocate_numbers(db: Session, space: NumberSpace, count: int) -> list[int]:
+    # Bulk version: one nextval round trip per batch and one existence query for the whole batch
+    numbers: list[int] = []
+    for _ in range(ALLOCATION_RETRIES):
+        positions = db.execute(
+            load_query("allocator/next_values.sql"), {"sequence": space.sequence, "count": count - len(numbers)}
+        ).scalars().all()
+        candidates = [_to_number(space, position) for position in positions]
+        taken = set(db.execute(load_query(space.taken_many_sql), {"numbers": candidates}).scalars().all())
+        numbers.extend(number for number in candidates if number not in taken)
+        if len(numbers) == count:
+            return numbers
+    raise _exhausted(space)
+
+def is_unique_violation(error: IntegrityError, column: str) -> bool:
+    # pgcode is set by psycopg2 and by SQLAlchemy's asyncpg adapter; the detail names the column
+    return getattr(error.orig, "pgcode", None) == "23505" and f"Key ({column})" in str(error.orig)
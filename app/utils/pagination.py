@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Optional
 
 class PaginationMeta(BaseModel):
     total: int
@@ -6,4 +7,6 @@ class PaginationMeta(BaseModel):
     per_page: int
     total_pages: int
     has_next: bool
-    has_prev: bool
\ No newline at end of file
+    has_prev: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
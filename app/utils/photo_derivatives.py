@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import database
+from .file_helper import load_query
+from .listing_helper import refresh_property_listing
+from .validate_photo import photo_store, photo_key
+
+# Resized WebP copies of each listing photo, so listing cards do not download the originals.
+# They are made on a process pool after the response is sent (image decoding is CPU bound) and written
+# next to the original as <blob dir>/<size>/<key>.webp; their URLs are then merged into images_urls.
+# Photos are content addressed, so derivatives already made for the same photo on another listing are reused.
+
+DERIVATIVE_SIZES = {
+    "thumb": (320, 240),
+    "medium": (1280, 960),
+}
+DERIVATIVE_QUALITY = int(os.getenv("PHOTO_DERIVATIVE_QUALITY", "80"))
+PHOTO_DERIVATIVE_WORKERS = int(os.getenv("PHOTO_DERIVATIVE_WORKERS", "2"))
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    # Created on first use; "spawn" keeps the workers clear of the server's threads and connections
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=PHOTO_DERIVATIVE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+def derivative_path(photo_path: Path, size: str) -> Path:
+    return photo_path.parent / size / f"{photo_path.name}.webp"
+
+def derivative_url(photo_url: str, size: str) -> str:
+    folder, name = photo_url.rsplit("/", 1)
+    return f"{folder}/{size}/{name}.webp"
+
+def pending_derivatives(images: list[dict]) -> list[str]:
+    # Photo keys that have no derivatives recorded yet (new uploads, or an earlier run that failed)
+    return [photo_key(image) for image in images if not image.get("thumb_url")]
+
+def remove_derivatives(photo_path: Path):
+    for size in DERIVATIVE_SIZES:
+        derivative_path(photo_path, size).unlink(missing_ok=True)
+
+def generate_derivatives(photo_path: str) -> list[str]:
+    # Runs in a worker process; Pillow is only imported there
+    from PIL import Image, ImageOps
+
+    source = Path(photo_path)
+    made = [size for size in DERIVATIVE_SIZES if derivative_path(source, size).exists()]
+    if len(made) == len(DERIVATIVE_SIZES):
+        return made
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        for size, bounds in DERIVATIVE_SIZES.items():
+            if size in made:
+                continue
+            resized = image.copy()
+            resized.thumbnail(bounds, Image.Resampling.LANCZOS)
+            target = derivative_path(source, size)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.part")
+            resized.save(tmp, "WEBP", quality=DERIVATIVE_QUALITY, method=4)
+            os.replace(tmp, target)
+            made.append(size)
+    return made
+
+def _record_derivatives(property_id: int, made: dict[str, list[str]], get_db: Callable[[], Iterator[Session]]):
+    # Merge into the current images_urls under a row lock; photos removed meanwhile are left out
+    db_gen = get_db()
+    db = next(db_gen)
+    try:
+        images = db.execute(
+            load_query("property/lock_property_images.sql"), {"property_id": property_id}
+        ).scalar()
+        if not images:
+            return
+        for image in images:
+            for size in made.get(photo_key(image), []):
+                image[f"{size}_url"] = derivative_url(image["url"], size)
+        db.execute(
+            load_query("property/set_property_images.sql"),
+            {"images_urls": json.dumps(images), "property_id": property_id}
+        )
+        refresh_property_listing(db, [property_id])
+        db.commit()
+    finally:
+        db_gen.close()
+
+async def build_derivatives(
+    property_id: int, keys: list[str], get_db: Callable[[], Iterator[Session]] = database.get_db
+):
+    # Background task: one pool job per photo, then a single write of the resulting URLs.
+    # get_db is the session dependency to write with; routers pass resolve_get_db(request).
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(pool, generate_derivatives, str(photo_store.path(key))) for key in keys),
+        return_exceptions=True
+    )
+    made = {}
+    for key, result in zip(keys, results):
+        if isinstance(result, BaseException):
+            logger.warning("Derivatives failed for %s: %r", key, result)
+        else:
+            made[key] = result
+    if made:
+        await run_in_threadpool(_record_derivatives, property_id, made, get_db)
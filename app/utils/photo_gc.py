@@ -0,0 +1,78 @@
+"""
+Batch collector for unreferenced property photos.
+
+Deletes photo_blobs rows whose ref_count has been zero for longer than the grace period, along with
+their files and derivatives, and clears abandoned upload temp files. Run it from cron, e.g.:
+
+    python -m app.utils.photo_gc --grace-hours 24
+"""
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from app import database
+from .blob_store import BlobStore
+from .file_helper import load_query
+from .photo_derivatives import remove_derivatives
+from .photo_ingest import PARTIAL_SUFFIX
+from .validate_photo import photo_store
+
+PHOTO_GC_GRACE_HOURS = float(os.getenv("PHOTO_GC_GRACE_HOURS", "24"))
+PHOTO_GC_BATCH_SIZE = int(os.getenv("PHOTO_GC_BATCH_SIZE", "500"))
+
+logger = logging.getLogger(__name__)
+
+def collect_batch(db: Session, store: BlobStore, released_before: datetime, batch_size: int) -> int:
+    keys = db.execute(
+        load_query("photo/collect_photo_blobs.sql"),
+        {"released_before": released_before, "batch_size": batch_size}
+    ).scalars().all()
+    # Files go before the commit, while the rows are still locked (see collect_photo_blobs.sql)
+    for key in keys:
+        store.delete(key)
+        remove_derivatives(store.path(key))
+    db.commit()
+    return len(keys)
+
+def collect_photo_blobs(db: Session, store: BlobStore, grace: timedelta, batch_size: int = PHOTO_GC_BATCH_SIZE) -> int:
+    # Short transactions, one per batch, so uploads are never blocked for long
+    released_before = datetime.now() - grace
+    collected = 0
+    while True:
+        count = collect_batch(db, store, released_before, batch_size)
+        collected += count
+        if count < batch_size:
+            return collected
+
+def sweep_temp_files(store: BlobStore, grace: timedelta) -> int:
+    # Staged uploads whose request failed before publishing them
+    cutoff = time.time() - grace.total_seconds()
+    removed = 0
+    for path in store.tmp_dir.glob(f"*{PARTIAL_SUFFIX}"):
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grace-hours", type=float, default=PHOTO_GC_GRACE_HOURS)
+    parser.add_argument("--batch-size", type=int, default=PHOTO_GC_BATCH_SIZE)
+    args = parser.parse_args()
+    # Run from cron: the summary goes to stderr, which cron mails or logs
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    grace = timedelta(hours=args.grace_hours)
+    db = database.LocalSession()
+    try:
+        collected = collect_photo_blobs(db, photo_store, grace, args.batch_size)
+    finally:
+        db.close()
+    swept = sweep_temp_files(photo_store, grace)
+    logger.info("collected %d photos, removed %d temp files", collected, swept)
+
+if __name__ == "__main__":
+    main()
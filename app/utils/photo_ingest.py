@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from typing import NamedTuple, Optional
+from fastapi import UploadFile, HTTPException
+
+from .blob_store import BlobStore
+
+# Streams uploaded photos to disk in fixed-size chunks on a small shared thread pool, so a multi-photo
+# upload neither holds whole files in memory nor blocks the event loop. Each photo is hashed while it is
+# written to a fsynced temp file in the photo store; the caller publishes it under its SHA-256 key once
+# the rows referencing it are committed, so readers never see a partial file and identical photos are stored once.
+
+PHOTO_CHUNK_SIZE = int(os.getenv("PHOTO_CHUNK_SIZE", str(64 * 1024)))
+# Upper bound on photos written at once across all requests
+PHOTO_UPLOAD_WORKERS = int(os.getenv("PHOTO_UPLOAD_WORKERS", "4"))
+PARTIAL_SUFFIX = ".part"
+
+PHOTO_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}
+
+_executor = ThreadPoolExecutor(max_workers=PHOTO_UPLOAD_WORKERS, thread_name_prefix="photo-ingest")
+
+def detect_image_type(head: bytes) -> Optional[str]:
+    # Type from the file's magic bytes; the client-sent content_type is not trusted
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+class StagedPhoto(NamedTuple):
+    name: str  # client file name, kept for display and main_photo matching
+    sha256: str
+    content_type: str
+    size: int
+    tmp_path: str
+
+    @property
+    def key(self) -> str:
+        # Content type is detected from the bytes, so equal content always gets the same key
+        return self.sha256 + PHOTO_EXTENSIONS[self.content_type]
+
+def _fsync_dir(folder: Path):
+    # Makes the rename itself durable; not supported on every platform
+    with suppress(OSError):
+        fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def ingest_photo(photo: UploadFile, store: BlobStore, max_bytes: int) -> StagedPhoto:
+    # Runs on a worker thread; reads the spooled upload directly instead of through the async wrapper
+    name = os.path.basename(photo.filename or "")
+    if not name:
+        raise HTTPException(status_code=400, detail="Photo has no file name.")
+
+    photo.file.seek(0)
+    chunk = photo.file.read(PHOTO_CHUNK_SIZE)
+    content_type = detect_image_type(chunk)
+    if content_type is None:
+        raise HTTPException(status_code=400, detail=f"File '{name}' is not a supported image type.")
+
+    fd, tmp_path = tempfile.mkstemp(dir=store.tmp_dir, suffix=PARTIAL_SUFFIX)
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as out:
+            size = 0
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File '{name}' exceeds {max_bytes // (1024 * 1024)}MB size limit."
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+                chunk = photo.file.read(PHOTO_CHUNK_SIZE)
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+    return StagedPhoto(name, digest.hexdigest(), content_type, size, tmp_path)
+
+def publish_photos(store: BlobStore, staged: list[StagedPhoto]):
+    # Call once the transaction taking the photo_blobs references has committed; before that, a failed
+    # write would leave published files with no row for photo_gc to find
+    for photo in staged:
+        store.publish(photo.tmp_path, photo.key)
+        _fsync_dir(store.path(photo.key).parent)
+
+def discard_photos(staged: list[StagedPhoto]):
+    for photo in staged:
+        with suppress(FileNotFoundError):
+            os.unlink(photo.tmp_path)
+
+def _try_ingest(photo: UploadFile, store: BlobStore, max_bytes: int) -> tuple[str, Optional[StagedPhoto], Optional[str]]:
+    try:
+        return photo.filename, ingest_photo(photo, store, max_bytes), None
+    except HTTPException as e:
+        return photo.filename, None, e.detail
+
+async def ingest_photos(
+    photos: list[UploadFile], store: BlobStore, max_bytes: int
+) -> list[tuple[str, Optional[StagedPhoto], Optional[str]]]:
+    # (file name, staged photo, None) for each accepted photo and (file name, None, reason) for each rejected one,
+    # in upload order
+    loop = asyncio.get_running_loop()
+    return list(await asyncio.gather(*(
+        loop.run_in_executor(_executor, _try_ingest, photo, store, max_bytes) for photo in photos
+    )))
+
+def ingest_photos_sync(
+    photos: list[UploadFile], store: BlobStore, max_bytes: int
+) -> list[tuple[str, Optional[StagedPhoto], Optional[str]]]:
+    # For sync handlers, which already run off the event loop
+    return list(_executor.map(lambda photo: _try_ingest(photo, store, max_bytes), photos))
@@ -0,0 +1,34 @@
+import json
+from typing import Iterable
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .file_helper import load_query
+from .photo_ingest import StagedPhoto
+
+# Reference counts for content-addressed photos (models/photo_blob_model.py). Call inside the writing
+# transaction: acquire the hashes a property gains and release the hashes it loses; publish the staged
+# files once it has committed.
+
+def image_hashes(images: Iterable[dict]) -> set[str]:
+    # Entries without a hash predate content addressing and are not counted
+    return {image["sha256"] for image in images or [] if image.get("sha256")}
+
+def _blob_rows(staged: list[StagedPhoto], hashes: set[str]) -> str:
+    rows = {
+        photo.sha256: {"sha256": photo.sha256, "key": photo.key, "content_type": photo.content_type, "size": photo.size}
+        for photo in staged if photo.sha256 in hashes
+    }
+    return json.dumps(list(rows.values()))
+
+def acquire_photo_blobs(db: Session, staged: list[StagedPhoto], hashes: set[str]):
+    if hashes:
+        db.execute(load_query("photo/acquire_photo_blobs.sql"), {"blobs": _blob_rows(staged, hashes)})
+
+async def acquire_photo_blobs_async(db: AsyncSession, staged: list[StagedPhoto], hashes: set[str]):
+    if hashes:
+        await db.execute(load_query("photo/acquire_photo_blobs.sql"), {"blobs": _blob_rows(staged, hashes)})
+
+def release_photo_blobs(db: Session, hashes: set[str]):
+    if hashes:
+        db.execute(load_query("photo/release_photo_blobs.sql"), {"hashes": sorted(hashes)})
@@ -0,0 +1,131 @@
+import bisect
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Upper bounds (seconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+class PoolMetrics:
+    # Counters for one engine's pool, updated from pool events and the timed pool classes below
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wait_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self._connected_at: dict[int, float] = {}
+
+    def observe_wait(self, seconds: float):
+        with self._lock:
+            self.wait_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+            self._connected_at[id(connection_record)] = time.monotonic()
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def on_close(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._connected_at.pop(id(connection_record), None)
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - connected_at for connected_at in self._connected_at.values()]
+            observed = sum(self.wait_counts)
+            histogram = []
+            cumulative = 0
+            for bound, count in zip(WAIT_BUCKETS + ["+Inf"], self.wait_counts):
+                cumulative += count
+                histogram.append({"le": bound, "count": cumulative})
+            return {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "wait_time": {
+                    "count": observed,
+                    "sum": self.wait_sum,
+                    "avg": self.wait_sum / observed if observed else 0.0,
+                    "max": self.wait_max,
+                    "histogram": histogram
+                },
+                "connection_age": {
+                    "count": len(ages),
+                    "min": min(ages, default=0.0),
+                    "avg": sum(ages) / len(ages) if ages else 0.0,
+                    "max": max(ages, default=0.0)
+                }
+            }
+
+class _TimedPoolMixin:
+    # Times the wait for a free connection, which no pool event exposes
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            self.metrics.observe_wait(time.perf_counter() - start)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+pool_metrics: dict[str, tuple] = {}
+
+def instrument_engine(name: str, engine):
+    # Attach listeners to a Timed* pool and register it for the metrics endpoint
+    pool = engine.pool
+    metrics = PoolMetrics()
+    pool.metrics = metrics
+    event.listen(pool, "connect", metrics.on_connect)
+    event.listen(pool, "checkout", metrics.on_checkout)
+    event.listen(pool, "close", metrics.on_close)
+    event.listen(pool, "detach", metrics.on_close)
+    event.listen(pool, "invalidate", metrics.on_invalidate)
+    pool_metrics[name] = (engine, metrics)
+
+def collect_pool_metrics() -> dict:
+    return {
+        name: metrics.snapshot(engine.pool)
+        for name, (engine, metrics) in pool_metrics.items()
+    }
@@ -0,0 +1,24 @@
+import os
+from typing import Any, Hashable, Optional
+
+from .ttl_cache import TTLCache
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+
+class PrincipalCache(TTLCache):
+    # In-process TTL + LRU cache of authenticated users keyed by (user_id, token id).
+    # Entries are per worker, so the TTL bounds how stale another worker's copy can get.
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL, max_size: int = PRINCIPAL_CACHE_SIZE):
+        super().__init__(ttl, max_size)
+
+    def get(self, user_id: int, token_id: Hashable) -> Optional[Any]:
+        return super().get((user_id, token_id))
+
+    def set(self, user_id: int, token_id: Hashable, principal: Any):
+        super().set((user_id, token_id), principal)
+
+    def invalidate_user(self, user_id: int):
+        self.invalidate(lambda key: key[0] == user_id)
+
+principal_cache = PrincipalCache()
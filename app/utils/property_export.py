@@ -0,0 +1,59 @@
+import csv
+import io
+import os
+from decimal import Decimal
+from typing import Iterator
+import orjson
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import TextClause
+
+# Streams a listing export straight from a server-side cursor: rows are fetched EXPORT_BATCH_SIZE at a
+# time and each batch is encoded and sent before the next is read, so memory does not grow with the result.
+
+EXPORT_BATCH_SIZE = int(os.getenv("PROPERTY_EXPORT_BATCH_SIZE", "1000"))
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+# Written like the import reads them ("3,7"); every other list or object is JSON, so an empty one stays "[]"
+CSV_ID_LIST_COLUMNS = {"sellers"}
+
+def _csv_value(column: str, value):
+    if column in CSV_ID_LIST_COLUMNS and isinstance(value, list):
+        return ",".join(str(v) for v in value)
+    if isinstance(value, (list, dict)):
+        return orjson.dumps(value).decode()
+    return value
+
+def _batches(engine: Engine, query: TextClause, params: dict):
+    # Its own connection: the request's session is closed once the handler returns, before the body is sent
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, max_row_buffer=EXPORT_BATCH_SIZE).execute(query, params)
+        yield list(result.keys())
+        for partition in result.partitions(EXPORT_BATCH_SIZE):
+            yield partition
+
+def stream_ndjson(engine: Engine, query: TextClause, params: dict) -> Iterator[bytes]:
+    batches = _batches(engine, query, params)
+    columns = next(batches)
+    for rows in batches:
+        yield b"".join(
+            orjson.dumps(dict(zip(columns, row)), default=_default) + b"\n" for row in rows
+        )
+
+def stream_csv(engine: Engine, query: TextClause, params: dict) -> Iterator[str]:
+    batches = _batches(engine, query, params)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    columns = next(batches)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows([_csv_value(column, value) for column, value in zip(columns, row)] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,124 @@
+import codecs
+import csv
+import enum
+import json
+import os
+from typing import Iterator, Optional
+from fastapi import HTTPException, UploadFile
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from .file_helper import load_query
+
+# Bulk property import: rows are validated one at a time as the upload is read, valid ones are written
+# to a spooled CSV buffer and COPYed into a temp staging table, and the merge is one set-based statement.
+
+IMPORT_MAX_ROWS = int(os.getenv("PROPERTY_IMPORT_MAX_ROWS", "10000"))
+# Staging buffer kept in memory up to this size, then spilled to a temp file
+IMPORT_SPOOL_SIZE = int(os.getenv("PROPERTY_IMPORT_SPOOL_SIZE", str(8 * 1024 * 1024)))
+IMPORT_FORMATS = {"csv", "ndjson"}
+
+PROPERTY_COLUMNS = [
+    "description", "show_inst", "price", "property_type", "bedrooms", "bathrooms",
+    "property_realtor_commission", "buyer_realtor_commission", "area_space", "year_built",
+    "latitude", "longitude", "status", "trans_type", "exp_date", "livable"
+]
+ADDRESS_COLUMNS = ["floor", "apt", "area", "city", "county", "building_num", "street"]
+ADDITIONAL_COLUMNS = ["elevator", "balcony", "ac", "fan_number", "garage", "garden", "solar_system", "water", "jacuzzi", "pool"]
+# COPY column order; mls_num is assigned in the staging table once the rejected rows are gone
+STAGING_COLUMNS = ["row_num", "sellers"] + PROPERTY_COLUMNS + ADDRESS_COLUMNS + ADDITIONAL_COLUMNS
+
+def import_format(upload: UploadFile, requested: Optional[str]) -> str:
+    if requested:
+        return requested
+    name = (upload.filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (upload.content_type or ""):
+        return "ndjson"
+    if name.endswith(".csv") or "csv" in (upload.content_type or ""):
+        return "csv"
+    raise HTTPException(status_code=400, detail="Could not tell the file format; pass format=csv or format=ndjson.")
+
+def read_records(upload: UploadFile, file_format: str) -> Iterator[tuple[int, object]]:
+    # (row number, raw record); rows are numbered from 1 after the CSV header, blank lines skipped.
+    # Undecodable bytes or broken CSV quoting stop the whole read, so they are reported as a 400, not per row.
+    upload.file.seek(0)
+    lines = codecs.iterdecode(upload.file, "utf-8-sig")
+    row_num = 0
+    try:
+        if file_format == "csv":
+            for row_num, record in enumerate(csv.DictReader(lines), start=1):
+                yield row_num, record
+            return
+        for line in lines:
+            if not line.strip():
+                continue
+            row_num += 1
+            try:
+                yield row_num, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_num, e
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail=f"File is not valid UTF-8 (after row {row_num}).")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"Malformed CSV after row {row_num}: {e}")
+
+def _copy_value(value) -> object:
+    # CSV text for COPY; an empty unquoted field is NULL
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, list):
+        return "{" + ",".join(str(v) for v in value) + "}"
+    return value
+
+def _staging_values(row_num: int, row: BaseModel) -> list:
+    property_data = row.model_dump(include=set(PROPERTY_COLUMNS))
+    address_data = row.address.model_dump()
+    additional_data = row.additional.model_dump()
+    return (
+        [row_num, sorted(set(row.sellers))]
+        + [property_data[c] for c in PROPERTY_COLUMNS]
+        + [address_data[c] for c in ADDRESS_COLUMNS]
+        + [additional_data[c] for c in ADDITIONAL_COLUMNS]
+    )
+
+def _row_errors(error: Exception) -> list[str]:
+    if isinstance(error, ValidationError):
+        return [f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()]
+    return [str(error)]
+
+def validate_rows(upload: UploadFile, file_format: str, buffer, row_model: type[BaseModel]) -> tuple[int, list[dict]]:
+    # Writes valid rows to buffer as COPY CSV and returns (number written, errors).
+    # row_model is the router's row schema (PropertyImportRow): sellers, property columns, address, additional.
+    writer = csv.writer(buffer, lineterminator="\n")
+    accepted, errors = 0, []
+    for row_num, record in read_records(upload, file_format):
+        if row_num > IMPORT_MAX_ROWS:
+            raise HTTPException(status_code=413, detail=f"Imports are limited to {IMPORT_MAX_ROWS} rows.")
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if file_format == "ndjson" and not isinstance(record, dict):
+                raise ValueError("each line must be a JSON object")
+            row = row_model.model_validate(record)
+            if not row.sellers:
+                raise ValueError("sellers: at least one seller id is required")
+        except (ValidationError, ValueError) as e:
+            errors.append({"row": row_num, "errors": _row_errors(e)})
+            continue
+        writer.writerow([_copy_value(v) for v in _staging_values(row_num, row)])
+        accepted += 1
+    return accepted, errors
+
+def copy_to_staging(db: Session, buffer):
+    # COPY needs the DBAPI cursor; the temp table lives on the session's connection until commit
+    db.execute(load_query("property/create_import_staging.sql"))
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY property_import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    finally:
+        cursor.close()
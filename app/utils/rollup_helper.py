@@ -0,0 +1,60 @@
+from datetime import date
+from typing import Iterable, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .file_helper import load_query
+
+# Keep the summary tables (market_status_daily, property_monthly_stats) in step with properties/addresses;
+# call inside the writing transaction, before commit. A write can move a property out of its buckets,
+# so capture stale_buckets() before such writes and pass them back to have the old buckets recomputed too.
+# Each bucket is locked (pg_advisory_xact_lock) until commit before it is recomputed, so concurrent writers
+# to the same bucket take turns instead of overwriting each other's counts.
+
+class StaleBuckets(NamedTuple):
+    market: set[tuple[str, date]]  # (area, day)
+    monthly: set[tuple[str, str, str, int, int]]  # (city, area, property_type, year, month)
+
+def stale_buckets(db: Session, property_ids: Iterable[int]) -> StaleBuckets:
+    params = {"property_ids": list(property_ids)}
+    market = db.execute(load_query("market_watcher/get_market_buckets.sql"), params)
+    monthly = db.execute(load_query("activities/get_monthly_stats_buckets.sql"), params)
+    return StaleBuckets(
+        market={tuple(row) for row in market},
+        monthly={tuple(row) for row in monthly}
+    )
+
+def _refresh_queries(property_ids: Iterable[int], stale: Optional[StaleBuckets]):
+    property_ids = list(property_ids)
+    stale = stale or StaleBuckets(set(), set())
+    market = list(stale.market)
+    monthly = list(stale.monthly)
+    market_params = {
+        "property_ids": property_ids,
+        "areas": [area for area, _ in market],
+        "days": [day for _, day in market]
+    }
+    yield load_query("market_watcher/lock_market_buckets.sql"), market_params
+    yield load_query("market_watcher/refresh_market_rollup.sql"), market_params
+    monthly_params = {
+        "property_ids": property_ids,
+        "cities": [bucket[0] for bucket in monthly],
+        "areas": [bucket[1] for bucket in monthly],
+        "property_types": [bucket[2] for bucket in monthly],
+        "years": [bucket[3] for bucket in monthly],
+        "months": [bucket[4] for bucket in monthly]
+    }
+    yield load_query("activities/lock_monthly_stats_buckets.sql"), monthly_params
+    yield load_query("activities/refresh_property_monthly_stats.sql"), monthly_params
+
+def refresh_rollups(db: Session, property_ids: Iterable[int], stale: Optional[StaleBuckets] = None):
+    for query, params in _refresh_queries(property_ids, stale):
+        db.execute(query, params)
+
+async def refresh_rollups_async(db: AsyncSession, property_ids: Iterable[int], stale: Optional[StaleBuckets] = None):
+    for query, params in _refresh_queries(property_ids, stale):
+        await db.execute(query, params)
+
+def rebuild_rollups(db: Session):
+    db.execute(load_query("market_watcher/rebuild_market_rollup.sql"))
+    db.execute(load_query("activities/rebuild_property_monthly_stats.sql"))
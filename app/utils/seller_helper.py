@@ -0,0 +1,19 @@
+from sqlalchemy.orm import Session
+
+from .file_helper import load_query
+from ..routers.consumers.consumer_out import ConsumerOut
+
+def load_property_sellers(db: Session, property_ids: list[int]) -> dict[int, list[ConsumerOut]]:
+    # Fetch sellers of every property in one round-trip and group them by property_id
+    sellers_by_property = {property_id: [] for property_id in property_ids}
+    if not property_ids:
+        return sellers_by_property
+
+    query = load_query("property/get_property_sellers.sql")
+    result = db.execute(query, {"property_ids": list(property_ids)})
+    for row in result.mappings():
+        seller_data = dict(row)
+        property_id = seller_data.pop("property_id")
+        sellers_by_property.setdefault(property_id, []).append(ConsumerOut(**seller_data))
+
+    return sellers_by_property
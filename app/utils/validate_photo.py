@@ -1,126 +1,100 @@
+import logging
 import os
-import shutil
 from pathlib import Path
 from fastapi import UploadFile,  HTTPException
-from urllib.parse import urljoin, urlparse
 
-UPLOAD_DIR = "static/properties_photos"
+from .blob_store import BlobStore
+from .media import media_base_url
+from .photo_ingest import ingest_photos, ingest_photos_sync, StagedPhoto
 
+# Property photos are content addressed: stored once per SHA-256 under PHOTO_DIR, served from /media/photos
+# (routers/media) and referenced from properties.images_urls; photo_blobs keeps the reference counts (see photo_refs).
+# Kept outside static/, so the StaticFiles mount never serves photos or their temp uploads.
+PHOTO_DIR = os.getenv("PHOTO_DIR", os.path.join(os.getcwd(), "storage", "photos"))
+photo_store = BlobStore(Path(PHOTO_DIR))
+
+# Accepted types, checked against the file's magic bytes (see photo_ingest.detect_image_type)
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp"}
 
 MAX_FILE_SIZE_MB = 1  # 1 MB
-
-def validate_photo(file: UploadFile):
-    # Check content type
-    if file.content_type not in ALLOWED_IMAGE_TYPES:
-    # if not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail=f"File '{file.filename}' is not a supported image type.")
-
-    # Check size
-    file.file.seek(0, os.SEEK_END)
-    file_size = file.file.tell()
-    file.file.seek(0)
-
-    if file_size > MAX_FILE_SIZE_MB * 1024 * 1024:
-        raise HTTPException(status_code=400, detail=f"File '{file.filename}' exceeds {MAX_FILE_SIZE_MB}MB size limit.")
-    
-def save_photos(mls_num, photos: list[UploadFile], base_url, main_photo: str):
-    valid_photos = []
-
-    # Validate photos (size/type)
-    for photo in photos:
-        try:
-            validate_photo(photo)
-            valid_photos.append(photo)
-        except HTTPException as e:
-            print(f"Skipping {photo.filename}: {e.detail}")
-
-    if not valid_photos:
+MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+def photo_url(base_url: str, key: str) -> str:
+    # Mirrors the store layout, so nginx can serve the same path straight from PHOTO_DIR
+    return f"{media_base_url(base_url)}/media/photos/{key[:2]}/{key[2:4]}/{key}"
+
+def photo_key(image: dict) -> str:
+    return image["url"].rsplit("/", 1)[-1]
+
+def _accepted(results) -> list[StagedPhoto]:
+    staged = []
+    for name, photo, error in results:
+        if error:
+            logger.warning("Skipping photo %s: %s", name, error)
+        else:
+            staged.append(photo)
+    return staged
+
+def _new_images(staged: list[StagedPhoto], base_url, known: set[str]) -> list[dict]:
+    # One entry per distinct content; a photo the property already has is not added twice
+    images = []
+    for photo in staged:
+        if photo.sha256 in known:
+            continue
+        known.add(photo.sha256)
+        images.append({
+            "url": photo_url(base_url, photo.key),
+            "sha256": photo.sha256,
+            "name": photo.name,
+            "is_main": False
+        })
+    return images
+
+def _mark_main(images: list[dict], main_photo: str, staged: list[StagedPhoto]):
+    # main_photo may name the uploaded file (also one dropped as a duplicate) or the stored key
+    main_hashes = {photo.sha256 for photo in staged if photo.name == main_photo}
+    for image in images:
+        image["is_main"] = main_photo in (image.get("name"), photo_key(image)) or image.get("sha256") in main_hashes
+
+async def save_photos(photos: list[UploadFile], base_url, main_photo: str) -> tuple[list[dict], list[StagedPhoto]]:
+    # Validate (type/size) and stage; invalid photos are skipped
+    staged = _accepted(await ingest_photos(photos, photo_store, MAX_FILE_SIZE))
+    if not staged:
         raise HTTPException(status_code=400, detail="No valid photos to upload.")
 
-    # Create a folder with name to mls_num
-    folder_dir = Path(UPLOAD_DIR + "/" + str(mls_num))
-    os.makedirs(folder_dir, exist_ok=True)
-
-    # Save valid photos
-    saved_files = []
-    for photo in valid_photos:
-        file_path = folder_dir / photo.filename
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(photo.file, buffer)
-        
-        # Add base url to photo
-        file_url = urljoin(base_url + f"/{UPLOAD_DIR}/{mls_num}/", photo.filename)
-
-        # Match main_photo
-        is_main = False
-        if main_photo == photo.filename:
-            is_main = True
-
-        saved_files.append({
-            "is_main": is_main,
-            "url": file_url
-        })
+    images = _new_images(staged, base_url, set())
+    _mark_main(images, main_photo, staged)
+    return images, staged
 
-    return saved_files
+def stage_photos(photos: list[UploadFile]) -> list[StagedPhoto]:
+    # For sync handlers; done before any row lock is taken
+    return _accepted(ingest_photos_sync(photos, photo_store, MAX_FILE_SIZE)) if photos else []
 
 def update_photos(
-        mls_num,
         db_images_property,
-        new_photos: list[UploadFile],
+        staged: list[StagedPhoto],
         update_photos_data,
         base_url,
         main_photo: str
     ):
-    folder_dir = Path(f"static/properties_photos/{mls_num}")
-    os.makedirs(folder_dir, exist_ok=True)
-
-    updated_db_images = []
-
-    # Step 1: Only clean up files if update_photos_data is provided
+    # Step 1: Keep the images named in update_photos_data (by file name, key or hash); all of them if not sent
+    current = db_images_property or []
     if update_photos_data is not None:
-        for file in folder_dir.iterdir():
-            if file.is_file():
-                if file.name not in update_photos_data:
-                    print(f"Removing unused file: {file.name}")
-                    file.unlink()
-
-                    # Remove from db_images_property as well
-                    db_images_property = [
-                        img for img in db_images_property if not img["url"].endswith(file.name)
-                    ]
-                else:
-                    # Retain in updated_db_images
-                    for img in db_images_property:
-                        if img["url"].endswith(file.name):
-                            updated_db_images.append(img)
-                            break
-    else:
-        # If no update_photos_data sent, keep all current db images
-        updated_db_images = db_images_property.copy() if db_images_property else []
-
-    # Step 2: Save new photos
-    saved_files = []
-    if new_photos:
-        for photo in new_photos:
-            file_path = folder_dir / photo.filename
-            with open(file_path, "wb") as f:
-                f.write(photo.file.read())
-
-            file_url = f"{base_url}/static/properties_photos/{mls_num}/{photo.filename}"
-
-            # Get metadata for the photo if available
-            meta = next((item for item in (update_photos_data or []) if item == photo.filename), {})
-            is_main = meta.get("is_main", False)
-
-            saved_files.append({
-                "url": file_url,
-                "is_main": is_main
-            })
+        keep = set(update_photos_data)
+        current = [
+            img for img in current
+            if keep & {img.get("name"), img.get("sha256"), photo_key(img)}
+        ]
+    updated_db_images = [dict(img) for img in current]
+
+    # Step 2: Add the new photos
+    known = {img["sha256"] for img in updated_db_images if img.get("sha256")}
+    saved_files = _new_images(staged, base_url, known)
 
     # Step 3: Handle main_photo if exists (update is_main flag)
     if main_photo:
-        for image in updated_db_images + saved_files:
-            image["is_main"] = image["url"].endswith(main_photo)
+        _mark_main(updated_db_images + saved_files, main_photo, staged)
 
     return updated_db_images + saved_files
@@ -0,0 +1,80 @@
+"""
+Compare property listing throughput on the sync and async database paths.
+
+The sync path mirrors a `def` route: each request borrows a worker from a
+40-thread pool (Starlette's default threadpool size) and a pooled psycopg2
+connection. The async path mirrors an `async def` route on the asyncpg engine.
+
+Usage:
+    python -m benchmarks.listing_throughput --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.database import engine, async_engine, LocalSession, AsyncLocalSession
+from app.utils.file_helper import load_query
+
+THREADPOOL_SIZE = 40
+
+PARAMS = {
+    "city": None,
+    "area": None,
+    "min_price": None,
+    "max_price": None,
+    "mls_num": None,
+    "status": None,
+    "limit": 10,
+    "offset": 0
+}
+
+query = load_query("property/get_all_properties.sql", sort_by="pl.property_id", sort_order="asc", keyset="TRUE", total="")
+
+def list_sync():
+    with LocalSession() as db:
+        return db.execute(query, PARAMS).mappings().all()
+
+async def list_async():
+    async with AsyncLocalSession() as db:
+        return (await db.execute(query, PARAMS)).mappings().all()
+
+def run_sync(total: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADPOOL_SIZE) as pool:
+        list(pool.map(lambda _: list_sync(), range(total)))
+    return total / (time.perf_counter() - start)
+
+async def run_async(total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await list_async()
+
+    # asyncpg connections are bound to the loop that opened them, so warm up here
+    await list_async()
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    rate = total / (time.perf_counter() - start)
+    await async_engine.dispose()
+    return rate
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    # Warm the pool so connection setup is not part of the measurement
+    list_sync()
+
+    sync_rate = run_sync(args.requests)
+    async_rate = asyncio.run(run_async(args.requests, args.concurrency))
+    engine.dispose()
+
+    print(f"sync  (threadpool={THREADPOOL_SIZE}): {sync_rate:8.1f} req/s")
+    print(f"async (concurrency={args.concurrency}): {async_rate:8.1f} req/s")
+
+if __name__ == "__main__":
+    main()
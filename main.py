@@ -18,8 +18,12 @@ from app.routers.contracts.contracts_routers import router as contract_routers
 from app.routers.market_watcher.market_watcher_route import router as market_watcher_route
 from app.routers.activities.activities import router as activities
 from app.routers.topten_agent.topten_agent import router as topten_agent
+from app.routers.metrics.metrics_router import router as metrics_router
+from app.routers.media.media_router import router as media_router
 
 from app.database import engine, Base
+from app.utils.file_helper import init_sql_registry
+from app.utils.number_allocator import init_number_allocator
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.models import *
@@ -28,6 +32,9 @@ app = FastAPI()
 
 Base.metadata.create_all(bind=engine) 
 
+init_sql_registry()
+init_number_allocator()
+
 UPLOAD_DIR = os.path.join(os.getcwd(), "static")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 app.mount("/static", StaticFiles(directory=UPLOAD_DIR), name="static")
@@ -58,3 +65,5 @@ app.include_router(area_router)
 app.include_router(market_watcher_route)
 app.include_router(activities)
 app.include_router(topten_agent)
+app.include_router(metrics_router)
+app.include_router(media_router)
\ No newline at end of file
@@ -3,13 +3,18 @@ import os
 import pytest
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlalchemy_utils import database_exists, create_database
 from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from app.database import Base, get_db
+from app.database import Base, get_db, get_async_db
 from main import app
+from app.utils.count_strategy import count_cache
+from app.utils.file_helper import load_query
+from app.utils.listing_helper import rebuild_property_listing
 
 load_dotenv()
 DB_USERNAME = os.getenv("DATABASE_TEST_USERNAME")
@@ -27,6 +32,13 @@ if not database_exists(DATABASE_URL):
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# TestClient runs each request on its own event loop, so async connections must not be pooled
+async_engine = create_async_engine(
+    f"postgresql+asyncpg://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}",
+    poolclass=NullPool
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
 @pytest.fixture(scope="function")
 def override_db():
     # Import models to register tables in Base.metadata
@@ -44,6 +56,11 @@ def override_db():
 
     with engine.connect() as connection:
         connection.execute(text(seed_sql))
+        # The seed writes properties directly, so build their listing and summary rows here
+        rebuild_property_listing(connection)
+        connection.execute(load_query("market_watcher/rebuild_market_rollup.sql"))
+        connection.execute(load_query("activities/rebuild_property_monthly_stats.sql"))
+        connection.execute(load_query("topten_agent/rebuild_agent_performance.sql"))
         connection.commit()
 
     # Create a new session instance
@@ -64,7 +81,15 @@ def client(override_db):
         finally:
             override_db.close()
 
+    async def _override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    # Each test reseeds the database, so cached listing totals from earlier tests are stale
+    count_cache.clear()
+
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db
 
     from fastapi.testclient import TestClient
     return TestClient(app)
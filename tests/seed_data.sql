@@ -275,4 +275,9 @@ VALUES
 INSERT INTO consumers 
 (name, father_name, surname, mother_name_surname, place_birth, date_birth, registry, national_number, email, phone_number, created_by_type, created_by)
 VALUES
-('Hussein', 'Mahmoud', 'Al-Ali', 'Aisha Al-Sheikh', 'Aleppo', '1990-01-05', 'Registry-003', 456789123, 'hussein.ali@example.com', '+963933221144', 'realtor', 3);
\ No newline at end of file
+('Hussein', 'Mahmoud', 'Al-Ali', 'Aisha Al-Sheikh', 'Aleppo', '1990-01-05', 'Registry-003', 456789123, 'hussein.ali@example.com', '+963933221144', 'realtor', 3);
+INSERT INTO property_owners (property_id, seller_id)
+VALUES
+(1, 1),
+(1, 2),
+(2, 3);
@@ -0,0 +1,97 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import EmailStr
+
+
+# -------------------- Fixtures --------------------
+@pytest.fixture
+def token_by_email(client: TestClient):
+    def _get_token(email: EmailStr):
+        """Login and return the access token"""
+        login_response = client.post(
+            "/auth/login",
+            data={"username": email, "password": "1234"}
+        )
+        data = login_response.json()
+        token = data.get("access_token")
+        assert token, f"Login failed: {data}"
+        return token
+    return _get_token
+
+
+# -------------------- Contract Close Tests --------------------
+
+def test_close_contract_unknown_mls(client: TestClient, token_by_email):
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.put("/contracts/contract/close/999999999", headers=headers)
+    assert response.status_code == 404
+
+
+def test_bulk_close_reports_each_failure(client: TestClient, token_by_email):
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.put(
+        "/contracts/contract/close",
+        json={"mls_nums": [999999998, 999999999, 999999998]},
+        headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["closed"] == []
+    # Duplicates are closed (or reported) once
+    assert [(item["mls"], item["status_code"]) for item in data["failed"]] == [(999999998, 404), (999999999, 404)]
+
+
+def test_bulk_close_rejects_empty_list(client: TestClient, token_by_email):
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.put("/contracts/contract/close", json={"mls_nums": []}, headers=headers)
+    assert response.status_code == 422
+
+
+# -------------------- Signed Contract Tests --------------------
+
+def test_sign_contract_and_conditional_get(client: TestClient, token_by_email):
+    headers = {"Authorization": f"Bearer {token_by_email('test@broker.com')}"}
+    contract = {"final_price": 125000, "buyer_agent_id": 3, "sellers": [{"id": 1}], "date": "2026-01-15"}
+    pdf = b"%PDF-1.4\n" + b"0" * 300000
+
+    response = client.post(
+        "/contracts/sign/20001/2",
+        data={"contract_json": json.dumps(contract)},
+        files={"pdf_file": ("contract.pdf", pdf, "application/pdf")},
+        headers=headers
+    )
+    assert response.status_code == 201
+    pdf_url = response.json()["pdf_url"]
+
+    response = client.get("/contracts/20001", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == contract
+    etag = response.headers["etag"]
+
+    response = client.get("/contracts/20001", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.get("/contracts/20001/pdf", headers=headers)
+    assert response.status_code == 200
+    assert response.content == pdf
+    response = client.get("/contracts/20001/pdf", headers={**headers, "If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+    # The versioned URL is cacheable without revalidation, and byte ranges are honoured
+    response = client.get(pdf_url, headers={**headers, "Range": "bytes=0-7"})
+    assert response.status_code == 206
+    assert response.content == pdf[:8]
+    assert response.headers["content-range"] == f"bytes 0-7/{len(pdf)}"
+    assert "immutable" in response.headers["cache-control"]
+
+    response = client.get("/contracts/", params={"buyer_agent_id": 3}, headers=headers)
+    assert [item["mls_num"] for item in response.json()["contracts"]] == [20001]
+    response = client.get("/contracts/", params={"buyer_agent_id": 4}, headers=headers)
+    assert response.json()["contracts"] == []
+
+
+def test_sign_contract_rejects_invalid_json(client: TestClient, token_by_email):
+    headers = {"Authorization": f"Bearer {token_by_email('test@broker.com')}"}
+    response = client.post("/contracts/sign/20001/2", data={"contract_json": "{not json"}, headers=headers)
+    assert response.status_code == 400
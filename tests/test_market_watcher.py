@@ -0,0 +1,19 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+# -------------------- Market Watcher Tests --------------------
+
+@pytest.mark.parametrize("period", ["1 week", "1 month", "1 year"])
+def test_market_watcher_rollup_matches_live_counts(client: TestClient, period):
+    params = {"period": period, "area": "Inshaat"}
+    rollup = client.get("/market_watcher/", params=params)
+    live = client.get("/market_watcher/", params={**params, "live": True})
+    assert rollup.status_code == 200
+    assert live.status_code == 200
+    assert rollup.json() == live.json()
+    assert set(rollup.json()) == {
+        "new_listings_count", "pending_count", "closed_count", "out_of_market", "return_the_market"
+    }
+    # Seeded properties were just written, so they fall inside every period
+    assert sum(rollup.json()[key] for key in ["new_listings_count", "pending_count", "closed_count", "out_of_market"]) > 0
@@ -0,0 +1,101 @@
+import hashlib
+import pytest
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+from app.utils import media
+from app.utils.media import parse_range
+from app.utils.validate_photo import photo_store
+
+PHOTO = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def photo_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(photo_store, "root", tmp_path)
+    sha256 = hashlib.sha256(PHOTO).hexdigest()
+    key = f"{sha256}.png"
+    path = photo_store.path(key)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(PHOTO)
+    return f"/media/photos/{key[:2]}/{key[2:4]}/{key}"
+
+
+# -------------------- Media Tests --------------------
+
+def test_photo_is_immutable_with_strong_etag(client: TestClient, photo_url):
+    response = client.get(photo_url)
+    assert response.status_code == 200
+    assert response.content == PHOTO
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["accept-ranges"] == "bytes"
+    etag = response.headers["etag"]
+    assert not etag.startswith("W/")
+
+    response = client.get(photo_url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_photo_range_requests(client: TestClient, photo_url):
+    response = client.get(photo_url, headers={"Range": "bytes=8-15"})
+    assert response.status_code == 206
+    assert response.content == PHOTO[8:16]
+    assert response.headers["content-range"] == f"bytes 8-15/{len(PHOTO)}"
+
+    response = client.get(photo_url, headers={"Range": "bytes=-4"})
+    assert response.status_code == 206
+    assert response.content == PHOTO[-4:]
+
+    response = client.get(photo_url, headers={"Range": f"bytes={len(PHOTO)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(PHOTO)}"
+
+    # A range for another representation gets the whole file
+    response = client.get(photo_url, headers={"Range": "bytes=0-3", "If-Range": '"other"'})
+    assert response.status_code == 200
+    assert response.content == PHOTO
+
+
+def test_photo_paths_are_validated(client: TestClient, photo_url):
+    assert client.get(photo_url.replace(".png", ".jpg")).status_code == 404
+    assert client.get("/media/photos/../../main.py").status_code == 404
+    assert client.get("/media/photos/tmp/upload.part").status_code == 404
+
+
+def test_x_accel_mode_hands_bytes_to_nginx(client: TestClient, photo_url, monkeypatch):
+    monkeypatch.setattr(media, "MEDIA_MODE", "x-accel")
+    response = client.get(photo_url)
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["x-accel-redirect"] == "/_media" + photo_url.removeprefix("/media")
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-200", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=100-", 100)
+    # Nothing in an empty file is addressable, suffix ranges included
+    for header in ("bytes=-10", "bytes=0-", "bytes=0-0"):
+        with pytest.raises(ValueError):
+            parse_range(header, 0)
+
+
+def test_nginx_config_sends_the_api_etag():
+    config = media.nginx_config("127.0.0.1:8000")
+    assert "etag on" not in config
+    assert "etag off;" in config
+    assert 'add_header ETag "\\"$photo_sha$photo_etag_suffix\\""' in config
+
+
+def test_photos_are_not_under_the_static_mount():
+    from main import UPLOAD_DIR
+
+    # /static would serve photos (and staged uploads) without the headers above
+    assert not photo_store.root.resolve().is_relative_to(Path(UPLOAD_DIR).resolve())
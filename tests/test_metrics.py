@@ -0,0 +1,65 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import EmailStr
+from sqlalchemy import create_engine, text
+
+from app.utils import pool_metrics
+from app.utils.pool_metrics import WAIT_BUCKETS, TimedQueuePool, instrument_engine
+
+
+@pytest.fixture
+def token_by_email(client: TestClient):
+    def _get_token(email: EmailStr):
+        """Login and return the access token"""
+        login_response = client.post(
+            "/auth/login",
+            data={"username": email, "password": "1234"}
+        )
+        data = login_response.json()
+        token = data.get("access_token")
+        assert token, f"Login failed: {data}"
+        return token
+    return _get_token
+
+
+@pytest.fixture
+def test_engine(override_db, monkeypatch):
+    # The app's own engines are bypassed by the test session, so instrument one on the test database
+    monkeypatch.setattr(pool_metrics, "pool_metrics", dict(pool_metrics.pool_metrics))
+    engine = create_engine(override_db.get_bind().url, poolclass=TimedQueuePool, pool_size=2, max_overflow=0)
+    instrument_engine("test", engine)
+    yield engine
+    engine.dispose()
+
+
+# -------------------- Pool Metrics Tests --------------------
+
+def test_pool_metrics_requires_admin(client: TestClient, token_by_email):
+    response = client.get("/metrics/pool", headers={"Authorization": f"Bearer {token_by_email('test@broker.com')}"})
+    assert response.status_code == 403
+
+
+def test_pool_metrics_snapshot(client: TestClient, token_by_email, test_engine):
+    for _ in range(3):
+        with test_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    response = client.get("/metrics/pool", headers={"Authorization": f"Bearer {token_by_email('test@admin.com')}"})
+    assert response.status_code == 200
+    data = response.json()
+    assert {"sync", "async", "test"} <= data.keys()
+
+    snapshot = data["test"]
+    assert snapshot["size"] == 2
+    assert snapshot["checkouts"] == 3
+    assert snapshot["connects"] == 1
+    assert snapshot["checked_out"] == 0
+    assert snapshot["timeouts"] == 0
+
+    # Cumulative buckets, one per bound plus +Inf, ending at the number of timed waits
+    histogram = snapshot["wait_time"]["histogram"]
+    assert [bucket["le"] for bucket in histogram] == WAIT_BUCKETS + ["+Inf"]
+    counts = [bucket["count"] for bucket in histogram]
+    assert counts == sorted(counts)
+    assert counts[-1] == snapshot["wait_time"]["count"] == 3
+    assert snapshot["connection_age"]["count"] == 1
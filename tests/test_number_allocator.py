@@ -0,0 +1,149 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from pydantic import EmailStr
+from sqlalchemy import text
+
+from app.utils import number_allocator
+from app.utils.number_allocator import FeistelPermutation, NumberSpace, LICENSE_SPACE, MLS_SPACE
+from app.routers.licenses import licenses_router
+
+
+@pytest.fixture
+def token_by_email(client: TestClient):
+    def _get_token(email: EmailStr):
+        """Login and return the access token"""
+        login_response = client.post(
+            "/auth/login",
+            data={"username": email, "password": "1234"}
+        )
+        data = login_response.json()
+        token = data.get("access_token")
+        assert token, f"Login failed: {data}"
+        return token
+    return _get_token
+
+
+@pytest.fixture
+def allocator_key(monkeypatch):
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_KEY", "test-allocator-key")
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_PERMUTE", True)
+    monkeypatch.setattr(number_allocator, "_permutations", {})
+
+
+class TakenEverywhere:
+    """Session stand-in: hands out sequence positions and reports every number as taken"""
+    def __init__(self):
+        self.position = -1
+
+    def execute(self, query, params):
+        self.position += 1
+        return self
+
+    def scalar(self):
+        return self.position
+
+    def first(self):
+        return (1,)
+
+
+# -------------------- Permutation Tests --------------------
+
+@pytest.mark.parametrize("size", [1, 37, 100, 1000])
+def test_feistel_permutation_is_a_bijection(size):
+    permutation = FeistelPermutation(size, "test-allocator-key")
+    assert sorted(permutation(value) for value in range(size)) == list(range(size))
+
+
+def test_feistel_permutation_depends_on_key():
+    first = [FeistelPermutation(1000, "one")(value) for value in range(20)]
+    second = [FeistelPermutation(1000, "two")(value) for value in range(20)]
+    assert first != second
+
+
+@pytest.mark.parametrize("space", [MLS_SPACE, LICENSE_SPACE])
+def test_numbers_stay_in_range(allocator_key, space):
+    size = space.high - space.low
+    positions = list(range(200)) + [size // 2, size - 2, size - 1]
+    numbers = [number_allocator._to_number(space, position) for position in positions]
+    assert len(set(numbers)) == len(numbers)
+    assert all(space.low <= number < space.high for number in numbers)
+
+
+def test_unpermuted_numbers_are_consecutive(monkeypatch):
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_PERMUTE", False)
+    assert [number_allocator._to_number(MLS_SPACE, position) for position in range(3)] == [100000, 100001, 100002]
+
+
+# -------------------- Exhaustion Tests --------------------
+
+def test_exhausted_sequence_is_503(allocator_key):
+    space = NumberSpace("tiny_seq", 10, 20, "property/check_mls.sql", "property/get_taken_mls_nums.sql", "tiny")
+    assert sorted(number_allocator._to_number(space, position) for position in range(10)) == list(range(10, 20))
+
+    with pytest.raises(HTTPException) as exc_info:
+        number_allocator._to_number(space, 10)
+    assert exc_info.value.status_code == 503
+    assert "All tiny numbers" in exc_info.value.detail
+
+
+def test_all_candidates_taken_is_503(allocator_key):
+    db = TakenEverywhere()
+    with pytest.raises(HTTPException) as exc_info:
+        number_allocator.allocate_number(db, LICENSE_SPACE)
+    assert exc_info.value.status_code == 503
+    # One nextval and one existence check per attempt
+    assert db.position == 2 * number_allocator.ALLOCATION_RETRIES - 1
+
+
+# -------------------- Startup Tests --------------------
+
+def test_startup_requires_dedicated_key(monkeypatch):
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_PERMUTE", True)
+    monkeypatch.setenv("SECRET_KEY", "jwt-secret")
+
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_KEY", "")
+    with pytest.raises(RuntimeError, match="must be set"):
+        number_allocator.init_number_allocator()
+
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_KEY", "jwt-secret")
+    with pytest.raises(RuntimeError, match="differ from SECRET_KEY"):
+        number_allocator.init_number_allocator()
+
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_KEY", "test-allocator-key")
+    number_allocator.init_number_allocator()
+
+    # Consecutive numbers need no key
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_KEY", "")
+    monkeypatch.setattr(number_allocator, "NUMBER_ALLOCATOR_PERMUTE", False)
+    number_allocator.init_number_allocator()
+
+
+# -------------------- License Number Tests --------------------
+
+def test_create_license_allocates_license_number(client: TestClient, token_by_email, allocator_key):
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    payload = {"lic_status": "active", "lic_type": "company", "agency_id": 1, "user_id": 2}
+
+    response = client.post("/licenses", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    assert LICENSE_SPACE.low <= response.json()["lic_num"] < LICENSE_SPACE.high
+
+
+def test_create_license_retries_on_duplicate_number(client: TestClient, token_by_email, override_db, monkeypatch):
+    # A number given out before the sequence existed, which the allocator hands out again
+    override_db.execute(text(
+        "INSERT INTO licenses (lic_num, lic_status, lic_type, user_id, agency_id) "
+        "VALUES ('10000000000001', 'active', 'company', 3, 1)"
+    ))
+    override_db.commit()
+
+    numbers = iter([10000000000001, 10000000000002])
+    monkeypatch.setattr(licenses_router, "allocate_number", lambda db, space: next(numbers))
+
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    payload = {"lic_status": "active", "lic_type": "company", "agency_id": 1, "user_id": 2}
+
+    response = client.post("/licenses", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    assert response.json()["lic_num"] == 10000000000002
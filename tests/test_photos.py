@@ -0,0 +1,227 @@
+import io
+import json
+import os
+import pytest
+from datetime import timedelta
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+
+from app.routers.properties import properties_router
+from app.utils import photo_ingest
+from app.utils.blob_store import BlobStore
+from app.utils.photo_derivatives import derivative_path, derivative_url, generate_derivatives, _record_derivatives
+from app.utils.photo_gc import collect_photo_blobs, sweep_temp_files
+from app.utils.photo_ingest import StagedPhoto, ingest_photo, publish_photos
+from app.utils.photo_refs import acquire_photo_blobs, release_photo_blobs
+from app.utils.validate_photo import photo_store, photo_url
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+def stage(store: BlobStore, name: str, sha256: str) -> StagedPhoto:
+    tmp_path = os.path.join(store.tmp_dir, f"{name}.part")
+    with open(tmp_path, "wb") as f:
+        f.write(PNG)
+    return StagedPhoto(name, sha256, "image/png", len(PNG), tmp_path)
+
+
+def upload(name: str, data: bytes, content_type: str) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=name, headers=Headers({"content-type": content_type}))
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def auth_headers(client: TestClient, email: str) -> dict:
+    login = client.post("/auth/login", data={"username": email, "password": "1234"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def stored_files(store: BlobStore) -> list[str]:
+    # Everything published under the store root, temp uploads excluded
+    return [str(path) for path in store.root.rglob("*") if path.is_file() and store.tmp_dir not in path.parents]
+
+
+PROPERTY_FORM = {
+    "sellers": "1", "description": "d", "show_inst": "call", "price": "75000", "property_type": "apartment",
+    "bedrooms": "3", "bathrooms": "2", "property_realtor_commission": "2.5", "buyer_realtor_commission": "2.5",
+    "area_space": "140", "year_built": "2015", "latitude": "33.5", "longitude": "36.3", "status": "active",
+    "trans_type": "sell", "exp_date": "2030-01-01", "floor": "2", "apt": "5", "area": "A", "city": "Homs",
+    "county": "Homs", "building_num": "12", "street": "Main st"
+}
+
+
+def ref_count(db, sha256: str):
+    return db.execute(
+        text("SELECT ref_count, released_at FROM photo_blobs WHERE sha256 = :sha256"), {"sha256": sha256}
+    ).first()
+
+
+# -------------------- Photo Reference Tests --------------------
+
+def test_same_photo_is_stored_once_and_counted_per_reference(override_db, tmp_path):
+    store = BlobStore(tmp_path)
+    sha256 = "ab" * 32
+    first, second = stage(store, "front.png", sha256), stage(store, "copy-of-front.png", sha256)
+
+    for photo in (first, second):
+        acquire_photo_blobs(override_db, [photo], {sha256})
+        publish_photos(store, [photo])
+    override_db.commit()
+
+    assert store.exists(first.key)
+    assert not os.path.exists(second.tmp_path)
+    assert ref_count(override_db, sha256).ref_count == 2
+
+    release_photo_blobs(override_db, {sha256})
+    override_db.commit()
+    row = ref_count(override_db, sha256)
+    assert row.ref_count == 1 and row.released_at is None
+
+
+def test_unreferenced_photos_are_collected_in_batches(override_db, tmp_path):
+    store = BlobStore(tmp_path)
+    kept, dropped = "cd" * 32, "ef" * 32
+    photos = [stage(store, "kept.png", kept), stage(store, "dropped.png", dropped)]
+    acquire_photo_blobs(override_db, photos, {kept, dropped})
+    publish_photos(store, photos)
+    release_photo_blobs(override_db, {dropped})
+    override_db.commit()
+
+    # Inside the grace period nothing is collected
+    assert collect_photo_blobs(override_db, store, timedelta(hours=1)) == 0
+    assert store.exists(photos[1].key)
+
+    assert collect_photo_blobs(override_db, store, timedelta(0), batch_size=1) == 1
+    assert ref_count(override_db, dropped) is None
+    assert not store.exists(photos[1].key)
+    assert store.exists(photos[0].key)
+    assert ref_count(override_db, kept).ref_count == 1
+
+
+def test_sweep_removes_abandoned_uploads(tmp_path):
+    store = BlobStore(tmp_path)
+    abandoned = stage(store, "abandoned.png", "01" * 32)
+
+    assert sweep_temp_files(store, timedelta(hours=1)) == 0
+    os.utime(abandoned.tmp_path, (0, 0))
+    assert sweep_temp_files(store, timedelta(hours=1)) == 1
+    assert not os.path.exists(abandoned.tmp_path)
+
+
+# -------------------- Photo Ingest Tests --------------------
+
+def test_ingest_rejects_non_image_sent_as_jpeg(tmp_path):
+    store = BlobStore(tmp_path)
+    photo = upload("front.jpg", b"<html>not a photo</html>" * 10, "image/jpeg")
+
+    with pytest.raises(HTTPException) as error:
+        ingest_photo(photo, store, max_bytes=1024 * 1024)
+    assert error.value.status_code == 400
+    assert "not a supported image type" in error.value.detail
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_ingest_stops_reading_an_oversize_upload(tmp_path, monkeypatch):
+    monkeypatch.setattr(photo_ingest, "PHOTO_CHUNK_SIZE", 64)
+    store = BlobStore(tmp_path)
+    data = PNG + b"\x00" * 10000
+    reader = CountingReader(data)
+    photo = UploadFile(reader, filename="huge.png", headers=Headers({"content-type": "image/png"}))
+
+    with pytest.raises(HTTPException) as error:
+        ingest_photo(photo, store, max_bytes=256)
+    assert error.value.status_code == 400
+    assert "size limit" in error.value.detail
+    # Rejected as soon as the limit is crossed, not after reading the whole upload
+    assert reader.bytes_read <= 256 + 64
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_failed_create_discards_staged_photos(client: TestClient, tmp_path, monkeypatch):
+    async def no_numbers_left(db, space):
+        raise HTTPException(status_code=503, detail="No numbers left")
+
+    monkeypatch.setattr(photo_store, "root", tmp_path)
+    monkeypatch.setattr(properties_router, "allocate_number_async", no_numbers_left)
+
+    headers = auth_headers(client, "test@broker.com")
+    response = client.post("/property", data=PROPERTY_FORM, files={"photos": ("front.png", PNG, "image/png")}, headers=headers)
+    assert response.status_code == 503
+    assert os.listdir(photo_store.tmp_dir) == []
+
+
+def test_failed_create_commit_stores_no_photo(client: TestClient, override_db, tmp_path, monkeypatch):
+    async def failing_commit(self):
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(photo_store, "root", tmp_path)
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+
+    headers = auth_headers(client, "test@broker.com")
+    with pytest.raises(RuntimeError, match="commit failed"):
+        client.post("/property", data=PROPERTY_FORM, files={"photos": ("front.png", PNG, "image/png")}, headers=headers)
+    assert stored_files(photo_store) == []
+    assert os.listdir(photo_store.tmp_dir) == []
+
+
+def test_failed_update_commit_stores_no_photo(client: TestClient, override_db, tmp_path, monkeypatch):
+    def failing_commit():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(photo_store, "root", tmp_path)
+    headers = auth_headers(client, "test@admin.com")
+    monkeypatch.setattr(override_db, "commit", failing_commit)
+
+    with pytest.raises(RuntimeError, match="commit failed"):
+        client.put("/property/1", files={"photos": ("back.png", PNG + b"back", "image/png")}, headers=headers)
+    assert stored_files(photo_store) == []
+    assert os.listdir(photo_store.tmp_dir) == []
+
+
+# -------------------- Photo Derivative Tests --------------------
+
+def test_derivatives_are_generated_and_recorded(override_db, tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(photo_store, "root", tmp_path)
+
+    key = "12" * 32 + ".png"
+    source = photo_store.path(key)
+    source.parent.mkdir(parents=True)
+    Image.new("RGB", (1600, 1200), (200, 80, 40)).save(source, "PNG")
+
+    made = generate_derivatives(str(source))
+    assert sorted(made) == ["medium", "thumb"]
+    with Image.open(derivative_path(source, "thumb")) as thumb:
+        assert thumb.format == "WEBP"
+        assert thumb.size == (320, 240)
+    with Image.open(derivative_path(source, "medium")) as medium:
+        assert medium.size == (1280, 960)
+
+    url = photo_url("http://testserver/", key)
+    image = {"url": url, "sha256": "12" * 32, "name": "front.png", "is_main": True}
+    override_db.execute(
+        text("UPDATE properties SET images_urls = CAST(:images AS JSONB) WHERE property_id = 1"),
+        {"images": json.dumps([image])}
+    )
+    override_db.commit()
+
+    def test_db():
+        yield override_db
+
+    _record_derivatives(1, {key: made}, test_db)
+    images = override_db.execute(text("SELECT images_urls FROM properties WHERE property_id = 1")).scalar()
+    assert images[0]["thumb_url"] == derivative_url(url, "thumb")
+    assert images[0]["medium_url"] == derivative_url(url, "medium")
+    assert images[0]["is_main"] is True
@@ -186,3 +186,123 @@ def test_my_properties_pagination(client: TestClient, token_by_email):
         second_page_ids = [prop["property_id"] for prop in properties2]
         # تأكد ما في تداخل بين الصفحة 1 و 2
         assert not set(first_page_ids).intersection(second_page_ids), "Pagination overlap!"
+
+
+def test_get_all_properties_sellers(client: TestClient, token_by_email):
+    token = token_by_email("test@admin.com")
+    response = client.get("/property?per_page=100", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200, f"expected 200 but found {response.text}"
+    # Owners from seed_data.sql; the other properties have none
+    expected = {1: [1, 2], 2: [3]}
+    for prop in response.json()["data"]:
+        seller_ids = [seller["consumer_id"] for seller in prop["sellers"]]
+        assert seller_ids == expected.get(prop["property_id"], []), f"wrong sellers for property {prop['property_id']}"
+
+def test_get_all_properties_cursor_matches_pages(client: TestClient, token_by_email):
+    token = token_by_email("test@admin.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/property?per_page=100&sort_by=price&sort_order=desc", headers=headers)
+    assert response.status_code == 200, f"expected 200 but found {response.text}"
+    expected = [prop["property_id"] for prop in response.json()["data"]]
+
+    seen = []
+    url = "/property?per_page=2&sort_by=price&sort_order=desc"
+    while True:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, f"expected 200 but found {response.text}"
+        body = response.json()
+        seen.extend(prop["property_id"] for prop in body["data"])
+        next_cursor = body["pagination"]["next_cursor"]
+        if not next_cursor:
+            break
+        url = f"/property?per_page=2&sort_by=price&sort_order=desc&cursor={next_cursor}"
+
+    assert seen == expected
+
+def test_get_all_properties_cursor_sort_mismatch(client: TestClient, token_by_email):
+    token = token_by_email("test@admin.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/property?per_page=1", headers=headers)
+    next_cursor = response.json()["pagination"]["next_cursor"]
+    assert next_cursor, "seed data should have more than one property"
+
+    response = client.get(f"/property?per_page=1&sort_by=price&cursor={next_cursor}", headers=headers)
+    assert response.status_code == 400
+
+def test_get_all_properties_total_honors_filters(client: TestClient, token_by_email):
+    token = token_by_email("test@admin.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/property?per_page=100&status_filter=active", headers=headers)
+    assert response.status_code == 200, f"expected 200 but found {response.text}"
+    body = response.json()
+    assert body["pagination"]["total"] == len(body["data"])
+
+    response = client.get("/property?per_page=1&status_filter=active&count=estimated", headers=headers)
+    assert response.status_code == 200, f"expected 200 but found {response.text}"
+    assert response.json()["pagination"]["total"] >= 0
+
+def test_export_properties_matches_listing(client: TestClient, token_by_email):
+    import csv
+    import io
+    import json
+
+    token = token_by_email("test@admin.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/property?per_page=100&status_filter=active&sort_by=price", headers=headers)
+    listed = [item["property_id"] for item in response.json()["data"]]
+
+    response = client.get("/property/export?status_filter=active&sort_by=price", headers=headers)
+    assert response.status_code == 200, f"expected 200 but found {response.text}"
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["property_id"] for row in rows] == listed
+    assert all(row["status"] == "active" for row in rows)
+
+    response = client.get("/property/export?format=csv&status_filter=active&sort_by=price", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.startswith("property_id,mls_num,sellers,")
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert [int(row["property_id"]) for row in reader] == listed
+
+def test_create_property_returns_written_rows(client: TestClient, token_by_email, tmp_path, monkeypatch):
+    from app.routers.properties import properties_router
+    from app.utils.validate_photo import photo_store
+
+    monkeypatch.setattr(photo_store, "root", tmp_path)
+    monkeypatch.setattr(properties_router, "build_derivatives", lambda *args: None)
+
+    headers = {"Authorization": f"Bearer {token_by_email('test@broker.com')}"}
+    form = {
+        "sellers": "2,1,2", "description": "created in one statement", "show_inst": "call agent", "price": "75000",
+        "property_type": "apartment", "bedrooms": "3", "bathrooms": "2", "property_realtor_commission": "2.5",
+        "buyer_realtor_commission": "2.5", "area_space": "140", "year_built": "2015", "latitude": "33.5",
+        "longitude": "36.3", "status": "active", "trans_type": "sell", "exp_date": "2030-01-01",
+        "floor": "2", "apt": "5", "area": "Create Area", "city": "Homs", "county": "Homs", "building_num": "12",
+        "street": "Main st", "elevator": "true", "pool": "false"
+    }
+    photo = ("front.png", b"\x89PNG\r\n\x1a\n" + b"\x00" * 32, "image/png")
+
+    response = client.post("/property", data=form, files={"photos": photo}, headers=headers)
+    assert response.status_code == 201, f"expected 201 but found {response.text}"
+    created = response.json()["property"]
+    assert [seller["consumer_id"] for seller in created["sellers"]] == [1, 2]
+    assert created["address"]["area"] == "Create Area"
+    assert created["additional"]["elevator"] is True
+    assert created["created_by_user"]["email"] == "test@broker.com"
+    assert 100000 <= created["mls_num"] <= 999999
+
+    # The response is built from RETURNING; it must match what a fresh read sees
+    response = client.get(f"/property/{created['property_id']}", headers=headers)
+    stored = response.json()["property"]
+    for field in ("mls_num", "address", "additional", "sellers", "created_by_user"):
+        assert stored[field] == created[field]
+
+    form["sellers"] = "1,99999"
+    response = client.post("/property", data=form, files={"photos": photo}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,182 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+from pydantic import EmailStr
+from sqlalchemy import text
+
+from app.utils.property_import import PROPERTY_COLUMNS, ADDRESS_COLUMNS, ADDITIONAL_COLUMNS
+
+
+@pytest.fixture
+def token_by_email(client: TestClient):
+    def _get_token(email: EmailStr):
+        """Login and return the access token"""
+        login_response = client.post(
+            "/auth/login",
+            data={"username": email, "password": "1234"}
+        )
+        data = login_response.json()
+        token = data.get("access_token")
+        assert token, f"Login failed: {data}"
+        return token
+    return _get_token
+
+
+CSV_HEADER = (
+    "sellers,description,show_inst,price,property_type,bedrooms,bathrooms,property_realtor_commission,"
+    "buyer_realtor_commission,area_space,year_built,latitude,longitude,status,trans_type,exp_date,"
+    "floor,apt,area,city,county,building_num,street,elevator,pool\n"
+)
+
+
+def csv_row(sellers: str, price: str, area: str = "Import Area") -> str:
+    return (
+        f'"{sellers}","Imported, with ""quotes""\nand a newline",call agent,{price},apartment,3,2,2.5,2.5,'
+        f"120,2010,33.5,36.3,active,sell,2030-01-01,2,5,{area},Homs,Homs,12,Main st,true,\n"
+    )
+
+
+# -------------------- Property Import Tests --------------------
+
+def test_import_csv_reports_row_errors(client: TestClient, token_by_email):
+    headers = {"Authorization": f"Bearer {token_by_email('test@broker.com')}"}
+    body = CSV_HEADER + csv_row("1,2", "100000") + csv_row("1", "not a price") + csv_row("999", "90000") + csv_row("2", "80000")
+
+    response = client.post(
+        "/property/import",
+        files={"file": ("inventory.csv", body.encode(), "text/csv")},
+        headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert [error["row"] for error in data["errors"]] == [2, 3]
+    assert "price" in data["errors"][0]["errors"][0]
+    assert "999" in data["errors"][1]["errors"][0]
+    assert [row["row_num"] for row in data["properties"]] == [1, 4]
+    mls_nums = [row["mls_num"] for row in data["properties"]]
+    assert len(set(mls_nums)) == 2
+    assert all(100000 <= mls_num <= 999999 for mls_num in mls_nums)
+
+    # Imported rows are complete listings, visible through the normal endpoints
+    property_id = data["properties"][0]["property_id"]
+    response = client.get(f"/property/{property_id}", headers=headers)
+    assert response.status_code == 200
+    details = response.json()["property"]
+    assert details["address"]["area"] == "Import Area"
+    assert details["additional"]["elevator"] is True
+    assert sorted(seller["consumer_id"] for seller in details["sellers"]) == [1, 2]
+
+    response = client.get("/property", params={"area": "Import Area"}, headers=headers)
+    assert response.json()["pagination"]["total"] == 2
+
+
+def test_import_ndjson_dry_run(client: TestClient, token_by_email):
+    headers = {"Authorization": f"Bearer {token_by_email('test@broker.com')}"}
+    row = {
+        "sellers": [1], "description": "d", "show_inst": "call", "price": 50000, "property_type": "villa",
+        "bedrooms": 4, "bathrooms": 2, "property_realtor_commission": 2.5, "buyer_realtor_commission": 2.5,
+        "area_space": 300, "year_built": 2001, "latitude": 33.5, "longitude": 36.3, "status": "active",
+        "trans_type": "rent", "exp_date": "2030-01-01",
+        "address": {"floor": 0, "apt": 1, "area": "Dry Run", "city": "Homs", "county": "Homs", "building_num": "7", "street": "st"},
+        "additional": {"pool": True}
+    }
+    body = json.dumps(row) + "\n\n" + "{not json\n"
+
+    response = client.post(
+        "/property/import",
+        params={"format": "ndjson", "dry_run": True},
+        files={"file": ("inventory.txt", body.encode(), "application/octet-stream")},
+        headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["dry_run"] is True
+    assert data["imported"] == 1
+    assert data["properties"] == []
+    assert [error["row"] for error in data["errors"]] == [2]
+
+    response = client.get("/property", params={"area": "Dry Run"}, headers=headers)
+    assert response.json()["pagination"]["total"] == 0
+
+
+def test_import_requires_agent_role(client: TestClient, token_by_email):
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.post(
+        "/property/import",
+        files={"file": ("inventory.csv", CSV_HEADER.encode(), "text/csv")},
+        headers=headers
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("body, detail", [
+    (CSV_HEADER.encode() + csv_row("1", "100000").encode() + b"\xff\xfe broken bytes\n", "not valid UTF-8"),
+    (CSV_HEADER.encode() + b'"' + b"x" * 200000 + b'"\n', "Malformed CSV"),
+])
+def test_import_rejects_unreadable_files(client: TestClient, token_by_email, body, detail):
+    headers = {"Authorization": f"Bearer {token_by_email('test@broker.com')}"}
+    response = client.post(
+        "/property/import",
+        files={"file": ("inventory.csv", body, "text/csv")},
+        headers=headers
+    )
+    assert response.status_code == 400
+    assert detail in response.json()["detail"]
+
+    response = client.get("/property", params={"area": "Import Area"}, headers=headers)
+    assert response.json()["pagination"]["total"] == 0
+
+
+def test_import_stamps_utc_like_create(client: TestClient, token_by_email, override_db):
+    headers = {"Authorization": f"Bearer {token_by_email('test@broker.com')}"}
+    response = client.post(
+        "/property/import",
+        files={"file": ("inventory.csv", (CSV_HEADER + csv_row("1", "100000")).encode(), "text/csv")},
+        headers=headers
+    )
+    property_id = response.json()["properties"][0]["property_id"]
+
+    created_at = override_db.execute(
+        text("SELECT created_at FROM properties WHERE property_id = :property_id"), {"property_id": property_id}
+    ).scalar()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs(now - created_at) < timedelta(minutes=5)
+
+
+def test_csv_export_imports_back(client: TestClient, token_by_email, override_db):
+    headers = {"Authorization": f"Bearer {token_by_email('test@broker.com')}"}
+    body = CSV_HEADER + csv_row("1,2", "100000", "Round Trip") + csv_row("3", "90000", "Round Trip")
+    response = client.post("/property/import", files={"file": ("inventory.csv", body.encode(), "text/csv")}, headers=headers)
+    assert response.json()["imported"] == 2
+    # A listing whose photos were all removed
+    override_db.execute(text("UPDATE property_listing SET images_urls = '[]'::JSONB WHERE area = 'Round Trip'"))
+    override_db.commit()
+
+    def export_csv() -> str:
+        response = client.get(
+            "/property/export", params={"format": "csv", "area": "Round Trip", "sort_by": "property_id"}, headers=headers
+        )
+        assert response.status_code == 200
+        return response.text
+
+    exported = export_csv()
+    rows = list(csv.DictReader(io.StringIO(exported)))
+    assert [row["sellers"] for row in rows] == ["1,2", "3"]
+    # Other lists are JSON, so an empty one is not written like "no sellers"
+    assert [row["images_urls"] for row in rows] == ["[]", "[]"]
+
+    response = client.post(
+        "/property/import", files={"file": ("properties.csv", exported.encode(), "text/csv")}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 2, response.json()["errors"]
+
+    # The imported copies match the originals in every column the import reads
+    columns = ["sellers"] + PROPERTY_COLUMNS + ADDRESS_COLUMNS + ADDITIONAL_COLUMNS
+    copies = list(csv.DictReader(io.StringIO(export_csv())))
+    assert len(copies) == 4
+    assert [{c: row[c] for c in columns} for row in copies[2:]] == [{c: row[c] for c in columns} for row in rows]
@@ -0,0 +1,103 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import EmailStr
+from sqlalchemy import text
+
+
+@pytest.fixture
+def token_by_email(client: TestClient):
+    def _get_token(email: EmailStr):
+        """Login and return the access token"""
+        login_response = client.post(
+            "/auth/login",
+            data={"username": email, "password": "1234"}
+        )
+        data = login_response.json()
+        token = data.get("access_token")
+        assert token, f"Login failed: {data}"
+        return token
+    return _get_token
+
+
+def listing_row(db, property_id: int):
+    db.rollback()  # start a fresh snapshot after the request's commit
+    return db.execute(
+        text("SELECT * FROM property_listing WHERE property_id = :property_id"), {"property_id": property_id}
+    ).mappings().first()
+
+
+def creator_rows(db, user_id: int):
+    db.rollback()
+    return db.execute(
+        text("SELECT * FROM property_listing WHERE created_by = :user_id"), {"user_id": user_id}
+    ).mappings().all()
+
+
+# -------------------- Property Listing Sync Tests --------------------
+
+def test_property_update_refreshes_listing(client: TestClient, token_by_email, override_db):
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.put("/property/1", data={"price": "131000", "description": "repainted"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    row = listing_row(override_db, 1)
+    assert row["price"] == 131000
+    assert row["description"] == "repainted"
+
+
+def test_user_update_refreshes_creator_listings(client: TestClient, token_by_email, override_db):
+    assert creator_rows(override_db, 2), "seed has listings created by user 2"
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.put("/users/2", json={"first_name": "Renamed", "phone_number": "0933111222"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    rows = creator_rows(override_db, 2)
+    assert {row["created_by_first_name"] for row in rows} == {"Renamed"}
+    assert {row["created_by_phone_number"] for row in rows} == {"0933111222"}
+
+
+def test_role_update_refreshes_creator_listings(client: TestClient, token_by_email, override_db):
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.put("/roles/2", json={"realtor": True}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    rows = creator_rows(override_db, 2)
+    assert rows and all(row["created_by_realtor"] is True for row in rows)
+
+
+def test_address_update_refreshes_listing(client: TestClient, token_by_email, override_db):
+    address_id = override_db.execute(text("SELECT address_id FROM addresses WHERE property_id = 1")).scalar()
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.put(f"/address/{address_id}", json={"city": "Hama", "area": "Old Town"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    row = listing_row(override_db, 1)
+    assert row["city"] == "Hama"
+    assert row["area"] == "Old Town"
+
+
+def test_property_delete_removes_listing(client: TestClient, token_by_email, override_db):
+    assert listing_row(override_db, 1) is not None
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+    response = client.delete("/property/1", headers=headers)
+    assert response.status_code == 204
+
+    assert listing_row(override_db, 1) is None
+
+
+def test_address_changes_update_cached_totals(client: TestClient, token_by_email, override_db):
+    address_id = override_db.execute(text("SELECT address_id FROM addresses WHERE property_id = 1")).scalar()
+    headers = {"Authorization": f"Bearer {token_by_email('test@admin.com')}"}
+
+    def old_town_total():
+        response = client.get("/property", params={"area": "Old Town", "count": "exact"}, headers=headers)
+        return response.json()["pagination"]["total"]
+
+    assert old_town_total() == 0
+    response = client.put(f"/address/{address_id}", json={"area": "Old Town"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert old_town_total() == 1
+
+    response = client.delete(f"/address/{address_id}", headers=headers)
+    assert response.status_code == 204
+    assert old_town_total() == 0
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+
+# -------------------- Property Stats Tests --------------------
+
+def test_get_property_stats_shape(client: TestClient):
+    response = client.get("/get_property_stats/", params={"city": "Homs", "year": 2026})
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"current_year", "previous_year", "comparison"}
+    for key, year in [("current_year", 2026), ("previous_year", 2025)]:
+        for row in data[key]:
+            assert set(row) == {"property_type", "year", "month", "number_of_closed", "avg_closed_price"}
+            assert row["year"] == year
+    # The comparison only exists when both years have rows
+    if not (data["current_year"] and data["previous_year"]):
+        assert data["comparison"] == []
+
+
+def test_get_property_stats_split_orient(client: TestClient):
+    response = client.get("/get_property_stats/", params={"city": "Homs", "orient": "split"})
+    assert response.status_code == 200
+    current = response.json()["current_year"]
+    assert current["columns"] == ["property_type", "year", "month", "number_of_closed", "avg_closed_price"]
+    assert all(len(row) == len(current["columns"]) for row in current["data"])
+
+    response = client.get("/get_property_stats/", params={"city": "Homs", "orient": "columns"})
+    assert response.status_code == 422
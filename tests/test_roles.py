@@ -110,3 +110,28 @@ def test_update_role_user_not_found(client: TestClient, get_users_by_roles):
     response = client.put("/roles/999999", json=payload)
     assert response.status_code == 404
     assert response.json()["detail"] == "User not found"
+
+
+def test_update_role_invalidates_cached_user(client: TestClient):
+    broker_token = client.post("/auth/login", data={"username": "test@broker.com", "password": "1234"}).json().get("access_token")
+    broker_headers = {"Authorization": f"Bearer {broker_token}"}
+
+    # First request caches the broker for this token
+    response = client.get("/property", headers=broker_headers)
+    assert response.status_code == 200
+
+    admin_token = client.post("/auth/login", data={"username": "test@admin.com", "password": "1234"}).json().get("access_token")
+    payload = {
+        "admin": False,
+        "broker": False,
+        "realtor": False,
+        "seller": False,
+        "buyer": True,
+        "tenant": False
+    }
+    response = client.put("/roles/2", json=payload, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+
+    response = client.get("/property", headers=broker_headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Not authorized"
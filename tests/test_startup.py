@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+import pytest
+
+from app.utils import file_helper
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules too heavy to load in every worker; import them inside the code path that needs them.
+# pytest is listed because a stray "from pytest import ..." once pulled it into the app.
+LAZY_MODULES = {"pandas", "numpy", "matplotlib", "scipy", "PIL", "pytest"}
+
+# Budget for importing every router, like main.py does; override on slow CI machines
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "5000"))
+
+# Everything main.py pulls in, without its create_all() (router folders are namespace packages)
+IMPORT_ROUTERS = """
+import importlib, os
+import app.models
+for folder, _, files in sorted(os.walk(os.path.join("app", "routers"))):
+    for file in sorted(files):
+        if file.endswith(".py"):
+            importlib.import_module(os.path.join(folder, file[:-3]).replace(os.sep, "."))
+"""
+
+def import_times() -> dict[str, tuple[int, int]]:
+    # python -X importtime writes "import time: self [us] | cumulative | <indented module>" to stderr
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_ROUTERS],
+        cwd=ROOT, capture_output=True, text=True, env=os.environ.copy()
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Top-level imports are not indented; keep that so totals are not double counted
+        depth = len(name) - len(name.lstrip()) - 1
+        times[name.strip()] = (int(cumulative_us), depth)
+    return times
+
+
+def test_startup_does_not_import_heavy_modules():
+    loaded = {name.split(".")[0] for name in import_times()}
+    assert not loaded & LAZY_MODULES, f"imported at startup: {sorted(loaded & LAZY_MODULES)}"
+
+
+def test_startup_import_time_budget():
+    times = import_times()
+    total_ms = sum(cumulative for cumulative, depth in times.values() if depth == 0) / 1000
+    slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    report = ", ".join(f"{name} {cumulative / 1000:.0f}ms" for name, (cumulative, _) in slowest)
+    assert total_ms < IMPORT_TIME_BUDGET_MS, f"router imports took {total_ms:.0f}ms: {report}"
+
+
+def test_sql_references_resolve():
+    file_helper.preload_sql()
+    file_helper.verify_sql_references()
+
+
+def test_missing_sql_reference_fails_at_startup(tmp_path, monkeypatch):
+    (tmp_path / "broken_router.py").write_text('sql = load_sql("missing/file.sql")\n')
+    monkeypatch.setattr(file_helper, "APP_DIR", tmp_path)
+    monkeypatch.setattr(file_helper, "SQL_HOT_RELOAD", False)
+
+    with pytest.raises(RuntimeError, match="missing/file.sql"):
+        file_helper.init_sql_registry()
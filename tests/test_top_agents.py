@@ -0,0 +1,48 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+
+# -------------------- Top Agents Tests --------------------
+
+def _record(db, month: date, user_id: int, closed_count: int, total_price: float):
+    db.execute(
+        text("""
+            INSERT INTO agent_monthly_performance (month, user_id, closed_count, total_price)
+            VALUES (:month, :user_id, :closed_count, :total_price)
+        """),
+        {"month": month, "user_id": user_id, "closed_count": closed_count, "total_price": total_price}
+    )
+    db.commit()
+
+
+def test_top_agents_current_and_previous_month(client: TestClient, override_db):
+    today = date.today()
+    current = today.replace(day=1)
+    previous = date(current.year - 1, 12, 1) if current.month == 1 else current.replace(month=current.month - 1)
+    _record(override_db, current, 1, 2, 300000)
+    _record(override_db, current, 2, 5, 100000)
+    _record(override_db, previous, 1, 1, 50000)
+
+    response = client.get("/Top_10_agent/", params={"month": current.month, "year": current.year, "limit": 1})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["current_month"] == current.month
+    assert [row["closed_count"] for row in data["results"]] == [5]
+    assert data["previous_month"] == previous.month
+    assert [(row["closed_count"], row["total_price"]) for row in data["previous_results"]] == [(1, 50000.0)]
+
+
+def test_top_agents_by_range(client: TestClient, override_db):
+    _record(override_db, date(2025, 1, 1), 1, 2, 100)
+    _record(override_db, date(2025, 3, 1), 1, 2, 100)
+    _record(override_db, date(2025, 2, 1), 2, 3, 500)
+    _record(override_db, date(2025, 6, 1), 2, 9, 900)
+
+    response = client.get("/Top_10_agent/range", params={"start": "2025-01-15", "end": "2025-03-31"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [row["closed_count"] for row in results] == [4, 3]
+
+    response = client.get("/Top_10_agent/range", params={"start": "2025-04-01", "end": "2025-03-01"})
+    assert response.status_code == 400